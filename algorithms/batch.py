@@ -0,0 +1,151 @@
+"""
+Ejecución por lotes de consultas (algoritmo, nodo_ini, nodo_fin, params)
+repartidas en un pool de procesos. Cada proceso carga el grafo una sola vez
+y los resultados se devuelven en cuanto terminan
+
+Uso desde consola (una consulta JSON por línea en la entrada):
+    python -m algorithms.batch grafo.txt consultas.jsonl --procesos 8 > resultados.jsonl
+"""
+
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+
+from algorithms.search_algorithms import ALGORITMOS, ALGORITMOS_INFORMADOS
+from algorithms.landmarks import generar_heuristica_landmarks
+from algorithms.budget import Presupuesto
+from utils.graph_utils import leer_grafo, compilar_grafo, generar_heuristica
+
+# Estado de cada proceso trabajador (se llena en _inicializar_trabajador)
+_GRAFO = None
+_HEURISTICA_LANDMARKS = None
+
+def _cargar_grafo(grafo_o_ruta):
+    """Acepta una ruta de archivo, el dict de leer_grafo o un GrafoCompilado"""
+    if isinstance(grafo_o_ruta, str):
+        grafo_o_ruta = leer_grafo(grafo_o_ruta)
+    return compilar_grafo(grafo_o_ruta)
+
+def _inicializar_trabajador(grafo_o_ruta):
+    """Carga el grafo una vez por proceso"""
+    global _GRAFO, _HEURISTICA_LANDMARKS
+    _GRAFO = _cargar_grafo(grafo_o_ruta)
+    _HEURISTICA_LANDMARKS = None
+
+def _obtener_heuristica(tipo, nodo_fin):
+    """Resuelve la heurística pedida en los parámetros de una consulta"""
+    global _HEURISTICA_LANDMARKS
+    if tipo == 'landmarks':
+        # Sirve para cualquier objetivo: se calcula una vez por proceso
+        if _HEURISTICA_LANDMARKS is None:
+            _HEURISTICA_LANDMARKS = generar_heuristica_landmarks(_GRAFO)
+        return _HEURISTICA_LANDMARKS
+    if tipo == 'aleatoria':
+        return generar_heuristica(_GRAFO, nodo_fin)
+    raise ValueError(f"Heurística desconocida: {tipo}")
+
+def normalizar_trabajo(trabajo):
+    """
+    Convierte una consulta a la forma (algoritmo, nodo_ini, nodo_fin, params)
+    Acepta tuplas de 3 o 4 elementos o dicts con esas mismas claves
+    """
+    if isinstance(trabajo, dict):
+        return (trabajo['algoritmo'], trabajo['nodo_ini'], trabajo['nodo_fin'],
+                dict(trabajo.get('params') or {}))
+    if len(trabajo) == 3:
+        return (trabajo[0], trabajo[1], trabajo[2], {})
+    algoritmo, nodo_ini, nodo_fin, params = trabajo
+    return (algoritmo, nodo_ini, nodo_fin, dict(params or {}))
+
+def ejecutar_trabajo(grafo, algoritmo, nodo_ini, nodo_fin, params, obtener_heuristica):
+    """
+    Ejecuta una consulta sobre un grafo ya cargado
+    
+    Args:
+        grafo: diccionario con el grafo o GrafoCompilado
+        algoritmo: nombre registrado en ALGORITMOS
+        params: argumentos extra del algoritmo; 'heuristica' elige
+            'aleatoria' (por defecto) o 'landmarks' en los informados y
+            'presupuesto' es un dict con los argumentos de Presupuesto
+            (p. ej. {"tiempo_max": 0.5}) para acotar la latencia de la consulta
+        obtener_heuristica: función (tipo, nodo_fin) -> heurística
+    
+    Returns:
+        dict: resultado del algoritmo
+    """
+    if algoritmo not in ALGORITMOS:
+        raise ValueError(f"Algoritmo desconocido: {algoritmo}")
+    
+    params = dict(params)
+    tipo_heuristica = params.pop('heuristica', 'aleatoria')
+    if params.get('presupuesto') is not None:
+        params['presupuesto'] = Presupuesto(**params['presupuesto'])
+    funcion = ALGORITMOS[algoritmo]
+    
+    if algoritmo in ALGORITMOS_INFORMADOS:
+        heuristica = obtener_heuristica(tipo_heuristica, nodo_fin)
+        return funcion(grafo, nodo_ini, nodo_fin, heuristica, **params)
+    return funcion(grafo, nodo_ini, nodo_fin, **params)
+
+def _ejecutar_en_trabajador(entrada):
+    """Punto de entrada de cada consulta dentro del pool"""
+    indice, (algoritmo, nodo_ini, nodo_fin, params) = entrada
+    salida = {'indice': indice, 'algoritmo': algoritmo, 'nodo_ini': nodo_ini,
+              'nodo_fin': nodo_fin, 'params': params}
+    
+    tiempo_inicio = time.perf_counter()
+    try:
+        salida['resultado'] = ejecutar_trabajo(_GRAFO, algoritmo, nodo_ini, nodo_fin,
+                                               params, _obtener_heuristica)
+    except Exception as e:
+        salida['resultado'] = None
+        salida['error'] = str(e)
+    salida['tiempo'] = time.perf_counter() - tiempo_inicio
+    return salida
+
+def ejecutar_lote(grafo_o_ruta, trabajos, procesos=None, tamano_bloque=32):
+    """
+    Ejecuta muchas consultas en paralelo y entrega los resultados según terminan
+    
+    Args:
+        grafo_o_ruta: ruta del archivo del grafo (cada proceso lo lee) o el
+            grafo ya cargado (se envía una vez a cada proceso)
+        trabajos: lista o iterable de (algoritmo, nodo_ini, nodo_fin[, params])
+        procesos: número de procesos (por defecto, uno por núcleo)
+        tamano_bloque: consultas que se envían juntas a un proceso
+    
+    Yields:
+        dict: {'indice', 'algoritmo', 'nodo_ini', 'nodo_fin', 'params',
+        'resultado', 'tiempo'} y 'error' si la consulta falló; 'indice' es la
+        posición de la consulta en la entrada, ya que el orden no se conserva
+    """
+    entradas = enumerate(normalizar_trabajo(t) for t in trabajos)
+    
+    with multiprocessing.Pool(procesos, initializer=_inicializar_trabajador,
+                              initargs=(grafo_o_ruta,)) as pool:
+        for salida in pool.imap_unordered(_ejecutar_en_trabajador, entradas, tamano_bloque):
+            yield salida
+
+def main(argv=None):
+    """CLI: lee consultas JSON por línea y escribe resultados JSON por línea"""
+    parser = argparse.ArgumentParser(description="Ejecuta consultas de búsqueda por lotes")
+    parser.add_argument('grafo', help="archivo del grafo (formato de leer_grafo)")
+    parser.add_argument('consultas', nargs='?', default='-',
+                        help="archivo JSONL con {algoritmo, nodo_ini, nodo_fin, params} (- = entrada estándar)")
+    parser.add_argument('--procesos', type=int, default=None)
+    parser.add_argument('--bloque', type=int, default=32)
+    args = parser.parse_args(argv)
+    
+    entrada = sys.stdin if args.consultas == '-' else open(args.consultas, 'r', encoding='utf-8')
+    try:
+        trabajos = (json.loads(linea) for linea in entrada if linea.strip())
+        for salida in ejecutar_lote(args.grafo, trabajos, args.procesos, args.bloque):
+            sys.stdout.write(json.dumps(salida, ensure_ascii=False) + '\n')
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Presupuestos y cancelación cooperativa de las búsquedas
+La búsqueda consulta el presupuesto en cada expansión (a través de la
+instrumentación) y, si se agota, termina con un resultado parcial cuyo
+campo 'motivo' indica qué límite se alcanzó
+"""
+
+import time
+
+# Valores posibles de resultado['motivo']
+MOTIVO_COMPLETA = 'completa'
+MOTIVO_TIEMPO = 'tiempo'
+MOTIVO_EXPANSIONES = 'expansiones'
+MOTIVO_FRONTERA = 'frontera'
+MOTIVO_MEMORIA = 'memoria'
+MOTIVO_CANCELADA = 'cancelada'
+# Límite propio del algoritmo (no del presupuesto): IDA* y profundidad
+# iterativa agotaron sus iteraciones sin terminar de explorar
+MOTIVO_ITERACIONES = 'max_iteraciones'
+
+# Estimación de bytes por entrada de frontera o cerrados (tupla del heap o
+# entrada de dict más su clave); sólo sirve para acotar el orden de magnitud
+BYTES_POR_ENTRADA = 100
+
+class PresupuestoAgotado(Exception):
+    """Se lanza dentro de la búsqueda cuando se agota un límite del presupuesto"""
+    def __init__(self, motivo):
+        super().__init__(f"Presupuesto agotado: {motivo}")
+        self.motivo = motivo
+
+class TokenCancelacion:
+    """
+    Señal de cancelación compartida entre quien lanza la búsqueda y la búsqueda
+    
+    Uso:
+        token = TokenCancelacion()
+        # desde otro hilo o un callback de la interfaz:
+        token.cancelar()
+    """
+    def __init__(self):
+        self.cancelado = False
+    
+    def cancelar(self):
+        """Pide a las búsquedas que usan este token que terminen en su próxima expansión"""
+        self.cancelado = True
+
+class Presupuesto:
+    """
+    Límites de una ejecución de búsqueda; los que quedan en None no se aplican
+    
+    Uso:
+        presupuesto = Presupuesto(tiempo_max=0.5, max_expansiones=100000)
+        resultado = busqueda_a_estrella(grafo, 'A', 'Z', h, presupuesto=presupuesto)
+        resultado['motivo']  # 'completa', 'tiempo', 'expansiones', ...
+    """
+    def __init__(self, tiempo_max=None, max_expansiones=None, max_frontera=None, max_bytes=None,
+                 token=None, intervalo_reloj=32):
+        """
+        Args:
+            tiempo_max: segundos de reloj desde que arranca la búsqueda
+            max_expansiones: nodos expandidos
+            max_frontera: entradas simultáneas en la frontera
+            max_bytes: memoria aproximada de frontera + cerrados
+                (BYTES_POR_ENTRADA por entrada)
+            token: TokenCancelacion opcional
+            intervalo_reloj: expansiones entre lecturas del reloj
+        """
+        self.tiempo_max = tiempo_max
+        self.max_expansiones = max_expansiones
+        self.max_frontera = max_frontera
+        self.max_bytes = max_bytes
+        self.token = token
+        self.intervalo_reloj = intervalo_reloj
+        self._limite_tiempo = None
+        self._hasta_reloj = intervalo_reloj
+    
+    def iniciar(self):
+        """Arranca el reloj; lo llama la búsqueda al comenzar"""
+        if self.tiempo_max is not None:
+            self._limite_tiempo = time.perf_counter() + self.tiempo_max
+        self._hasta_reloj = self.intervalo_reloj
+    
+    def verificar(self, expandidos, tamano_frontera, tamano_cerrados):
+        """Lanza PresupuestoAgotado si la expansión siguiente superaría algún límite"""
+        if self.token is not None and self.token.cancelado:
+            raise PresupuestoAgotado(MOTIVO_CANCELADA)
+        if self.max_expansiones is not None and expandidos >= self.max_expansiones:
+            raise PresupuestoAgotado(MOTIVO_EXPANSIONES)
+        if self.max_frontera is not None and tamano_frontera > self.max_frontera:
+            raise PresupuestoAgotado(MOTIVO_FRONTERA)
+        if (self.max_bytes is not None and
+                (tamano_frontera + tamano_cerrados) * BYTES_POR_ENTRADA > self.max_bytes):
+            raise PresupuestoAgotado(MOTIVO_MEMORIA)
+        if self._limite_tiempo is not None:
+            # Leer el reloj en cada expansión costaría más que la propia expansión
+            self._hasta_reloj -= 1
+            if self._hasta_reloj <= 0:
+                self._hasta_reloj = self.intervalo_reloj
+                if time.perf_counter() > self._limite_tiempo:
+                    raise PresupuestoAgotado(MOTIVO_TIEMPO)
@@ -0,0 +1,311 @@
+"""
+Contraction Hierarchies (CH) para consultas punto a punto muy rápidas
+Un preprocesamiento único contrae los nodos en orden de importancia y agrega
+atajos; después cada consulta es un Dijkstra bidireccional sólo "hacia arriba"
+que expande una fracción mínima del grafo
+"""
+
+import os
+import json
+import heapq
+from array import array
+
+from utils.graph_utils import compilar_grafo, huella_grafo
+
+INFINITO = float('inf')
+
+class JerarquiaContraccion:
+    """
+    Jerarquía de contracción lista para consultar
+    
+    Guarda sólo las aristas hacia nodos de mayor rango en formato CSR
+    (offsets/destinos/pesos) y, para cada atajo, el nodo intermedio que
+    reemplaza, con lo que se desempaquetan los caminos originales
+    """
+    def __init__(self, nombres, offsets, destinos, pesos, atajos, huella):
+        self.nombres = nombres
+        self.ids = {nombre: i for i, nombre in enumerate(nombres)}
+        self.offsets = offsets
+        self.destinos = destinos
+        self.pesos = pesos
+        self.atajos = atajos  # {(a, b) con a < b: nodo intermedio}
+        self.huella = huella
+    
+    def _subir(self, u):
+        """Itera las aristas (vecino, peso) de u hacia nodos de mayor rango"""
+        inicio = self.offsets[u]
+        fin = self.offsets[u + 1]
+        return zip(self.destinos[inicio:fin], self.pesos[inicio:fin])
+    
+    def _desempaquetar(self, camino):
+        """Reemplaza recursivamente cada atajo por su par de aristas originales"""
+        resultado = [camino[0]]
+        pila = [(a, b) for a, b in reversed(list(zip(camino, camino[1:])))]
+        while pila:
+            a, b = pila.pop()
+            medio = self.atajos.get((a, b) if a < b else (b, a))
+            if medio is None:
+                resultado.append(b)
+            else:
+                pila.append((medio, b))
+                pila.append((a, medio))
+        return resultado
+    
+    def consultar(self, nodo_ini, nodo_fin):
+        """
+        Consulta CH: Dijkstra bidireccional sobre las aristas hacia arriba
+        
+        Returns:
+            dict: {'exito', 'camino', 'costo', 'nodos_expandidos'} con el
+            camino ya desempaquetado a aristas del grafo original
+        """
+        if nodo_ini == nodo_fin:
+            return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0}
+        
+        if nodo_ini not in self.ids or nodo_fin not in self.ids:
+            return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': 0}
+        
+        origen = self.ids[nodo_ini]
+        destino = self.ids[nodo_fin]
+        distancias = ({origen: 0}, {destino: 0})
+        padres = ({origen: None}, {destino: None})
+        heaps = ([(0, origen)], [(0, destino)])
+        mejor_costo = INFINITO
+        encuentro = None
+        nodos_expandidos = 0
+        
+        while heaps[0] or heaps[1]:
+            # Lado con el menor tope; un lado se agota cuando su tope supera la mejor solución
+            if not heaps[1] or (heaps[0] and heaps[0][0][0] <= heaps[1][0][0]):
+                lado = 0
+            else:
+                lado = 1
+            costo_actual, nodo_actual = heapq.heappop(heaps[lado])
+            
+            if costo_actual >= mejor_costo:
+                heaps[lado].clear()
+                continue
+            if costo_actual > distancias[lado][nodo_actual]:
+                continue
+            
+            nodos_expandidos += 1
+            otro = distancias[1 - lado]
+            if nodo_actual in otro and costo_actual + otro[nodo_actual] < mejor_costo:
+                mejor_costo = costo_actual + otro[nodo_actual]
+                encuentro = nodo_actual
+            
+            distancias_lado = distancias[lado]
+            for vecino, peso in self._subir(nodo_actual):
+                nuevo_costo = costo_actual + peso
+                if nuevo_costo < distancias_lado.get(vecino, INFINITO):
+                    distancias_lado[vecino] = nuevo_costo
+                    padres[lado][vecino] = nodo_actual
+                    heapq.heappush(heaps[lado], (nuevo_costo, vecino))
+        
+        if encuentro is None:
+            return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos}
+        
+        camino = []
+        nodo = encuentro
+        while nodo is not None:
+            camino.append(nodo)
+            nodo = padres[0][nodo]
+        camino.reverse()
+        nodo = padres[1][encuentro]
+        while nodo is not None:
+            camino.append(nodo)
+            nodo = padres[1][nodo]
+        
+        camino = [self.nombres[u] for u in self._desempaquetar(camino)]
+        return {'exito': True, 'camino': camino, 'costo': mejor_costo, 'nodos_expandidos': nodos_expandidos}
+    
+    def guardar(self, ruta):
+        """Guarda la jerarquía en un archivo JSON"""
+        datos = {
+            'version': 1,
+            'huella': self.huella,
+            'nombres': self.nombres,
+            'offsets': list(self.offsets),
+            'destinos': list(self.destinos),
+            'pesos': list(self.pesos),
+            'atajos': [[a, b, medio] for (a, b), medio in self.atajos.items()]
+        }
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(datos, f)
+    
+    @classmethod
+    def cargar(cls, ruta):
+        """Carga una jerarquía guardada con guardar()"""
+        with open(ruta, 'r', encoding='utf-8') as f:
+            datos = json.load(f)
+        atajos = {(a, b): medio for a, b, medio in datos['atajos']}
+        return cls(datos['nombres'], array('l', datos['offsets']), array('l', datos['destinos']),
+                   array('d', datos['pesos']), atajos, datos['huella'])
+
+def _busqueda_testigo(adyacencia, origen, excluido, objetivos, costo_max, limite):
+    """
+    Dijkstra local que evita el nodo que se va a contraer
+    Se corta al asentar todos los objetivos, al superar costo_max o al asentar
+    'limite' nodos; si no halla un camino testigo se agrega un atajo de más,
+    lo cual nunca rompe la corrección
+    """
+    distancias = {origen: 0}
+    heap = [(0, origen)]
+    pendientes = set(objetivos)
+    asentados = 0
+    heappop = heapq.heappop
+    heappush = heapq.heappush
+    
+    while heap:
+        costo_actual, nodo_actual = heappop(heap)
+        if costo_actual > distancias[nodo_actual]:
+            continue
+        if costo_actual > costo_max or asentados >= limite:
+            break
+        asentados += 1
+        pendientes.discard(nodo_actual)
+        if not pendientes:
+            break
+        
+        for vecino, peso in adyacencia[nodo_actual].items():
+            nuevo_costo = costo_actual + peso
+            if nuevo_costo < distancias.get(vecino, INFINITO) and vecino != excluido:
+                distancias[vecino] = nuevo_costo
+                heappush(heap, (nuevo_costo, vecino))
+    
+    return distancias
+
+def _atajos_necesarios(adyacencia, nodo, limite):
+    """Atajos (u, w, costo) que exige contraer nodo entre sus vecinos restantes"""
+    vecinos = list(adyacencia[nodo].items())
+    atajos = []
+    
+    for i, (u, peso_u) in enumerate(vecinos[:-1]):
+        restantes = vecinos[i + 1:]
+        costo_max = peso_u + max(peso_w for _, peso_w in restantes)
+        testigos = _busqueda_testigo(adyacencia, u, nodo, [w for w, _ in restantes], costo_max, limite)
+        for w, peso_w in restantes:
+            costo = peso_u + peso_w
+            if testigos.get(w, INFINITO) > costo:
+                atajos.append((u, w, costo))
+    
+    return atajos
+
+def construir_jerarquia(grafo, limite_testigo=64):
+    """
+    Construye la jerarquía de contracción de un grafo no dirigido
+    
+    Los nodos se contraen en orden de prioridad perezosa:
+    2 * (atajos agregados - grado) + vecinos ya contraídos + nivel, donde el
+    nivel (profundidad en la jerarquía) reparte la contracción uniformemente
+    
+    Args:
+        grafo: diccionario con el grafo o GrafoCompilado
+        limite_testigo: nodos asentados como máximo en cada búsqueda testigo
+    
+    Returns:
+        JerarquiaContraccion: estructura lista para consultar
+    """
+    compilado = compilar_grafo(grafo)
+    n = len(compilado)
+    adyacencia = [{} for _ in range(n)]
+    for u in range(n):
+        for v, peso in compilado.vecinos(u):
+            if u != v and peso < adyacencia[u].get(v, INFINITO):
+                adyacencia[u][v] = peso
+                adyacencia[v][u] = peso
+    
+    atajos = {}
+    vecinos_contraidos = [0] * n
+    nivel = [0] * n
+    hacia_arriba = [None] * n
+    
+    def prioridad(nodo, nuevos):
+        return 2 * (len(nuevos) - len(adyacencia[nodo])) + vecinos_contraidos[nodo] + nivel[nodo]
+    
+    heap = [(prioridad(nodo, _atajos_necesarios(adyacencia, nodo, limite_testigo)), nodo) for nodo in range(n)]
+    heapq.heapify(heap)
+    
+    while heap:
+        _, nodo = heapq.heappop(heap)
+        nuevos = _atajos_necesarios(adyacencia, nodo, limite_testigo)
+        actual = prioridad(nodo, nuevos)
+        # Actualización perezosa: si ya no es el mínimo, vuelve al heap
+        if heap and actual > heap[0][0]:
+            heapq.heappush(heap, (actual, nodo))
+            continue
+        
+        # Todos los vecinos restantes quedan con mayor rango que nodo
+        hacia_arriba[nodo] = list(adyacencia[nodo].items())
+        for u, w, costo in nuevos:
+            if costo < adyacencia[u].get(w, INFINITO):
+                adyacencia[u][w] = costo
+                adyacencia[w][u] = costo
+                atajos[(u, w) if u < w else (w, u)] = nodo
+        for vecino in adyacencia[nodo]:
+            del adyacencia[vecino][nodo]
+            vecinos_contraidos[vecino] += 1
+            nivel[vecino] = max(nivel[vecino], nivel[nodo] + 1)
+        adyacencia[nodo] = {}
+    
+    offsets = array('l', [0])
+    destinos = array('l')
+    pesos = array('d')
+    for nodo in range(n):
+        for vecino, peso in hacia_arriba[nodo]:
+            destinos.append(vecino)
+            pesos.append(peso)
+        offsets.append(len(destinos))
+    
+    # Sólo interesan los atajos que sobrevivieron en la jerarquía final
+    usados = set()
+    for nodo in range(n):
+        for vecino, _ in hacia_arriba[nodo]:
+            usados.add((nodo, vecino) if nodo < vecino else (vecino, nodo))
+    atajos = {clave: medio for clave, medio in atajos.items() if clave in usados}
+    
+    return JerarquiaContraccion(list(compilado.nombres), offsets, destinos, pesos, atajos, huella_grafo(compilado))
+
+def ruta_jerarquia(ruta_grafo):
+    """Ruta donde se guarda la jerarquía de un archivo de grafo"""
+    return ruta_grafo + '.ch.json'
+
+def cargar_o_construir_jerarquia(grafo, ruta_grafo=None):
+    """
+    Reutiliza la jerarquía guardada junto al archivo del grafo si corresponde
+    al mismo contenido (misma huella); si no, la construye y la guarda
+    
+    Args:
+        grafo: diccionario con el grafo o GrafoCompilado
+        ruta_grafo: ruta del archivo leído con leer_grafo (None para no usar disco)
+    
+    Returns:
+        JerarquiaContraccion: jerarquía del grafo
+    """
+    # La jerarquía guarda la huella de su GrafoCompilado: se compara con la misma
+    compilado = compilar_grafo(grafo)
+    huella = huella_grafo(compilado)
+    
+    if ruta_grafo is not None:
+        ruta = ruta_jerarquia(ruta_grafo)
+        if os.path.exists(ruta):
+            try:
+                jerarquia = JerarquiaContraccion.cargar(ruta)
+                if jerarquia.huella == huella:
+                    return jerarquia
+            except (OSError, ValueError, KeyError):
+                pass  # Archivo dañado o de otra versión: se reconstruye
+    
+    jerarquia = construir_jerarquia(compilado)
+    
+    if ruta_grafo is not None:
+        try:
+            jerarquia.guardar(ruta_jerarquia(ruta_grafo))
+        except OSError:
+            pass  # Sin permisos de escritura: la jerarquía sigue sirviendo en memoria
+    
+    return jerarquia
+
+def busqueda_contraction_hierarchy(jerarquia, nodo_ini, nodo_fin):
+    """Búsqueda punto a punto sobre una jerarquía de contracción ya construida"""
+    return jerarquia.consultar(nodo_ini, nodo_fin)
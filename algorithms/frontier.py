@@ -0,0 +1,179 @@
+"""
+Frontera de prioridad para las búsquedas de costo (UCS, A*, A* ponderado)
+Guarda el mejor costo g conocido por nodo para no llenar el heap de duplicados
+"""
+
+import heapq
+from collections import deque
+
+class FronteraPrioridad:
+    """
+    Frontera con el mejor g por nodo y decrease-key por borrado perezoso
+    
+    - agregar() rechaza caminos dominados (g no mejor que el ya conocido) y
+      caminos a nodos ya cerrados, así que el heap no crece a O(E)
+    - una mejora de g deja obsoleta la entrada anterior del nodo; las entradas
+      obsoletas se descartan al llegar al tope y se cuentan en pops_obsoletos
+    - tras cada extracción el tope del heap siempre es una entrada válida
+    """
+    def __init__(self):
+        self.heap = []
+        self.mejor_g = {}
+        self.padres = {}
+        self.cerrados = set()
+        self.contador = 0
+        self.pushes = 0
+        self.pushes_descartados = 0
+        self.pops_obsoletos = 0
+        self.max_tamano = 0
+    
+    def __len__(self):
+        return len(self.heap)
+    
+    def agregar(self, nodo, g, prioridad, padre):
+        """
+        Agrega o mejora un nodo en la frontera
+        
+        Returns:
+            bool: True si el camino mejora al mejor conocido y se insertó
+        """
+        if nodo in self.cerrados or g >= self.mejor_g.get(nodo, float('inf')):
+            self.pushes_descartados += 1
+            return False
+        
+        self.mejor_g[nodo] = g
+        self.padres[nodo] = padre
+        self.contador += 1
+        heapq.heappush(self.heap, (prioridad, self.contador, nodo, g))
+        self.pushes += 1
+        if len(self.heap) > self.max_tamano:
+            self.max_tamano = len(self.heap)
+        return True
+    
+    def extraer(self):
+        """
+        Extrae el nodo de menor prioridad y lo marca como cerrado
+        
+        Returns:
+            tuple: (nodo, g)
+        """
+        self._descartar_obsoletas()
+        _, _, nodo, g = heapq.heappop(self.heap)
+        self.cerrados.add(nodo)
+        self._descartar_obsoletas()
+        return nodo, g
+    
+    def _descartar_obsoletas(self):
+        """Saca del tope las entradas superadas por un g mejor del mismo nodo"""
+        heap = self.heap
+        mejor_g = self.mejor_g
+        while heap and heap[0][3] > mejor_g[heap[0][2]]:
+            heapq.heappop(heap)
+            self.pops_obsoletos += 1
+    
+    def estadisticas(self):
+        """Retorna los contadores de trabajo de la frontera"""
+        return {
+            'pushes': self.pushes,
+            'pushes_descartados': self.pushes_descartados,
+            'pops_obsoletos': self.pops_obsoletos,
+            'max_tamano': self.max_tamano
+        }
+
+class FronteraCubetas:
+    """
+    Frontera de Dial para pesos enteros en [0, peso_max]: misma interfaz que
+    FronteraPrioridad pero con una cola por costo en lugar del heap
+    
+    - las prioridades pendientes están siempre en [actual, actual + peso_max],
+      así que bastan peso_max + 1 cubetas usadas en forma circular
+    - agregar y extraer son O(1) (más el avance sobre cubetas vacías)
+    - cada cubeta es FIFO: a igual prioridad sale primero el agregado antes,
+      igual que el desempate por contador del heap, así que el orden de
+      expansión es el mismo que con FronteraPrioridad
+    - len() cuenta sólo nodos con una entrada vigente (las superadas se
+      descartan al llegar a su cubeta y se cuentan en pops_obsoletos)
+    - sólo sirve si la prioridad es el costo g (costo uniforme, no A*)
+    """
+    def __init__(self, peso_max):
+        self.num_cubetas = int(peso_max) + 1
+        self.cubetas = [deque() for _ in range(self.num_cubetas)]
+        self.actual = 0  # Prioridad de la cubeta en curso
+        self.vigentes = 0
+        self.mejor_g = {}
+        self.padres = {}
+        self.cerrados = set()
+        self.pushes = 0
+        self.pushes_descartados = 0
+        self.pops_obsoletos = 0
+        self.max_tamano = 0
+    
+    def __len__(self):
+        return self.vigentes
+    
+    def agregar(self, nodo, g, prioridad, padre):
+        """
+        Agrega o mejora un nodo en la frontera (prioridad entera, igual a g)
+        
+        Returns:
+            bool: True si el camino mejora al mejor conocido y se insertó
+        """
+        mejor = self.mejor_g.get(nodo)
+        if nodo in self.cerrados or (mejor is not None and g >= mejor):
+            self.pushes_descartados += 1
+            return False
+        
+        # Mejorar un nodo abierto deja obsoleta su entrada anterior
+        if mejor is None:
+            self.vigentes += 1
+            if self.vigentes > self.max_tamano:
+                self.max_tamano = self.vigentes
+        self.mejor_g[nodo] = g
+        self.padres[nodo] = padre
+        self.cubetas[int(prioridad) % self.num_cubetas].append((nodo, g))
+        self.pushes += 1
+        return True
+    
+    def extraer(self):
+        """
+        Extrae el nodo de menor prioridad y lo marca como cerrado
+        
+        Returns:
+            tuple: (nodo, g)
+        """
+        if not self.vigentes:
+            raise IndexError("extraer de una frontera vacía")
+        cubetas = self.cubetas
+        mejor_g = self.mejor_g
+        while True:
+            cubeta = cubetas[self.actual % self.num_cubetas]
+            while cubeta:
+                nodo, g = cubeta.popleft()
+                if g > mejor_g[nodo]:
+                    self.pops_obsoletos += 1
+                    continue
+                self.vigentes -= 1
+                self.cerrados.add(nodo)
+                return nodo, g
+            # Sólo se avanza con la cubeta vacía: los nodos que genere el
+            # extraído tienen prioridad >= actual
+            self.actual += 1
+    
+    def estadisticas(self):
+        """Retorna los contadores de trabajo de la frontera"""
+        return {
+            'pushes': self.pushes,
+            'pushes_descartados': self.pushes_descartados,
+            'pops_obsoletos': self.pops_obsoletos,
+            'max_tamano': self.max_tamano
+        }
+
+def frontera_costo_uniforme(grafo):
+    """
+    Frontera para búsquedas sin heurística: cola de cubetas si el grafo
+    compilado tiene pesos enteros pequeños (peso_entero_max), heap si no
+    """
+    peso_max = getattr(grafo, 'peso_entero_max', None)
+    if peso_max is None:
+        return FronteraPrioridad()
+    return FronteraCubetas(peso_max)
@@ -0,0 +1,194 @@
+"""
+Replanificación incremental (D* Lite, que con inicio fijo equivale a LPA*)
+El planificador conserva g/rhs y la cola entre llamadas; cuando cambian
+aristas sólo se reparan los nodos cuyo costo al objetivo se vio afectado
+"""
+
+import heapq
+
+from utils.graph_utils import GrafoCompilado
+
+INFINITO = float('inf')
+
+def _a_diccionario(grafo):
+    """Copia mutable {nodo: {vecino: peso}} de un dict o un GrafoCompilado"""
+    if isinstance(grafo, GrafoCompilado):
+        nombres = grafo.nombres
+        return {nombres[u]: {nombres[v]: peso for v, peso in grafo.vecinos(u)}
+                for u in range(len(grafo))}
+    return {nodo: dict(vecinos) for nodo, vecinos in grafo.items()}
+
+class PlanificadorIncremental:
+    """
+    Planificador D* Lite sobre un grafo no dirigido con pesos que cambian
+    
+    La búsqueda va del objetivo hacia el inicio: g(s) es el costo de s al
+    objetivo y rhs(s) su estimación a un paso. Un cambio de arista sólo
+    recalcula rhs de sus extremos y la reparación se propaga desde ahí
+    
+    Uso:
+        planificador = PlanificadorIncremental(grafo, 'A', 'Z')
+        planificador.replanificar()
+        planificador.aplicar_cambios([('B', 'C', None), ('C', 'D', 12)])
+    """
+    def __init__(self, grafo, nodo_ini, nodo_fin, heuristica=None):
+        """
+        Args:
+            grafo: diccionario con el grafo o GrafoCompilado (se copia)
+            heuristica: None (h = 0) o un proveedor con h(a, b) y
+                para_objetivo(objetivo), como HeuristicaLandmarks. Debe seguir
+                siendo admisible tras los cambios: los landmarks lo son mientras
+                los pesos sólo suban o se cierren aristas
+        """
+        if heuristica is not None and not hasattr(heuristica, 'para_objetivo'):
+            raise ValueError("La heurística debe ser un proveedor con para_objetivo (p. ej. landmarks)")
+        
+        self.grafo = _a_diccionario(grafo)
+        self.nodo_ini = nodo_ini
+        self.nodo_fin = nodo_fin
+        self.heuristica = heuristica
+        self.h = self._heuristica_hacia(nodo_ini)
+        self.km = 0
+        self.g = {}
+        self.rhs = {nodo_fin: 0}
+        self.cola = []
+        self.en_cola = {}
+        self.contador = 0
+        self.nodos_expandidos_total = 0
+        self.replanificaciones = 0
+        self._encolar(nodo_fin)
+    
+    def _heuristica_hacia(self, nodo):
+        """h(s): cota del costo entre el inicio actual y s"""
+        if self.heuristica is None:
+            return lambda s: 0
+        return self.heuristica.para_objetivo(nodo)
+    
+    def _clave(self, s):
+        minimo = min(self.g.get(s, INFINITO), self.rhs.get(s, INFINITO))
+        return (minimo + self.h(s) + self.km, minimo)
+    
+    def _encolar(self, s):
+        """Inserta o actualiza s en la cola; la entrada anterior queda obsoleta"""
+        clave = self._clave(s)
+        self.en_cola[s] = clave
+        self.contador += 1
+        heapq.heappush(self.cola, (clave, self.contador, s))
+    
+    def _tope(self):
+        """Clave mínima vigente de la cola (descarta entradas obsoletas)"""
+        cola = self.cola
+        while cola and self.en_cola.get(cola[0][2]) != cola[0][0]:
+            heapq.heappop(cola)
+        return cola[0][0] if cola else (INFINITO, INFINITO)
+    
+    def _actualizar_nodo(self, s):
+        """Recalcula rhs(s) desde sus vecinos y lo (des)encola según su consistencia"""
+        if s != self.nodo_fin:
+            g = self.g
+            self.rhs[s] = min((peso + g.get(v, INFINITO) for v, peso in self.grafo.get(s, {}).items()),
+                              default=INFINITO)
+        if self.g.get(s, INFINITO) != self.rhs.get(s, INFINITO):
+            self._encolar(s)
+        else:
+            self.en_cola.pop(s, None)
+    
+    def _calcular_camino_minimo(self):
+        """Expande nodos inconsistentes hasta que el inicio sea consistente"""
+        g = self.g
+        rhs = self.rhs
+        inicio = self.nodo_ini
+        nodos_expandidos = 0
+        
+        while (self._tope() < self._clave(inicio) or
+               rhs.get(inicio, INFINITO) != g.get(inicio, INFINITO)):
+            if not self.cola:
+                break
+            clave_vieja, _, u = heapq.heappop(self.cola)
+            clave_nueva = self._clave(u)
+            if clave_vieja < clave_nueva:
+                # La clave subió por km o por un cambio: vuelve con su valor actual
+                self._encolar(u)
+                continue
+            
+            del self.en_cola[u]
+            nodos_expandidos += 1
+            if g.get(u, INFINITO) > rhs.get(u, INFINITO):
+                g[u] = rhs[u]
+                for vecino in self.grafo.get(u, {}):
+                    self._actualizar_nodo(vecino)
+            else:
+                g[u] = INFINITO
+                self._actualizar_nodo(u)
+                for vecino in self.grafo.get(u, {}):
+                    self._actualizar_nodo(vecino)
+        
+        return nodos_expandidos
+    
+    def _extraer_camino(self):
+        """Sigue desde el inicio el vecino que minimiza peso + g"""
+        camino = [self.nodo_ini]
+        visitados = {self.nodo_ini}
+        nodo = self.nodo_ini
+        while nodo != self.nodo_fin:
+            siguiente = min(self.grafo.get(nodo, {}).items(),
+                            key=lambda item: item[1] + self.g.get(item[0], INFINITO), default=None)
+            if siguiente is None or siguiente[0] in visitados:
+                return None
+            nodo = siguiente[0]
+            visitados.add(nodo)
+            camino.append(nodo)
+        return camino
+    
+    def replanificar(self):
+        """
+        Repara la búsqueda con los cambios pendientes
+        
+        Returns:
+            dict: {'exito', 'camino', 'costo', 'nodos_expandidos'} donde
+            nodos_expandidos cuenta sólo el trabajo de esta llamada
+        """
+        nodos_expandidos = self._calcular_camino_minimo()
+        self.nodos_expandidos_total += nodos_expandidos
+        self.replanificaciones += 1
+        
+        costo = self.g.get(self.nodo_ini, INFINITO)
+        camino = self._extraer_camino() if costo < INFINITO else None
+        if camino is None:
+            return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos}
+        return {'exito': True, 'camino': camino, 'costo': costo, 'nodos_expandidos': nodos_expandidos}
+    
+    def actualizar_arista(self, origen, destino, peso):
+        """
+        Inserta, modifica (peso) o elimina (peso=None) la arista origen-destino
+        El cambio se refleja en la próxima llamada a replanificar()
+        """
+        for a, b in ((origen, destino), (destino, origen)):
+            vecinos = self.grafo.setdefault(a, {})
+            if peso is None:
+                vecinos.pop(b, None)
+            else:
+                vecinos[b] = peso
+        self._actualizar_nodo(origen)
+        self._actualizar_nodo(destino)
+    
+    def aplicar_cambios(self, cambios):
+        """
+        Aplica un lote de cambios (origen, destino, peso o None) y replanifica
+        
+        Returns:
+            dict: resultado de replanificar()
+        """
+        for origen, destino, peso in cambios:
+            self.actualizar_arista(origen, destino, peso)
+        return self.replanificar()
+    
+    def mover_inicio(self, nodo):
+        """
+        Cambia el nodo inicial (p. ej. el agente avanzó) sin reiniciar la búsqueda
+        Las claves ya encoladas se corrigen con km en lugar de reordenar la cola
+        """
+        if self.heuristica is not None:
+            self.km += self.heuristica.h(self.nodo_ini, nodo)
+        self.nodo_ini = nodo
+        self.h = self._heuristica_hacia(nodo)
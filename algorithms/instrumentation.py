@@ -0,0 +1,167 @@
+"""
+Instrumentación opcional de las búsquedas
+Cuenta el trabajo de la frontera y del conjunto de cerrados y permite
+observar cada expansión; sin instrumentación los algoritmos no pagan nada
+más que una comparación con None por expansión
+"""
+
+from functools import wraps
+
+from algorithms.budget import PresupuestoAgotado, MOTIVO_COMPLETA
+
+class Instrumentacion:
+    """
+    Contadores de una ejecución de búsqueda
+    
+    - expandidos / reexpansiones: nodos sacados para expandir (y los que ya
+      se habían expandido antes en la misma búsqueda)
+    - generados: sucesores producidos al expandir, antes de filtrar duplicados
+    - pushes / pops / pops_obsoletos: entradas que entran y salen de la
+      frontera; las obsoletas son las descartadas sin expandir
+    - max_frontera / max_cerrados: picos muestreados en cada expansión
+    
+    Uso:
+        instrumentacion = Instrumentacion(al_expandir=lambda nodo, g, i: ...)
+        resultado = busqueda_a_estrella(grafo, 'A', 'Z', h, instrumentacion=instrumentacion)
+        resultado['instrumentacion']  # mismo dict que instrumentacion.resumen()
+    """
+    def __init__(self, al_expandir=None):
+        """
+        Args:
+            al_expandir: función opcional (nodo, g, instrumentacion) llamada en
+                cada expansión con el nombre del nodo
+        """
+        self.al_expandir = al_expandir
+        self.expandidos = 0
+        self.reexpansiones = 0
+        self.generados = 0
+        self.pushes = 0
+        self.pops = 0
+        self.pops_obsoletos = 0
+        self.max_frontera = 0
+        self.max_cerrados = 0
+        self.presupuesto = None
+        self.solucion = None
+        self._ya_expandidos = set()
+        self._fronteras = []
+        self._nombres = None
+    
+    def preparar(self, vecinos, nombres):
+        """
+        Envuelve la función de vecinos para contar los nodos generados
+        
+        Returns:
+            function: vecinos(nodo) que devuelve la lista de (vecino, peso)
+        """
+        self._nombres = nombres
+        
+        def vecinos_contados(nodo):
+            lista = list(vecinos(nodo))
+            self.generados += len(lista)
+            return lista
+        
+        return vecinos_contados
+    
+    def observar_frontera(self, frontera):
+        """Suma al resumen los contadores propios de una FronteraPrioridad"""
+        self._fronteras.append(frontera)
+    
+    def verificar_presupuesto(self, tamano_frontera=0, tamano_cerrados=0):
+        """Lanza PresupuestoAgotado si no queda presupuesto, sin contar una expansión"""
+        if self.presupuesto is not None:
+            self.presupuesto.verificar(self.expandidos, tamano_frontera, tamano_cerrados)
+    
+    def expandir(self, nodo, g=None, tamano_frontera=0, tamano_cerrados=0):
+        """
+        Registra la expansión de un nodo (clave interna) y los tamaños actuales
+        Con presupuesto, lanza PresupuestoAgotado antes de contarla si no cabe
+        """
+        self.verificar_presupuesto(tamano_frontera, tamano_cerrados)
+        self.expandidos += 1
+        self.pops += 1
+        if nodo in self._ya_expandidos:
+            self.reexpansiones += 1
+        else:
+            self._ya_expandidos.add(nodo)
+        if tamano_frontera > self.max_frontera:
+            self.max_frontera = tamano_frontera
+        if tamano_cerrados > self.max_cerrados:
+            self.max_cerrados = tamano_cerrados
+        if self.al_expandir is not None:
+            nombre = nodo if self._nombres is None else self._nombres[nodo]
+            self.al_expandir(nombre, g, self)
+    
+    def agregar(self, cantidad=1):
+        """Registra entradas insertadas en la frontera"""
+        self.pushes += cantidad
+    
+    def descartar(self, cantidad=1):
+        """Registra entradas sacadas de la frontera sin expandirlas"""
+        self.pops += cantidad
+        self.pops_obsoletos += cantidad
+    
+    def registrar_solucion(self, camino, costo):
+        """Guarda la mejor solución conocida (con nombres de nodo) por si la búsqueda se interrumpe"""
+        self.solucion = (camino, costo)
+    
+    def resultado_parcial(self, motivo):
+        """Resultado de una búsqueda interrumpida: la mejor solución registrada, si la hay"""
+        if self.solucion is None:
+            return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': self.expandidos,
+                    'motivo': motivo}
+        camino, costo = self.solucion
+        return {'exito': True, 'camino': list(camino), 'costo': costo, 'nodos_expandidos': self.expandidos,
+                'motivo': motivo}
+    
+    def resumen(self):
+        """Retorna todos los contadores, incluidos los de las fronteras observadas"""
+        pushes = self.pushes
+        obsoletos_frontera = 0
+        max_frontera = self.max_frontera
+        for frontera in self._fronteras:
+            pushes += frontera.pushes
+            obsoletos_frontera += frontera.pops_obsoletos
+            max_frontera = max(max_frontera, frontera.max_tamano)
+        return {
+            'expandidos': self.expandidos,
+            'reexpansiones': self.reexpansiones,
+            'generados': self.generados,
+            'pushes': pushes,
+            'pops': self.pops + obsoletos_frontera,
+            'pops_obsoletos': self.pops_obsoletos + obsoletos_frontera,
+            'max_frontera': max_frontera,
+            'max_cerrados': self.max_cerrados
+        }
+
+def instrumentable(funcion):
+    """
+    Decorador: si se pasa instrumentacion=..., agrega su resumen al resultado
+    como 'instrumentacion'; con presupuesto=... la búsqueda se corta al agotarlo
+    y el resultado lleva 'motivo'. Sin ninguno la llamada va directo al algoritmo
+    """
+    @wraps(funcion)
+    def envoltura(*args, instrumentacion=None, presupuesto=None, **kwargs):
+        if presupuesto is None:
+            if instrumentacion is None:
+                return funcion(*args, **kwargs)
+            resultado = funcion(*args, instrumentacion=instrumentacion, **kwargs)
+            resultado['instrumentacion'] = instrumentacion.resumen()
+            return resultado
+        
+        # Los límites se comprueban en el hook de expansión de la instrumentación
+        propia = instrumentacion if instrumentacion is not None else Instrumentacion()
+        propia.presupuesto = presupuesto
+        presupuesto.iniciar()
+        try:
+            resultado = funcion(*args, instrumentacion=propia, **kwargs)
+            # El algoritmo puede haber parado por un límite propio (MOTIVO_ITERACIONES)
+            resultado.setdefault('motivo', MOTIVO_COMPLETA)
+        except PresupuestoAgotado as e:
+            resultado = propia.resultado_parcial(e.motivo)
+        finally:
+            propia.presupuesto = None
+        if instrumentacion is not None:
+            resultado['instrumentacion'] = instrumentacion.resumen()
+        return resultado
+    
+    return envoltura
@@ -0,0 +1,174 @@
+"""
+K caminos más cortos sin ciclos (algoritmo de Yen)
+Se reutiliza el árbol de caminos mínimos hacia el objetivo (grafo no
+dirigido: el árbol desde el objetivo da d(v, objetivo) para todo v):
+
+- el primer camino sale directo del árbol
+- d(v, objetivo) es una heurística exacta en el grafo completo, así que es
+  admisible y consistente en el grafo con aristas quitadas de cada desvío
+- si el camino del árbol desde el nodo de desvío no toca nada bloqueado, es
+  el desvío óptimo y no hace falta buscar
+- un desvío cuya cota (costo de la raíz + d(desvío, objetivo)) no mejora a
+  los candidatos ya suficientes se poda sin buscar
+- (Lawler) de cada camino sólo se desvía desde su propio punto de desvío
+"""
+
+import heapq
+
+from algorithms.frontier import FronteraPrioridad
+from algorithms.instrumentation import instrumentable
+from algorithms.path_tree_cache import CACHE_ARBOLES
+from algorithms.search_algorithms import _preparar, _reconstruir_camino, _a_nombres
+
+INFINITO = float('inf')
+
+def _seguir_arbol(origen, siguiente, bloqueados, aristas_bloqueadas):
+    """
+    Camino del árbol desde origen hasta su raíz, o None si usa una arista
+    bloqueada desde origen o pasa por un nodo bloqueado
+    """
+    if siguiente[origen] in aristas_bloqueadas:
+        return None
+    camino = [origen]
+    nodo = siguiente[origen]
+    while nodo is not None:
+        if nodo in bloqueados:
+            return None
+        camino.append(nodo)
+        nodo = siguiente[nodo]
+    return camino
+
+def _a_estrella_desvio(vecinos, origen, destino, distancia, bloqueados, aristas_bloqueadas, limite,
+                       instrumentacion=None):
+    """
+    A* del nodo de desvío al objetivo sin pasar por los nodos bloqueados ni
+    por las aristas origen->x con x en aristas_bloqueadas
+    
+    Args:
+        distancia: d(v, destino) en el grafo completo (heurística exacta)
+        limite: costo a partir del cual el desvío ya no sirve
+    
+    Returns:
+        tuple: (camino, costos acumulados por nodo, nodos expandidos); camino
+        es None si no hay desvío por debajo del límite
+    """
+    frontera = FronteraPrioridad()
+    agregar = frontera.agregar
+    cerrados = frontera.cerrados
+    # Un nodo cerrado de antemano nunca entra en la frontera
+    cerrados.update(bloqueados)
+    agregar(origen, 0, distancia[origen], None)
+    nodos_expandidos = 0
+    if instrumentacion is not None:
+        instrumentacion.observar_frontera(frontera)
+    
+    while frontera and frontera.heap[0][0] < limite:
+        nodo_actual, costo_actual = frontera.extraer()
+        nodos_expandidos += 1
+        if instrumentacion is not None:
+            instrumentacion.expandir(nodo_actual, costo_actual, len(frontera) + 1, len(cerrados))
+        
+        if nodo_actual == destino:
+            camino = _reconstruir_camino(frontera.padres, destino)
+            return camino, [frontera.mejor_g[nodo] for nodo in camino], nodos_expandidos
+        
+        for vecino, peso in vecinos(nodo_actual):
+            if vecino in cerrados or (nodo_actual == origen and vecino in aristas_bloqueadas):
+                continue
+            # Sin distancia al objetivo, el vecino no lleva a él
+            d = distancia.get(vecino)
+            if d is not None:
+                agregar(vecino, costo_actual + peso, costo_actual + peso + d, nodo_actual)
+    
+    return None, None, nodos_expandidos
+
+@instrumentable
+def k_caminos_mas_cortos(grafo, nodo_ini, nodo_fin, k=3, cache=None, instrumentacion=None):
+    """
+    Los k caminos más cortos sin ciclos de nodo_ini a nodo_fin (Yen)
+    
+    Args:
+        grafo: diccionario con el grafo (no dirigido) o GrafoCompilado
+        k: número de caminos pedidos
+        cache: CacheArbolesCaminos para el árbol hacia nodo_fin (por defecto
+            CACHE_ARBOLES, así que repetir consultas al mismo objetivo lo reutiliza)
+    
+    Returns:
+        dict: 'camino', 'costo' del mejor (mismo formato que las búsquedas
+        simples), 'caminos' (lista de {'camino', 'costo'} en orden de costo),
+        'nodos_expandidos' totales y contadores 'busquedas_desvio',
+        'atajos_arbol' y 'desvios_podados'
+    """
+    if nodo_ini == nodo_fin:
+        return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0,
+                'caminos': [{'camino': [nodo_ini], 'costo': 0}],
+                'busquedas_desvio': 0, 'atajos_arbol': 0, 'desvios_podados': 0}
+    
+    vecinos, ini, fin, nombres = _preparar(grafo, nodo_ini, nodo_fin, instrumentacion)
+    if cache is None:
+        cache = CACHE_ARBOLES
+    arbol, desde_cache = cache.obtener_arbol(grafo, nodo_fin)
+    nodos_expandidos = 0 if desde_cache else arbol.nodos_expandidos
+    distancia = arbol.distancias
+    siguiente = arbol.padres
+    contadores = {'busquedas_desvio': 0, 'atajos_arbol': 0, 'desvios_podados': 0}
+    
+    if ini not in distancia:
+        return dict(contadores, exito=False, camino=[], costo=0, nodos_expandidos=nodos_expandidos, caminos=[])
+    
+    # Cada camino guarda sus costos acumulados por nodo y su índice de desvío
+    camino = _seguir_arbol(ini, siguiente, (), ())
+    encontrados = [(camino, [distancia[ini] - distancia[nodo] for nodo in camino], 0)]
+    if instrumentacion is not None:
+        instrumentacion.registrar_solucion(_a_nombres(camino, nombres), distancia[ini])
+    vistos = {tuple(camino)}
+    candidatos = []
+    contador = 0
+    
+    while len(encontrados) < k:
+        previo, costos_previo, desvio = encontrados[-1]
+        for i in range(desvio, len(previo) - 1):
+            espuela = previo[i]
+            raiz = previo[:i + 1]
+            costo_raiz = costos_previo[i]
+            
+            # Sólo hacen falta los candidatos que todavía pueden entrar entre los k
+            faltan = k - len(encontrados)
+            limite = heapq.nsmallest(faltan, candidatos)[-1][0] if len(candidatos) >= faltan else INFINITO
+            if costo_raiz + distancia[espuela] >= limite:
+                contadores['desvios_podados'] += 1
+                continue
+            
+            aristas_bloqueadas = {otro[i + 1] for otro, _, _ in encontrados
+                                  if len(otro) > i + 1 and otro[:i + 1] == raiz}
+            bloqueados = set(raiz[:-1])
+            
+            resto = _seguir_arbol(espuela, siguiente, bloqueados, aristas_bloqueadas)
+            if resto is not None:
+                contadores['atajos_arbol'] += 1
+                costos_resto = [distancia[espuela] - distancia[nodo] for nodo in resto]
+            else:
+                contadores['busquedas_desvio'] += 1
+                resto, costos_resto, expandidos = _a_estrella_desvio(
+                    vecinos, espuela, fin, distancia, bloqueados, aristas_bloqueadas, limite - costo_raiz,
+                    instrumentacion)
+                nodos_expandidos += expandidos
+                if resto is None:
+                    continue
+            
+            nuevo = raiz[:-1] + resto
+            if tuple(nuevo) in vistos:
+                continue
+            vistos.add(tuple(nuevo))
+            costos = costos_previo[:i] + [costo_raiz + costo for costo in costos_resto]
+            contador += 1
+            heapq.heappush(candidatos, (costos[-1], contador, nuevo, costos, i))
+        
+        if not candidatos:
+            break
+        _, _, camino, costos, desvio = heapq.heappop(candidatos)
+        encontrados.append((camino, costos, desvio))
+    
+    caminos = [{'camino': _a_nombres(camino, nombres), 'costo': costos[-1]} for camino, costos, _ in encontrados]
+    return dict(contadores, exito=True, camino=caminos[0]['camino'], costo=caminos[0]['costo'],
+                nodos_expandidos=nodos_expandidos, caminos=caminos)
@@ -0,0 +1,164 @@
+"""
+Heurística ALT (A*, Landmarks y desigualdad Triangular)
+Se precalculan una sola vez las distancias desde k landmarks y con ellas se
+obtiene una cota inferior admisible de d(n, objetivo) para cualquier objetivo
+"""
+
+import random
+from array import array
+from bisect import bisect_left
+from operator import sub
+
+from algorithms.path_tree_cache import dijkstra_un_origen
+from utils.graph_utils import compilar_grafo
+
+INFINITO = float('inf')
+
+class HeuristicaLandmarks:
+    """
+    Proveedor de heurística ALT para grafos no dirigidos
+    
+    Por la desigualdad triangular, para cada landmark L:
+        d(n, t) >= |d(L, t) - d(L, n)|
+    y el máximo sobre los landmarks es admisible y consistente
+    
+    Las distancias se guardan en un único arreglo plano ordenado por nodo
+    (k valores por nodo), así que evaluar h(n) es leer una franja contigua
+    """
+    def __init__(self, grafo, num_landmarks=8, seed=17):
+        compilado = compilar_grafo(grafo)
+        self.nombres = compilado.nombres
+        self.ids = compilado.ids
+        self.landmarks = []
+        
+        n = len(compilado)
+        columnas = []
+        cercania = [INFINITO] * n  # distancia de cada nodo al landmark más cercano
+        actual = random.Random(seed).randrange(n) if n else None
+        
+        # Selección "farthest": cada landmark nuevo es el nodo más lejano a los ya elegidos
+        while actual is not None and len(self.landmarks) < min(num_landmarks, n):
+            self.landmarks.append(actual)
+            distancias = dijkstra_un_origen(compilado, self.nombres[actual]).distancias
+            columna = [distancias.get(u, INFINITO) for u in range(n)]
+            columnas.append(columna)
+            
+            for u in range(n):
+                if columna[u] < cercania[u]:
+                    cercania[u] = columna[u]
+            candidato = max(range(n), key=cercania.__getitem__)
+            actual = candidato if cercania[candidato] > 0 else None
+        
+        self.k = len(columnas)
+        self.distancias = array('d', [columna[u] for u in range(n) for columna in columnas])
+    
+    def _fila(self, u):
+        """Distancias del nodo con ID u a todos los landmarks"""
+        return self.distancias[u * self.k:(u + 1) * self.k]
+    
+    def h(self, nodo, objetivo):
+        """Cota inferior de la distancia entre dos nodos (por nombre)"""
+        return self.para_objetivo(objetivo)(nodo)
+    
+    def para_objetivo(self, objetivo, nombres=None):
+        """
+        Construye la función h(nodo) hacia un objetivo
+        
+        Args:
+            objetivo: nombre del nodo objetivo
+            nombres: tabla ID→nombre del grafo que usa la búsqueda, o None si
+                la búsqueda trabaja directamente con nombres
+        
+        Returns:
+            function: h(clave) sobre las claves internas de la búsqueda
+        """
+        if objetivo not in self.ids or self.k == 0:
+            return lambda nodo: 0
+        
+        fila_objetivo = self._fila(self.ids[objetivo])
+        # Landmarks que no alcanzan al objetivo no aportan cota
+        validos = [i for i, d in enumerate(fila_objetivo) if d != INFINITO]
+        distancias = self.distancias
+        k = self.k
+        
+        if len(validos) == k:
+            def cota(u):
+                return max(map(abs, map(sub, distancias[u * k:(u + 1) * k], fila_objetivo)))
+        else:
+            def cota(u):
+                base = u * k
+                return max((abs(distancias[base + i] - fila_objetivo[i]) for i in validos), default=0)
+        
+        return self._adaptar(cota, nombres)
+    
+    def para_objetivos(self, objetivos, nombres=None):
+        """
+        Construye la función h(nodo) hacia el más cercano de varios objetivos
+        
+        Para cada landmark la cota es la distancia de d(L, n) al valor d(L, t)
+        más próximo entre los objetivos (bisect sobre los valores ordenados).
+        El máximo sobre landmarks nunca supera min_t max_L |d(L, t) - d(L, n)|,
+        sigue siendo consistente y cuesta O(k log T) por nodo en vez de O(k T)
+        
+        Args:
+            objetivos: nombres de los nodos objetivo
+            nombres: tabla ID→nombre del grafo que usa la búsqueda, o None
+        
+        Returns:
+            function: h(clave) sobre las claves internas de la búsqueda
+        """
+        ids_objetivos = [self.ids[objetivo] for objetivo in objetivos if objetivo in self.ids]
+        if not ids_objetivos or self.k == 0:
+            return lambda nodo: 0
+        if len(ids_objetivos) == 1:
+            return self.para_objetivo(self.nombres[ids_objetivos[0]], nombres)
+        
+        distancias = self.distancias
+        k = self.k
+        columnas = []
+        for i in range(k):
+            # Un objetivo que el landmark no alcanza está en otra componente (grafo
+            # no dirigido): desde la componente del landmark tampoco es alcanzable
+            valores = sorted(distancias[t * k + i] for t in ids_objetivos if distancias[t * k + i] != INFINITO)
+            if valores:
+                columnas.append((i, valores))
+        
+        def cota(u):
+            base = u * k
+            mejor = 0
+            for i, valores in columnas:
+                x = distancias[base + i]
+                if x == INFINITO:
+                    continue
+                j = bisect_left(valores, x)
+                cercano = valores[j] - x if j < len(valores) else INFINITO
+                if j and x - valores[j - 1] < cercano:
+                    cercano = x - valores[j - 1]
+                if cercano > mejor:
+                    mejor = cercano
+            return mejor
+        
+        return self._adaptar(cota, nombres)
+    
+    def _adaptar(self, cota, nombres):
+        """Adapta una cota sobre IDs propios a las claves internas de la búsqueda"""
+        ids = self.ids
+        if nombres is self.nombres:
+            return cota
+        if nombres is None:
+            return lambda nodo: cota(ids[nodo]) if nodo in ids else 0
+        return lambda nodo: cota(ids[nombres[nodo]]) if nombres[nodo] in ids else 0
+
+def generar_heuristica_landmarks(grafo, num_landmarks=8, seed=17):
+    """
+    Precalcula la heurística ALT de un grafo
+    
+    Args:
+        grafo: diccionario con el grafo o GrafoCompilado
+        num_landmarks: número de landmarks (k)
+        seed: semilla para elegir el primer landmark
+    
+    Returns:
+        HeuristicaLandmarks: proveedor válido para cualquier objetivo
+    """
+    return HeuristicaLandmarks(grafo, num_landmarks, seed)
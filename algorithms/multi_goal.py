@@ -0,0 +1,206 @@
+"""
+Búsquedas con varios orígenes y varios objetivos ("el depósito más cercano")
+Una sola búsqueda reemplaza a N: la frontera arranca con todos los orígenes
+a costo 0 y termina al cerrar el primer objetivo, o los k más cercanos
+"""
+
+from collections import deque
+
+from algorithms.frontier import FronteraPrioridad
+from algorithms.instrumentation import instrumentable
+from algorithms.search_algorithms import _SIN_VECINOS, _con_ausentes, _preparar_heuristica, _reconstruir_camino, _nombre
+from utils.graph_utils import GrafoCompilado
+
+def _como_lista(nodos):
+    """Un nombre suelto o una colección de nombres, sin repetidos y en orden"""
+    if isinstance(nodos, str):
+        return [nodos]
+    return list(dict.fromkeys(nodos))
+
+def _preparar_multiple(grafo, origenes, objetivos, instrumentacion=None):
+    """
+    Como _preparar, pero con varios orígenes y objetivos
+    
+    Returns:
+        tuple: (vecinos, origenes, objetivos, nombres) con orígenes en lista y
+        objetivos en conjunto, ambos con las claves internas del grafo
+    """
+    origenes = _como_lista(origenes)
+    objetivos = _como_lista(objetivos)
+    if isinstance(grafo, GrafoCompilado):
+        vecinos, nombres = grafo.vecinos, grafo.nombres
+        claves = grafo.ids
+        if any(nodo not in claves for nodo in objetivos + origenes):
+            # Como en el dict, un nodo desconocido no tiene vecinos
+            vecinos, claves, nombres = _con_ausentes(grafo, objetivos + origenes)
+        origenes = [claves[nodo] for nodo in origenes]
+        objetivos = [claves[nodo] for nodo in objetivos]
+    else:
+        def vecinos(nodo):
+            return grafo.get(nodo, _SIN_VECINOS).items()
+        nombres = None
+    
+    if instrumentacion is not None:
+        vecinos = instrumentacion.preparar(vecinos, nombres)
+    return vecinos, origenes, set(objetivos), nombres
+
+def _preparar_heuristica_multiple(heuristica, nombres, objetivos):
+    """
+    Devuelve h(nodo) = cota de la distancia al objetivo más cercano
+    
+    La heurística puede ser:
+    - un proveedor con para_objetivos (HeuristicaLandmarks): cota conjunta
+    - un proveedor con para_objetivo: mínimo de las cotas de cada objetivo
+    - un dict {objetivo: {nodo: valor}}: mínimo de los valores de cada objetivo
+    - un dict {nodo: valor} ya calculado respecto del conjunto de objetivos
+    """
+    if heuristica is None:
+        return lambda nodo: 0
+    nombres_objetivos = [_nombre(objetivo, nombres) for objetivo in objetivos]
+    if hasattr(heuristica, 'para_objetivos'):
+        return heuristica.para_objetivos(nombres_objetivos, nombres)
+    if hasattr(heuristica, 'para_objetivo'):
+        funciones = [heuristica.para_objetivo(objetivo, nombres) for objetivo in nombres_objetivos]
+        return lambda nodo: min(f(nodo) for f in funciones)
+    if isinstance(next(iter(heuristica.values()), None), dict):
+        tablas = [heuristica.get(objetivo, {}) for objetivo in nombres_objetivos]
+        if nombres is None:
+            return lambda nodo: min(tabla.get(nodo, 0) for tabla in tablas)
+        return lambda nodo: min(tabla.get(nombres[nodo], 0) for tabla in tablas)
+    return _preparar_heuristica(heuristica, nombres, None)
+
+def _encontrado(padres, objetivo, costo, nombres, instrumentacion):
+    """Entrada de un objetivo alcanzado; el primero queda como solución parcial"""
+    camino = _reconstruir_camino(padres, objetivo, nombres)
+    if instrumentacion is not None and instrumentacion.solucion is None:
+        instrumentacion.registrar_solucion(camino, costo)
+    return {'objetivo': camino[-1], 'origen': camino[0], 'camino': camino, 'costo': costo}
+
+def _resultado(encontrados, nodos_expandidos):
+    """
+    Resultado con el formato de las búsquedas simples para el objetivo más
+    cercano, más 'objetivo', 'origen' y 'objetivos' (todos los alcanzados, en
+    orden de distancia)
+    """
+    if not encontrados:
+        return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos, 'objetivos': []}
+    primero = encontrados[0]
+    return {'exito': True, 'camino': primero['camino'], 'costo': primero['costo'],
+            'nodos_expandidos': nodos_expandidos, 'objetivo': primero['objetivo'], 'origen': primero['origen'],
+            'objetivos': encontrados}
+
+@instrumentable
+def busqueda_amplitud_multiple(grafo, origenes, objetivos, k=1, instrumentacion=None):
+    """
+    Búsqueda en amplitud - Varios orígenes y objetivos
+    
+    Args:
+        grafo: diccionario con el grafo o GrafoCompilado
+        origenes: nombre de un nodo o colección de nombres
+        objetivos: nombre de un nodo o colección de nombres
+        k: objetivos a alcanzar antes de parar (None = todos); se encuentran
+            en orden de número de saltos
+    
+    Returns:
+        dict: resultado del objetivo más cercano y 'objetivos' con los k
+    """
+    vecinos, origenes, objetivos, nombres = _preparar_multiple(grafo, origenes, objetivos, instrumentacion)
+    k = len(objetivos) if k is None else k
+    padres = dict.fromkeys(origenes)
+    cola = deque((origen, 0) for origen in origenes)
+    encontrados = []
+    nodos_expandidos = 0
+    if instrumentacion is not None:
+        instrumentacion.agregar(len(cola))
+    
+    while cola and len(encontrados) < k:
+        nodo_actual, costo_acumulado = cola.popleft()
+        nodos_expandidos += 1
+        if instrumentacion is not None:
+            instrumentacion.expandir(nodo_actual, costo_acumulado, len(cola) + 1, len(padres))
+        
+        if nodo_actual in objetivos:
+            encontrados.append(_encontrado(padres, nodo_actual, costo_acumulado, nombres, instrumentacion))
+            if len(encontrados) >= k:
+                break
+        
+        for vecino, peso in vecinos(nodo_actual):
+            if vecino not in padres:
+                padres[vecino] = nodo_actual
+                cola.append((vecino, costo_acumulado + peso))
+                if instrumentacion is not None:
+                    instrumentacion.agregar()
+    
+    return _resultado(encontrados, nodos_expandidos)
+
+def _busqueda_prioridad_multiple(vecinos, origenes, objetivos, nombres, h, k, instrumentacion):
+    """Costo uniforme (h=None) o A* desde todos los orígenes hasta cerrar k objetivos"""
+    frontera = FronteraPrioridad()
+    agregar = frontera.agregar
+    cerrados = frontera.cerrados
+    for origen in origenes:
+        agregar(origen, 0, h(origen) if h is not None else 0, None)
+    encontrados = []
+    nodos_expandidos = 0
+    if instrumentacion is not None:
+        instrumentacion.observar_frontera(frontera)
+    
+    while frontera and len(encontrados) < k:
+        nodo_actual, costo_actual = frontera.extraer()
+        nodos_expandidos += 1
+        if instrumentacion is not None:
+            instrumentacion.expandir(nodo_actual, costo_actual, len(frontera) + 1, len(cerrados))
+        
+        # Con h consistente un objetivo cerrado ya tiene su costo mínimo, y los
+        # objetivos se cierran en orden de costo porque h(objetivo) = 0
+        if nodo_actual in objetivos:
+            encontrados.append(_encontrado(frontera.padres, nodo_actual, costo_actual, nombres, instrumentacion))
+            if len(encontrados) >= k:
+                break
+        
+        for vecino, peso in vecinos(nodo_actual):
+            if vecino not in cerrados:
+                nuevo_costo = costo_actual + peso
+                prioridad = nuevo_costo + h(vecino) if h is not None else nuevo_costo
+                agregar(vecino, nuevo_costo, prioridad, nodo_actual)
+    
+    resultado = _resultado(encontrados, nodos_expandidos)
+    resultado['frontera'] = frontera.estadisticas()
+    return resultado
+
+@instrumentable
+def busqueda_costo_uniforme_multiple(grafo, origenes, objetivos, k=1, instrumentacion=None):
+    """
+    Búsqueda de costo uniforme - Varios orígenes y objetivos
+    
+    Args:
+        origenes, objetivos: nombre de un nodo o colección de nombres
+        k: objetivos a alcanzar antes de parar (None = todos), en orden de costo
+    
+    Returns:
+        dict: resultado del objetivo más cercano y 'objetivos' con los k
+    """
+    vecinos, origenes, objetivos, nombres = _preparar_multiple(grafo, origenes, objetivos, instrumentacion)
+    k = len(objetivos) if k is None else k
+    return _busqueda_prioridad_multiple(vecinos, origenes, objetivos, nombres, None, k, instrumentacion)
+
+@instrumentable
+def busqueda_a_estrella_multiple(grafo, origenes, objetivos, heuristica, k=1, instrumentacion=None):
+    """
+    Búsqueda A* - Varios orígenes y objetivos
+    h(n) es una cota de la distancia al objetivo más cercano: con landmarks
+    se calcula en O(k log T) por nodo (HeuristicaLandmarks.para_objetivos)
+    
+    Args:
+        origenes, objetivos: nombre de un nodo o colección de nombres
+        heuristica: ver _preparar_heuristica_multiple; con una heurística
+            consistente los k objetivos salen en orden de costo óptimo
+        k: objetivos a alcanzar antes de parar (None = todos)
+    
+    Returns:
+        dict: resultado del objetivo más cercano y 'objetivos' con los k
+    """
+    vecinos, origenes, objetivos, nombres = _preparar_multiple(grafo, origenes, objetivos, instrumentacion)
+    k = len(objetivos) if k is None else k
+    h = _preparar_heuristica_multiple(heuristica, nombres, objetivos)
+    return _busqueda_prioridad_multiple(vecinos, origenes, objetivos, nombres, h, k, instrumentacion)
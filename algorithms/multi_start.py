@@ -0,0 +1,178 @@
+"""
+Búsqueda local multi-arranque en paralelo (Hill Climbing con reinicios y
+Simulated Annealing). Cada cadena corre en un proceso con su propio flujo
+aleatorio derivado de la semilla; la primera que llega al objetivo detiene
+a las demás
+"""
+
+import time
+import random
+import multiprocessing
+
+from algorithms.search_algorithms import (_preparar, _preparar_heuristica, _a_nombres, ejecutar_pasos,
+                                          _ascenso_colinas, _recocido_simulado)
+from utils.graph_utils import compilar_grafo
+
+METODOS = ('hill_climbing', 'simulated_annealing')
+
+# Estado de cada proceso trabajador (se llena en _inicializar_trabajador)
+_GRAFO = None
+_HEURISTICA = None
+_DETENER = None
+
+def _inicializar_trabajador(grafo, heuristica, evento_detener):
+    """Recibe el grafo, la heurística y la señal de parada una vez por proceso"""
+    global _GRAFO, _HEURISTICA, _DETENER
+    _GRAFO = grafo
+    _HEURISTICA = heuristica
+    _DETENER = evento_detener
+
+def semilla_cadena(semilla, indice):
+    """Semilla reproducible e independiente para la cadena número indice"""
+    return f"{semilla}:{indice}"
+
+def ejecutar_cadena(grafo, nodo_ini, nodo_fin, heuristica, metodo, indice, semilla, params, detener=None):
+    """
+    Ejecuta una cadena de búsqueda local
+    
+    Args:
+        metodo: 'hill_climbing' (la cadena 0 arranca en nodo_ini y las demás en
+            un nodo aleatorio) o 'simulated_annealing' (todas desde nodo_ini)
+        indice: número de la cadena
+        semilla: semilla base; la cadena usa semilla_cadena(semilla, indice)
+        params: max_iteraciones y, para el recocido, temperatura_inicial y
+            tasa_enfriamiento
+        detener: función sin argumentos que indica si hay que abandonar
+    
+    Returns:
+        dict: resultado de la cadena con sus estadísticas
+    """
+    tiempo_inicio = time.perf_counter()
+    rng = random.Random(semilla_cadena(semilla, indice))
+    
+    inicio = nodo_ini
+    if metodo == 'hill_climbing' and indice > 0:
+        inicio = rng.choice(list(grafo.keys()))
+    
+    vecinos, clave_ini, clave_fin, nombres = _preparar(grafo, inicio, nodo_fin)
+    max_iteraciones = params.get('max_iteraciones', 100)
+    
+    if metodo == 'hill_climbing':
+        h = _preparar_heuristica(heuristica, nombres, clave_fin, float('inf'))
+        camino, costo, nodos_expandidos = ejecutar_pasos(_ascenso_colinas(vecinos, clave_ini, clave_fin, h,
+                                                                          max_iteraciones, detener))
+    elif metodo == 'simulated_annealing':
+        h = _preparar_heuristica(heuristica, nombres, clave_fin)
+        camino, costo, nodos_expandidos = ejecutar_pasos(_recocido_simulado(
+            vecinos, clave_ini, clave_fin, h, rng,
+            params.get('temperatura_inicial', 100), params.get('tasa_enfriamiento', 0.95),
+            max_iteraciones, detener))
+    else:
+        raise ValueError(f"Método desconocido: {metodo}")
+    
+    exito = camino[-1] == clave_fin
+    return {
+        'cadena': indice,
+        'inicio': inicio,
+        'exito': exito,
+        'camino': _a_nombres(camino, nombres),
+        'costo': costo,
+        'nodos_expandidos': nodos_expandidos,
+        'h_final': h(camino[-1]),
+        'detenida': not exito and detener is not None and detener(),
+        'tiempo': time.perf_counter() - tiempo_inicio
+    }
+
+def _ejecutar_en_trabajador(entrada):
+    """Punto de entrada de cada cadena dentro del pool"""
+    nodo_ini, nodo_fin, metodo, indice, semilla, params = entrada
+    return ejecutar_cadena(_GRAFO, nodo_ini, nodo_fin, _HEURISTICA, metodo, indice, semilla,
+                           params, _DETENER.is_set)
+
+def _es_mejor(resultado, mejor):
+    """Éxito con menor costo; entre fracasos, el que termina más cerca (menor h)"""
+    if mejor is None:
+        return True
+    if resultado['exito'] != mejor['exito']:
+        return resultado['exito']
+    if resultado['exito']:
+        return resultado['costo'] < mejor['costo']
+    return resultado['h_final'] < mejor['h_final']
+
+def busqueda_multi_arranque(grafo, nodo_ini, nodo_fin, heuristica, metodo='simulated_annealing',
+                            num_cadenas=8, procesos=None, semilla=0, detener_al_exito=True, **params):
+    """
+    Ejecuta num_cadenas cadenas independientes de búsqueda local a la vez
+    
+    Args:
+        grafo: diccionario con el grafo o GrafoCompilado
+        heuristica: dict o proveedor con para_objetivo (debe poder enviarse a
+            otros procesos)
+        metodo: 'hill_climbing' o 'simulated_annealing'
+        num_cadenas: cadenas (reinicios) independientes
+        procesos: número de procesos (por defecto, uno por núcleo); con 1 las
+            cadenas corren en este mismo proceso
+        semilla: semilla base; con la misma semilla cada cadena repite su recorrido
+        detener_al_exito: abandona las demás cadenas cuando una llega a nodo_fin
+        **params: max_iteraciones, temperatura_inicial, tasa_enfriamiento
+    
+    Returns:
+        dict: mejor resultado ('exito', 'camino', 'costo') con 'nodos_expandidos'
+        sumado sobre todas las cadenas y 'cadenas' con las estadísticas de cada una
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"Método desconocido: {metodo}")
+    
+    if nodo_ini == nodo_fin:
+        return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0,
+                'cadena_ganadora': None, 'cadenas': []}
+    
+    grafo = compilar_grafo(grafo)
+    cadenas = []
+    mejor = None
+    
+    def registrar(resultado):
+        nonlocal mejor
+        cadenas.append(resultado)
+        if _es_mejor(resultado, mejor):
+            mejor = resultado
+        return detener_al_exito and resultado['exito']
+    
+    if procesos == 1:
+        for indice in range(num_cadenas):
+            if registrar(ejecutar_cadena(grafo, nodo_ini, nodo_fin, heuristica, metodo, indice, semilla, params)):
+                break
+    else:
+        evento_detener = multiprocessing.Event()
+        entradas = [(nodo_ini, nodo_fin, metodo, indice, semilla, params) for indice in range(num_cadenas)]
+        with multiprocessing.Pool(procesos, initializer=_inicializar_trabajador,
+                                  initargs=(grafo, heuristica, evento_detener)) as pool:
+            for resultado in pool.imap_unordered(_ejecutar_en_trabajador, entradas):
+                if registrar(resultado):
+                    # Las cadenas en curso lo ven en su siguiente paso; las pendientes no arrancan
+                    evento_detener.set()
+                    break
+    
+    cadenas.sort(key=lambda c: c['cadena'])
+    return {
+        'exito': mejor['exito'],
+        'camino': mejor['camino'],
+        'costo': mejor['costo'],
+        'nodos_expandidos': sum(c['nodos_expandidos'] for c in cadenas),
+        'cadena_ganadora': mejor['cadena'],
+        'cadenas': cadenas
+    }
+
+def busqueda_random_restart_hill_climbing_paralela(grafo, nodo_ini, nodo_fin, heuristica, max_reinicios=8,
+                                                   pasos_por_intento=10, procesos=None, semilla=0):
+    """Hill Climbing con reinicios aleatorios ejecutados en paralelo"""
+    return busqueda_multi_arranque(grafo, nodo_ini, nodo_fin, heuristica, 'hill_climbing', max_reinicios,
+                                   procesos, semilla, max_iteraciones=pasos_por_intento)
+
+def busqueda_simulated_annealing_paralela(grafo, nodo_ini, nodo_fin, heuristica, num_cadenas=8,
+                                          temperatura_inicial=100, tasa_enfriamiento=0.95,
+                                          max_iteraciones=100, procesos=None, semilla=0):
+    """Varias cadenas de Simulated Annealing ejecutadas en paralelo"""
+    return busqueda_multi_arranque(grafo, nodo_ini, nodo_fin, heuristica, 'simulated_annealing', num_cadenas,
+                                   procesos, semilla, temperatura_inicial=temperatura_inicial,
+                                   tasa_enfriamiento=tasa_enfriamiento, max_iteraciones=max_iteraciones)
@@ -0,0 +1,159 @@
+"""
+Árboles de caminos mínimos de un solo origen con caché LRU
+Para muchas consultas desde el mismo nodo inicial: un Dijkstra uno-a-todos
+se calcula una vez y cada consulta posterior sólo recorre el camino pedido
+"""
+
+from collections import OrderedDict
+
+from algorithms.frontier import frontera_costo_uniforme
+from algorithms.search_algorithms import _preparar, _reconstruir_camino
+from utils.graph_utils import GrafoCompilado, huella_grafo
+
+class ArbolCaminosMinimos:
+    """
+    Árbol de caminos mínimos completo desde un origen
+    distancias y padres usan las claves internas del grafo (IDs si es compilado)
+    """
+    def __init__(self, origen, distancias, padres, nombres, ids, nodos_expandidos):
+        self.origen = origen
+        self.distancias = distancias
+        self.padres = padres
+        self.nombres = nombres
+        self.ids = ids
+        self.nodos_expandidos = nodos_expandidos
+    
+    def consultar(self, nodo_fin):
+        """
+        Responde costo y camino hacia nodo_fin en O(longitud del camino)
+        
+        Returns:
+            dict: mismo formato que busqueda_costo_uniforme, con nodos_expandidos=0
+            porque la consulta no expande nada
+        """
+        if nodo_fin == self.origen:
+            return {'exito': True, 'camino': [nodo_fin], 'costo': 0, 'nodos_expandidos': 0}
+        
+        clave = nodo_fin if self.ids is None else self.ids.get(nodo_fin)
+        if clave not in self.distancias:
+            return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': 0}
+        
+        camino = _reconstruir_camino(self.padres, clave, self.nombres)
+        return {'exito': True, 'camino': camino, 'costo': self.distancias[clave], 'nodos_expandidos': 0}
+
+def dijkstra_un_origen(grafo, nodo_ini):
+    """
+    Dijkstra uno-a-todos: calcula el árbol de caminos mínimos completo
+    
+    Args:
+        grafo: diccionario con el grafo o GrafoCompilado
+        nodo_ini: nodo origen
+    
+    Returns:
+        ArbolCaminosMinimos: distancias y padres de todos los nodos alcanzables
+    """
+    vecinos, origen, _, nombres = _preparar(grafo, nodo_ini, nodo_ini)
+    frontera = frontera_costo_uniforme(grafo)
+    agregar = frontera.agregar
+    cerrados = frontera.cerrados
+    agregar(origen, 0, 0, None)
+    distancias = {}
+    
+    while frontera:
+        nodo_actual, costo_actual = frontera.extraer()
+        distancias[nodo_actual] = costo_actual
+        
+        for vecino, peso in vecinos(nodo_actual):
+            if vecino not in cerrados:
+                nuevo_costo = costo_actual + peso
+                agregar(vecino, nuevo_costo, nuevo_costo, nodo_actual)
+    
+    ids = None if nombres is None else grafo.ids
+    return ArbolCaminosMinimos(nodo_ini, distancias, frontera.padres, nombres, ids, len(distancias))
+
+class CacheArbolesCaminos:
+    """
+    Caché LRU de árboles de caminos mínimos
+    La clave es (huella del grafo, compilado o no, origen), así que cargar
+    otro grafo nunca reutiliza árboles viejos; éstos simplemente salen por LRU
+    
+    La huella (orden O(E log E)) se calcula una vez por grafo: el
+    GrafoCompilado la guarda y la del último dict consultado se recuerda
+    mientras llegue el mismo objeto. Un dict modificado en el lugar debe
+    pasarse con huella= nueva o tras limpiar()
+    """
+    def __init__(self, max_arboles=8):
+        self.max_arboles = max_arboles
+        self.arboles = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self._ultimo_dict = None  # (grafo, huella) del último dict consultado
+    
+    def _huella(self, grafo):
+        """Huella del grafo sin recalcularla para el mismo objeto"""
+        if isinstance(grafo, GrafoCompilado):
+            return huella_grafo(grafo)
+        if self._ultimo_dict is not None and self._ultimo_dict[0] is grafo:
+            return self._ultimo_dict[1]
+        huella = huella_grafo(grafo)
+        self._ultimo_dict = (grafo, huella)
+        return huella
+    
+    def obtener_arbol(self, grafo, nodo_ini, huella=None):
+        """
+        Retorna el árbol del origen, calculándolo si no está en caché
+        
+        Args:
+            grafo: diccionario con el grafo o GrafoCompilado
+            nodo_ini: nodo origen
+            huella: huella precalculada del grafo (evita recalcularla para dicts)
+        
+        Returns:
+            tuple: (ArbolCaminosMinimos, desde_cache)
+        """
+        if huella is None:
+            huella = self._huella(grafo)
+        # Un dict y su GrafoCompilado tienen la misma huella pero el árbol usa
+        # sus claves internas (nombres o IDs): no son intercambiables
+        clave = (huella, isinstance(grafo, GrafoCompilado), nodo_ini)
+        
+        arbol = self.arboles.get(clave)
+        if arbol is not None:
+            self.arboles.move_to_end(clave)
+            self.aciertos += 1
+            return arbol, True
+        
+        self.fallos += 1
+        arbol = dijkstra_un_origen(grafo, nodo_ini)
+        self.arboles[clave] = arbol
+        if len(self.arboles) > self.max_arboles:
+            self.arboles.popitem(last=False)
+        return arbol, False
+    
+    def consultar(self, grafo, nodo_ini, nodo_fin, huella=None):
+        """Consulta costo y camino usando (o creando) el árbol del origen"""
+        arbol, desde_cache = self.obtener_arbol(grafo, nodo_ini, huella)
+        resultado = arbol.consultar(nodo_fin)
+        # La consulta que construye el árbol paga su expansión completa
+        if not desde_cache:
+            resultado['nodos_expandidos'] = arbol.nodos_expandidos
+        resultado['desde_cache'] = desde_cache
+        return resultado
+    
+    def limpiar(self):
+        """Elimina todos los árboles guardados"""
+        self.arboles.clear()
+        self._ultimo_dict = None
+    
+    def estadisticas(self):
+        """Retorna aciertos, fallos y número de árboles guardados"""
+        return {'aciertos': self.aciertos, 'fallos': self.fallos, 'arboles': len(self.arboles)}
+
+# Caché compartida por defecto
+CACHE_ARBOLES = CacheArbolesCaminos()
+
+def busqueda_costo_uniforme_cacheada(grafo, nodo_ini, nodo_fin, cache=None):
+    """Búsqueda de costo uniforme respondida desde el árbol de caminos mínimos del origen"""
+    if cache is None:
+        cache = CACHE_ARBOLES
+    return cache.consultar(grafo, nodo_ini, nodo_fin)
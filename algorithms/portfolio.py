@@ -0,0 +1,127 @@
+"""
+Carrera de un portafolio de algoritmos: todos arrancan a la vez en procesos
+separados y se responde con el primer resultado que cumple el criterio; los
+demás procesos se cancelan
+"""
+
+import time
+import multiprocessing
+
+from algorithms.search_algorithms import (ALGORITMOS, ALGORITMOS_INFORMADOS, ALGORITMOS_OPTIMOS,
+                                          ALGORITMOS_OPTIMOS_SI_ADMISIBLE)
+from utils.graph_utils import compilar_grafo
+
+CRITERIOS = ('primero', 'optimo', 'cota')
+
+# Estado de cada proceso trabajador (se llena en _inicializar_trabajador)
+_GRAFO = None
+_HEURISTICA = None
+
+def _inicializar_trabajador(grafo, heuristica):
+    """Recibe el grafo y la heurística una vez por proceso"""
+    global _GRAFO, _HEURISTICA
+    _GRAFO = grafo
+    _HEURISTICA = heuristica
+
+def _ejecutar_en_trabajador(entrada):
+    """Ejecuta un algoritmo del portafolio dentro del pool"""
+    algoritmo, nodo_ini, nodo_fin, params = entrada
+    salida = {'algoritmo': algoritmo}
+    
+    tiempo_inicio = time.perf_counter()
+    try:
+        funcion = ALGORITMOS[algoritmo]
+        if algoritmo in ALGORITMOS_INFORMADOS:
+            salida['resultado'] = funcion(_GRAFO, nodo_ini, nodo_fin, _HEURISTICA, **params)
+        else:
+            salida['resultado'] = funcion(_GRAFO, nodo_ini, nodo_fin, **params)
+    except Exception as e:
+        salida['resultado'] = None
+        salida['error'] = str(e)
+    salida['tiempo'] = time.perf_counter() - tiempo_inicio
+    return salida
+
+def es_optimo_garantizado(algoritmo, heuristica_admisible=False):
+    """Indica si el algoritmo garantiza el costo mínimo"""
+    if algoritmo in ALGORITMOS_OPTIMOS:
+        return True
+    return heuristica_admisible and algoritmo in ALGORITMOS_OPTIMOS_SI_ADMISIBLE
+
+def construir_criterio(criterio, costo_max=None, heuristica_admisible=False):
+    """
+    Convierte el nombre de un criterio en una función (algoritmo, resultado) -> bool
+    
+    Args:
+        criterio: 'primero' (cualquier camino), 'optimo' (el de un algoritmo con
+            óptimo garantizado), 'cota' (costo <= costo_max) o una función propia
+        costo_max: cota de costo para el criterio 'cota'
+        heuristica_admisible: si A* e IDA* cuentan como óptimos
+    """
+    if callable(criterio):
+        return criterio
+    if criterio == 'primero':
+        return lambda algoritmo, resultado: resultado['exito']
+    if criterio == 'optimo':
+        return lambda algoritmo, resultado: (resultado['exito'] and
+                                             es_optimo_garantizado(algoritmo, heuristica_admisible))
+    if criterio == 'cota':
+        if costo_max is None:
+            raise ValueError("El criterio 'cota' necesita costo_max")
+        return lambda algoritmo, resultado: resultado['exito'] and resultado['costo'] <= costo_max
+    raise ValueError(f"Criterio desconocido: {criterio}")
+
+def carrera_portafolio(grafo, nodo_ini, nodo_fin, algoritmos, heuristica=None, criterio='optimo',
+                       costo_max=None, heuristica_admisible=False, procesos=None):
+    """
+    Ejecuta los algoritmos en paralelo y devuelve el primero que cumple el criterio
+    
+    Args:
+        grafo: diccionario con el grafo o GrafoCompilado
+        algoritmos: nombres registrados en ALGORITMOS o tuplas (nombre, params)
+        heuristica: dict o proveedor para los algoritmos informados
+        criterio: ver construir_criterio
+        procesos: número de procesos (por defecto, uno por algoritmo)
+    
+    Returns:
+        dict: {'ganador', 'resultado', 'latencia', 'terminados', 'cancelados'};
+        'ganador' es None si ningún resultado cumplió el criterio, y
+        'terminados' lista {'algoritmo', 'resultado', 'tiempo', 'cumple'} en
+        orden de llegada
+    """
+    cumple = construir_criterio(criterio, costo_max, heuristica_admisible)
+    entradas = []
+    for algoritmo in algoritmos:
+        nombre, params = (algoritmo, {}) if isinstance(algoritmo, str) else algoritmo
+        if nombre not in ALGORITMOS:
+            raise ValueError(f"Algoritmo desconocido: {nombre}")
+        entradas.append((nombre, nodo_ini, nodo_fin, dict(params or {})))
+    
+    grafo = compilar_grafo(grafo)
+    terminados = []
+    ganador = None
+    tiempo_inicio = time.perf_counter()
+    
+    # Un proceso por algoritmo para que todos arranquen a la vez
+    pool = multiprocessing.Pool(procesos or len(entradas), initializer=_inicializar_trabajador,
+                                initargs=(grafo, heuristica))
+    try:
+        for salida in pool.imap_unordered(_ejecutar_en_trabajador, entradas):
+            salida['cumple'] = salida['resultado'] is not None and cumple(salida['algoritmo'], salida['resultado'])
+            terminados.append(salida)
+            if salida['cumple']:
+                ganador = salida
+                break
+    finally:
+        # Cancela los algoritmos que siguen corriendo
+        pool.terminate()
+        pool.join()
+    
+    latencia = time.perf_counter() - tiempo_inicio
+    nombres_terminados = {salida['algoritmo'] for salida in terminados}
+    return {
+        'ganador': ganador['algoritmo'] if ganador else None,
+        'resultado': ganador['resultado'] if ganador else None,
+        'latencia': latencia,
+        'terminados': terminados,
+        'cancelados': [entrada[0] for entrada in entradas if entrada[0] not in nombres_terminados]
+    }
@@ -0,0 +1,204 @@
+"""
+Caché de resultados de búsqueda
+La clave combina la huella de contenido del grafo, el algoritmo, los nodos,
+la identidad de la heurística y los parámetros, así que repetir una consulta
+(o reabrir la comparativa) no vuelve a ejecutar la búsqueda
+
+Sólo se guardan respuestas definitivas: nunca las búsquedas anytime ni los
+resultados cortados por un presupuesto o un límite propio ('motivo' distinto
+de 'completa')
+"""
+
+import sys
+import copy
+import time
+import hashlib
+from collections import OrderedDict
+
+from algorithms.search_algorithms import ALGORITMOS, ALGORITMOS_INFORMADOS
+from algorithms.budget import MOTIVO_COMPLETA
+from utils.graph_utils import huella_grafo
+
+# Algoritmos aleatorios: sólo se guardan si se fija la semilla
+ALGORITMOS_ALEATORIOS = {'random_restart_hill_climbing', 'simulated_annealing'}
+
+# Algoritmos anytime: nunca se guardan; el resultado depende del reloj y un
+# acierto se saltaría las soluciones intermedias que entrega al_mejorar
+ALGORITMOS_ANYTIME = {'ara_estrella'}
+
+# Parámetros que no cambian el resultado de una búsqueda completa: quedan
+# fuera de la clave (un resultado cortado por el presupuesto no se guarda)
+PARAMETROS_SIN_EFECTO = {'instrumentacion', 'presupuesto'}
+
+def huella_heuristica(heuristica):
+    """
+    Identidad de una heurística para la clave de la caché
+    Un dict se identifica por su contenido; un proveedor (p. ej. landmarks),
+    por el objeto mismo
+    """
+    if heuristica is None:
+        return None
+    if isinstance(heuristica, dict):
+        sha = hashlib.sha1()
+        for nodo, valor in sorted(heuristica.items()):
+            sha.update(f"{nodo}\x00{valor!r}\n".encode('utf-8'))
+        return ('dict', sha.hexdigest())
+    return ('objeto', id(heuristica))
+
+def _tamano_aproximado(objeto):
+    """Bytes aproximados de un resultado (dicts, listas, tuplas y valores simples)"""
+    tamano = sys.getsizeof(objeto)
+    if isinstance(objeto, dict):
+        tamano += sum(_tamano_aproximado(k) + _tamano_aproximado(v) for k, v in objeto.items())
+    elif isinstance(objeto, (list, tuple, set)):
+        tamano += sum(_tamano_aproximado(elemento) for elemento in objeto)
+    return tamano
+
+class CacheResultados:
+    """
+    Caché LRU de resultados con límite de entradas y de bytes aproximados
+    
+    Al llegar una consulta de un grafo con otra huella (se cargó un grafo
+    nuevo) se descartan todas las entradas del grafo anterior
+    
+    Uso:
+        cache = CacheResultados()
+        resultado = cache.ejecutar(grafo, 'a_estrella', 'A', 'Z', heuristica)
+        resultado['desde_cache']  # True si no hubo que buscar
+    """
+    def __init__(self, max_entradas=256, max_bytes=16 * 1024 * 1024):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        # clave -> (resultado, tamaño, tiempo de cálculo, heurística)
+        self.entradas = OrderedDict()
+        self.bytes = 0
+        self.huella_grafo = None
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.invalidaciones = 0
+    
+    def clave(self, huella, algoritmo, nodo_ini, nodo_fin, heuristica=None, id_heuristica=None, params=None):
+        """
+        Construye la clave de una consulta
+        
+        Returns:
+            tuple o None: None si la consulta no se puede guardar (algoritmo
+            anytime, aleatorio sin semilla o parámetros no hasheables)
+        """
+        params = {nombre: valor for nombre, valor in (params or {}).items()
+                  if nombre not in PARAMETROS_SIN_EFECTO}
+        if algoritmo in ALGORITMOS_ANYTIME:
+            return None
+        if algoritmo in ALGORITMOS_ALEATORIOS and params.get('semilla') is None:
+            return None
+        if id_heuristica is None:
+            id_heuristica = huella_heuristica(heuristica)
+        clave = (huella, algoritmo, nodo_ini, nodo_fin, id_heuristica, tuple(sorted(params.items())))
+        try:
+            hash(clave)
+        except TypeError:
+            return None
+        return clave
+    
+    def ejecutar(self, grafo, algoritmo, nodo_ini, nodo_fin, heuristica=None, id_heuristica=None,
+                 huella=None, **params):
+        """
+        Retorna el resultado de la consulta, desde la caché o ejecutando ALGORITMOS[algoritmo]
+        
+        Args:
+            grafo: diccionario con el grafo o GrafoCompilado
+            algoritmo: nombre registrado en ALGORITMOS
+            heuristica: heurística de los algoritmos informados (en Branch and
+                Bound, la cota inferior opcional)
+            id_heuristica: identidad ya conocida de la heurística (evita
+                recorrer un dict grande en cada consulta)
+            huella: huella precalculada del grafo (evita recalcularla para dicts)
+            **params: argumentos extra del algoritmo; con instrumentacion, un
+                acierto devuelve los contadores guardados de la ejecución
+                original (el objeto recibido no se actualiza) y una entrada
+                guardada sin contadores se vuelve a calcular
+        
+        Returns:
+            dict: resultado con 'desde_cache' y 'tiempo_calculo' (segundos que
+            costó la búsqueda original)
+        """
+        if algoritmo not in ALGORITMOS:
+            raise ValueError(f"Algoritmo desconocido: {algoritmo}")
+        
+        if huella is None:
+            huella = huella_grafo(grafo)
+        if huella != self.huella_grafo:
+            # Grafo nuevo: las entradas del anterior ya no sirven
+            if self.entradas:
+                self.invalidaciones += 1
+            self.limpiar()
+            self.huella_grafo = huella
+        
+        clave = self.clave(huella, algoritmo, nodo_ini, nodo_fin, heuristica, id_heuristica, params)
+        entrada = self.entradas.get(clave) if clave is not None else None
+        instrumentada = params.get('instrumentacion') is not None
+        if entrada is not None and instrumentada and 'instrumentacion' not in entrada[0]:
+            # Guardada sin contadores: se vuelve a ejecutar para obtenerlos
+            entrada = None
+        if entrada is not None:
+            self.entradas.move_to_end(clave)
+            self.aciertos += 1
+            resultado = copy.deepcopy(entrada[0])
+            if not instrumentada:
+                resultado.pop('instrumentacion', None)
+            resultado['desde_cache'] = True
+            resultado['tiempo_calculo'] = entrada[2]
+            return resultado
+        
+        self.fallos += 1
+        funcion = ALGORITMOS[algoritmo]
+        tiempo_inicio = time.perf_counter()
+        if algoritmo in ALGORITMOS_INFORMADOS:
+            resultado = funcion(grafo, nodo_ini, nodo_fin, heuristica, **params)
+        elif heuristica is not None:
+            resultado = funcion(grafo, nodo_ini, nodo_fin, heuristica=heuristica, **params)
+        else:
+            resultado = funcion(grafo, nodo_ini, nodo_fin, **params)
+        tiempo_calculo = time.perf_counter() - tiempo_inicio
+        
+        # Una búsqueda cortada (presupuesto o límite propio) no es la respuesta definitiva
+        if clave is not None and resultado.get('motivo', MOTIVO_COMPLETA) == MOTIVO_COMPLETA:
+            self._guardar(clave, copy.deepcopy(resultado), tiempo_calculo, heuristica)
+        
+        resultado['desde_cache'] = False
+        resultado['tiempo_calculo'] = tiempo_calculo
+        return resultado
+    
+    def _guardar(self, clave, resultado, tiempo_calculo, heuristica):
+        """Inserta una entrada y desaloja las menos usadas hasta cumplir los límites"""
+        tamano = _tamano_aproximado(resultado)
+        if tamano > self.max_bytes:
+            return
+        
+        # La heurística se conserva para que su id() no se reutilice mientras la clave exista
+        self.entradas[clave] = (resultado, tamano, tiempo_calculo, heuristica)
+        self.bytes += tamano
+        while len(self.entradas) > self.max_entradas or self.bytes > self.max_bytes:
+            _, (_, tamano_viejo, _, _) = self.entradas.popitem(last=False)
+            self.bytes -= tamano_viejo
+            self.desalojos += 1
+    
+    def limpiar(self):
+        """Elimina todas las entradas guardadas"""
+        self.entradas.clear()
+        self.bytes = 0
+    
+    def estadisticas(self):
+        """Retorna aciertos, fallos, desalojos, invalidaciones y ocupación"""
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'desalojos': self.desalojos,
+            'invalidaciones': self.invalidaciones,
+            'entradas': len(self.entradas),
+            'bytes': self.bytes
+        }
+
+# Caché compartida por defecto
+CACHE_RESULTADOS = CacheResultados()
@@ -5,368 +5,1142 @@ Correcciones y optimizaciones aplicadas
 
 import random
 import math
+import time
 import heapq
 from collections import deque
 
-def busqueda_amplitud(grafo, nodo_ini, nodo_fin):
-    """Búsqueda en amplitud (BFS) - Optimizada"""
+from algorithms.frontier import FronteraPrioridad, frontera_costo_uniforme
+from algorithms.instrumentation import instrumentable
+from algorithms.budget import MOTIVO_ITERACIONES, MOTIVO_TIEMPO
+from utils.graph_utils import GrafoCompilado
+
+_SIN_VECINOS = {}
+
+# Eventos de los generadores pasos_* (sólo con emitir=True), tuplas compactas:
+#   (EVENTO_EXPANDIR, nodo, g)         se expande nodo con costo acumulado g
+#   (EVENTO_GENERAR, nodo, g, padre)   nodo entra en la frontera desde padre
+#   (EVENTO_OBJETIVO, nodo, costo)     se llegó al objetivo (B&B y ARA* pueden mejorarlo)
+EVENTO_EXPANDIR = 'expandir'
+EVENTO_GENERAR = 'generar'
+EVENTO_OBJETIVO = 'objetivo'
+
+def _preparar(grafo, nodo_ini, nodo_fin, instrumentacion=None):
+    """
+    Normaliza el grafo para que cada algoritmo tenga una sola implementación
+    que funcione con el dict de leer_grafo o con un GrafoCompilado
+    
+    Un extremo que no está en el grafo es, como en el dict, un nodo sin
+    vecinos: la búsqueda termina con 'exito' False en lugar de KeyError
+    
+    Returns:
+        tuple: (vecinos, ini, fin, nombres) donde vecinos(nodo) itera pares
+        (vecino, peso), ini/fin son las claves internas de los nodos y nombres
+        traduce IDs enteros a nombres (None si el grafo ya usa nombres)
+    """
+    if isinstance(grafo, GrafoCompilado):
+        vecinos, nombres = grafo.vecinos, grafo.nombres
+        ini, fin = grafo.ids.get(nodo_ini), grafo.ids.get(nodo_fin)
+        if ini is None or fin is None:
+            # El destino primero: recibe el mismo ID nuevo que en el árbol de
+            # caminos mínimos hacia él (k_caminos_mas_cortos)
+            vecinos, claves, nombres = _con_ausentes(grafo, (nodo_fin, nodo_ini))
+            ini, fin = claves[nodo_ini], claves[nodo_fin]
+        nodo_ini, nodo_fin = ini, fin
+    else:
+        def vecinos(nodo):
+            return grafo.get(nodo, _SIN_VECINOS).items()
+        nombres = None
+    
+    # Con instrumentación, vecinos además cuenta los nodos generados
+    if instrumentacion is not None:
+        vecinos = instrumentacion.preparar(vecinos, nombres)
+    return vecinos, nodo_ini, nodo_fin, nombres
+
+def _con_ausentes(grafo, nodos):
+    """
+    Vecinos y nombres de un GrafoCompilado en el que los nodos que no existen
+    reciben IDs nuevos, sin vecinos, en el orden de 'nodos' (copia nombres:
+    sólo en consultas con nodos desconocidos)
+    
+    Returns:
+        tuple: (vecinos, claves {nombre: clave interna}, nombres)
+    """
+    nombres = list(grafo.nombres)
+    claves = {}
+    for nodo in nodos:
+        if nodo not in claves:
+            clave = grafo.ids.get(nodo)
+            if clave is None:
+                clave = len(nombres)
+                nombres.append(nodo)
+            claves[nodo] = clave
+    
+    n = len(grafo)
+    def vecinos(u):
+        return grafo.vecinos(u) if u < n else ()
+    return vecinos, claves, nombres
+
+def _preparar_heuristica(heuristica, nombres, nodo_fin, defecto=0):
+    """
+    Devuelve una función h(nodo) sobre las claves internas del grafo
+    La heurística puede ser un dict {nodo: valor} (generar_heuristica) o un
+    proveedor con para_objetivo(objetivo, nombres), como HeuristicaLandmarks
+    """
+    if hasattr(heuristica, 'para_objetivo'):
+        objetivo = nodo_fin if nombres is None else nombres[nodo_fin]
+        return heuristica.para_objetivo(objetivo, nombres)
+    if nombres is None:
+        return lambda nodo: heuristica.get(nodo, defecto)
+    return lambda nodo: heuristica.get(nombres[nodo], defecto)
+
+def _a_nombres(camino, nombres):
+    """Traduce un camino de IDs internos a nombres de nodos"""
+    if nombres is None:
+        return camino
+    return [nombres[nodo] for nodo in camino]
+
+def _nombre(nodo, nombres):
+    """Traduce la clave interna de un nodo a su nombre"""
+    return nodo if nombres is None else nombres[nodo]
+
+def ejecutar_pasos(pasos, al_evento=None):
+    """
+    Consume un generador pasos_* y retorna su resultado
+    
+    Args:
+        pasos: generador creado por una función pasos_*
+        al_evento: función opcional llamada con cada evento emitido
+    
+    Returns:
+        dict: el mismo resultado que la función busqueda_* equivalente
+    """
+    try:
+        while True:
+            evento = next(pasos)
+            if al_evento is not None:
+                al_evento(evento)
+    except StopIteration as fin:
+        return fin.value
+
+def _reconstruir_camino(padres, nodo_fin, nombres=None):
+    """Reconstruye el camino desde el inicio siguiendo los punteros a padre"""
+    camino = []
+    nodo = nodo_fin
+    while nodo is not None:
+        camino.append(nodo)
+        nodo = padres[nodo]
+    camino.reverse()
+    return _a_nombres(camino, nombres)
+
+def pasos_amplitud(grafo, nodo_ini, nodo_fin, instrumentacion=None, emitir=True):
+    """Búsqueda en amplitud paso a paso (generador de eventos, ver busqueda_amplitud)"""
     if nodo_ini == nodo_fin:
         return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0}
     
-    visitados = set()
-    cola = deque([(nodo_ini, [nodo_ini], 0)])
+    vecinos, nodo_ini, nodo_fin, nombres = _preparar(grafo, nodo_ini, nodo_fin, instrumentacion)
+    # padres también hace de conjunto de nodos descubiertos
+    padres = {nodo_ini: None}
+    cola = deque([(nodo_ini, 0)])
     nodos_expandidos = 0
+    if instrumentacion is not None:
+        instrumentacion.agregar()
     
     while cola:
-        nodo_actual, camino, costo_acumulado = cola.popleft()
-        
-        if nodo_actual in visitados:
-            continue
-        visitados.add(nodo_actual)
+        nodo_actual, costo_acumulado = cola.popleft()
         nodos_expandidos += 1
+        if instrumentacion is not None:
+            instrumentacion.expandir(nodo_actual, costo_acumulado, len(cola) + 1, len(padres))
+        if emitir:
+            yield (EVENTO_EXPANDIR, _nombre(nodo_actual, nombres), costo_acumulado)
         
         if nodo_actual == nodo_fin:
+            if emitir:
+                yield (EVENTO_OBJETIVO, _nombre(nodo_fin, nombres), costo_acumulado)
+            camino = _reconstruir_camino(padres, nodo_fin, nombres)
             return {'exito': True, 'camino': camino, 'costo': costo_acumulado, 'nodos_expandidos': nodos_expandidos}
         
-        if nodo_actual in grafo:
-            for vecino, peso in grafo[nodo_actual].items():
-                if vecino not in visitados:
-                    nuevo_camino = camino + [vecino]
-                    nuevo_costo = costo_acumulado + peso
-                    cola.append((vecino, nuevo_camino, nuevo_costo))
+        for vecino, peso in vecinos(nodo_actual):
+            if vecino not in padres:
+                padres[vecino] = nodo_actual
+                cola.append((vecino, costo_acumulado + peso))
+                if instrumentacion is not None:
+                    instrumentacion.agregar()
+                if emitir:
+                    yield (EVENTO_GENERAR, _nombre(vecino, nombres), costo_acumulado + peso,
+                           _nombre(nodo_actual, nombres))
     
     return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos}
 
-def busqueda_costo_uniforme(grafo, nodo_ini, nodo_fin):
-    """Búsqueda de costo uniforme (Dijkstra) - Optimizada con heapq"""
+@instrumentable
+def busqueda_amplitud(grafo, nodo_ini, nodo_fin, instrumentacion=None):
+    """Búsqueda en amplitud (BFS) - Optimizada"""
+    return ejecutar_pasos(pasos_amplitud(grafo, nodo_ini, nodo_fin, instrumentacion, emitir=False))
+
+def pasos_costo_uniforme(grafo, nodo_ini, nodo_fin, instrumentacion=None, emitir=True):
+    """Búsqueda de costo uniforme paso a paso (generador de eventos, ver busqueda_costo_uniforme)"""
     if nodo_ini == nodo_fin:
         return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0}
     
-    visitados = set()
-    # heap: (costo, contador, nodo, camino)
-    contador = 0
-    heap = [(0, contador, nodo_ini, [nodo_ini])]
+    vecinos, nodo_ini, nodo_fin, nombres = _preparar(grafo, nodo_ini, nodo_fin, instrumentacion)
+    # Con pesos enteros pequeños (detectados al compilar) la frontera es de cubetas
+    frontera = frontera_costo_uniforme(grafo)
+    agregar = frontera.agregar
+    cerrados = frontera.cerrados
+    agregar(nodo_ini, 0, 0, None)
     nodos_expandidos = 0
+    if instrumentacion is not None:
+        instrumentacion.observar_frontera(frontera)
     
-    while heap:
-        costo_actual, _, nodo_actual, camino = heapq.heappop(heap)
-        
-        if nodo_actual in visitados:
-            continue
-        
-        visitados.add(nodo_actual)
+    while frontera:
+        nodo_actual, costo_actual = frontera.extraer()
         nodos_expandidos += 1
+        if instrumentacion is not None:
+            instrumentacion.expandir(nodo_actual, costo_actual, len(frontera) + 1, len(cerrados))
+        if emitir:
+            yield (EVENTO_EXPANDIR, _nombre(nodo_actual, nombres), costo_actual)
         
         if nodo_actual == nodo_fin:
-            return {'exito': True, 'camino': camino, 'costo': costo_actual, 'nodos_expandidos': nodos_expandidos}
+            if emitir:
+                yield (EVENTO_OBJETIVO, _nombre(nodo_fin, nombres), costo_actual)
+            camino = _reconstruir_camino(frontera.padres, nodo_fin, nombres)
+            return {'exito': True, 'camino': camino, 'costo': costo_actual, 'nodos_expandidos': nodos_expandidos,
+                    'frontera': frontera.estadisticas()}
         
-        if nodo_actual in grafo:
-            for vecino, peso in grafo[nodo_actual].items():
-                if vecino not in visitados:
-                    nuevo_costo = costo_actual + peso
-                    nuevo_camino = camino + [vecino]
-                    contador += 1
-                    heapq.heappush(heap, (nuevo_costo, contador, vecino, nuevo_camino))
+        for vecino, peso in vecinos(nodo_actual):
+            if vecino not in cerrados:
+                nuevo_costo = costo_actual + peso
+                if agregar(vecino, nuevo_costo, nuevo_costo, nodo_actual) and emitir:
+                    yield (EVENTO_GENERAR, _nombre(vecino, nombres), nuevo_costo, _nombre(nodo_actual, nombres))
+    
+    return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos,
+            'frontera': frontera.estadisticas()}
+
+@instrumentable
+def busqueda_costo_uniforme(grafo, nodo_ini, nodo_fin, instrumentacion=None):
+    """
+    Búsqueda de costo uniforme (Dijkstra) - Frontera con mejor g por nodo
+    Sobre un GrafoCompilado con pesos enteros pequeños usa la cola de cubetas
+    de Dial (FronteraCubetas) en lugar del heap, con el mismo resultado
+    """
+    return ejecutar_pasos(pasos_costo_uniforme(grafo, nodo_ini, nodo_fin, instrumentacion, emitir=False))
+
+def _expandir_nivel(vecinos, frontera, padres, costos, saltos, saltos_otro, instrumentacion=None,
+                    emitir=False, nombres=None):
+    """
+    Expande un nivel completo de una de las dos búsquedas en amplitud (generador)
+    
+    Returns:
+        tuple: (siguiente_frontera, encuentro) donde encuentro es el mejor
+        (saltos_totales, nodo, vecino, peso) que cruza hacia la otra búsqueda
+    """
+    siguiente = []
+    encuentro = None
+    
+    for nodo_actual in frontera:
+        if instrumentacion is not None:
+            instrumentacion.expandir(nodo_actual, costos[nodo_actual], len(frontera) + len(siguiente),
+                                     len(padres) + len(saltos_otro))
+        if emitir:
+            yield (EVENTO_EXPANDIR, _nombre(nodo_actual, nombres), costos[nodo_actual])
+        for vecino, peso in vecinos(nodo_actual):
+            if vecino in saltos_otro:
+                total = saltos[nodo_actual] + 1 + saltos_otro[vecino]
+                if encuentro is None or total < encuentro[0]:
+                    encuentro = (total, nodo_actual, vecino, peso)
+            if vecino not in padres:
+                padres[vecino] = nodo_actual
+                costos[vecino] = costos[nodo_actual] + peso
+                saltos[vecino] = saltos[nodo_actual] + 1
+                siguiente.append(vecino)
+                if instrumentacion is not None:
+                    instrumentacion.agregar()
+                if emitir:
+                    yield (EVENTO_GENERAR, _nombre(vecino, nombres), costos[vecino], _nombre(nodo_actual, nombres))
+    
+    return siguiente, encuentro
+
+def _unir_caminos(padres_ini, padres_fin, nodo_ini_lado, nodo_fin_lado, nombres):
+    """Une el camino inicio→nodo_ini_lado con el camino nodo_fin_lado→objetivo"""
+    camino = _reconstruir_camino(padres_ini, nodo_ini_lado)
+    camino.extend(reversed(_reconstruir_camino(padres_fin, nodo_fin_lado)))
+    return _a_nombres(camino, nombres)
+
+def pasos_amplitud_bidireccional(grafo, nodo_ini, nodo_fin, instrumentacion=None, emitir=True):
+    """
+    Búsqueda en amplitud bidireccional paso a paso (generador de eventos)
+    Los eventos del lado del objetivo llevan g medido desde el objetivo
+    """
+    if nodo_ini == nodo_fin:
+        return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0}
+    
+    vecinos, nodo_ini, nodo_fin, nombres = _preparar(grafo, nodo_ini, nodo_fin, instrumentacion)
+    padres_ini, padres_fin = {nodo_ini: None}, {nodo_fin: None}
+    costos_ini, costos_fin = {nodo_ini: 0}, {nodo_fin: 0}
+    saltos_ini, saltos_fin = {nodo_ini: 0}, {nodo_fin: 0}
+    frontera_ini, frontera_fin = [nodo_ini], [nodo_fin]
+    nodos_expandidos = 0
+    if instrumentacion is not None:
+        instrumentacion.agregar(2)
+    
+    while frontera_ini and frontera_fin:
+        # Se expande siempre el lado con la frontera más pequeña
+        if len(frontera_ini) <= len(frontera_fin):
+            nodos_expandidos += len(frontera_ini)
+            frontera_ini, encuentro = yield from _expandir_nivel(vecinos, frontera_ini, padres_ini, costos_ini,
+                                                                 saltos_ini, saltos_fin, instrumentacion,
+                                                                 emitir, nombres)
+            if encuentro:
+                _, nodo_a, nodo_b, peso = encuentro
+        else:
+            nodos_expandidos += len(frontera_fin)
+            frontera_fin, encuentro = yield from _expandir_nivel(vecinos, frontera_fin, padres_fin, costos_fin,
+                                                                 saltos_fin, saltos_ini, instrumentacion,
+                                                                 emitir, nombres)
+            if encuentro:
+                _, nodo_b, nodo_a, peso = encuentro
+        
+        # Al terminar el nivel, el mejor cruce encontrado tiene el mínimo de saltos
+        if encuentro:
+            camino = _unir_caminos(padres_ini, padres_fin, nodo_a, nodo_b, nombres)
+            costo = costos_ini[nodo_a] + peso + costos_fin[nodo_b]
+            if emitir:
+                yield (EVENTO_OBJETIVO, _nombre(nodo_fin, nombres), costo)
+            return {'exito': True, 'camino': camino, 'costo': costo, 'nodos_expandidos': nodos_expandidos}
     
     return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos}
 
-def busqueda_profundidad(grafo, nodo_ini, nodo_fin, max_profundidad=50):
-    """Búsqueda en profundidad (DFS) - Con límite de seguridad"""
+@instrumentable
+def busqueda_amplitud_bidireccional(grafo, nodo_ini, nodo_fin, instrumentacion=None):
+    """Búsqueda en amplitud bidireccional - Asume grafo no dirigido (leer_grafo)"""
+    return ejecutar_pasos(pasos_amplitud_bidireccional(grafo, nodo_ini, nodo_fin, instrumentacion, emitir=False))
+
+def pasos_costo_uniforme_bidireccional(grafo, nodo_ini, nodo_fin, instrumentacion=None, emitir=True):
+    """
+    Búsqueda de costo uniforme bidireccional paso a paso (generador de eventos)
+    Los eventos del lado del objetivo llevan g medido desde el objetivo
+    """
     if nodo_ini == nodo_fin:
         return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0}
     
-    visitados = set()
-    pila = [(nodo_ini, [nodo_ini], 0, 0)] 
+    vecinos, nodo_ini, nodo_fin, nombres = _preparar(grafo, nodo_ini, nodo_fin, instrumentacion)
+    # Índice 0: búsqueda desde el inicio, índice 1: búsqueda desde el objetivo
+    distancias = ({nodo_ini: 0}, {nodo_fin: 0})
+    padres = ({nodo_ini: None}, {nodo_fin: None})
+    cerrados = (set(), set())
+    # heaps: (costo, contador, nodo)
+    heaps = ([(0, 0, nodo_ini)], [(0, 1, nodo_fin)])
+    contador = 1
+    mejor_costo = float('inf')
+    encuentro = None  # (lado, nodo, vecino, peso)
     nodos_expandidos = 0
+    if instrumentacion is not None:
+        instrumentacion.agregar(2)
     
-    while pila:
-        nodo_actual, camino, costo_acumulado, profundidad = pila.pop()
+    while heaps[0] and heaps[1]:
+        # Ningún camino por descubrir puede costar menos que la suma de los mínimos
+        if heaps[0][0][0] + heaps[1][0][0] >= mejor_costo:
+            break
         
-        if profundidad > max_profundidad:
-            continue
+        lado = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        costo_actual, _, nodo_actual = heapq.heappop(heaps[lado])
         
-        if nodo_actual in visitados:
+        if nodo_actual in cerrados[lado]:
+            if instrumentacion is not None:
+                instrumentacion.descartar()
             continue
-        visitados.add(nodo_actual)
-        nodos_expandidos += 1
         
-        if nodo_actual == nodo_fin:
-            return {'exito': True, 'camino': camino, 'costo': costo_acumulado, 'nodos_expandidos': nodos_expandidos}
+        cerrados[lado].add(nodo_actual)
+        nodos_expandidos += 1
+        if instrumentacion is not None:
+            instrumentacion.expandir(nodo_actual, costo_actual, len(heaps[0]) + len(heaps[1]) + 1,
+                                     len(cerrados[0]) + len(cerrados[1]))
+        if emitir:
+            yield (EVENTO_EXPANDIR, _nombre(nodo_actual, nombres), costo_actual)
+        distancias_lado = distancias[lado]
+        distancias_otro = distancias[1 - lado]
         
-        if nodo_actual in grafo:
-            for vecino, peso in grafo[nodo_actual].items():
-                if vecino not in visitados:
-                    nuevo_camino = camino + [vecino]
-                    nuevo_costo = costo_acumulado + peso
-                    pila.append((vecino, nuevo_camino, nuevo_costo, profundidad + 1))
+        for vecino, peso in vecinos(nodo_actual):
+            nuevo_costo = costo_actual + peso
+            if vecino not in cerrados[lado] and nuevo_costo < distancias_lado.get(vecino, float('inf')):
+                distancias_lado[vecino] = nuevo_costo
+                padres[lado][vecino] = nodo_actual
+                contador += 1
+                heapq.heappush(heaps[lado], (nuevo_costo, contador, vecino))
+                if instrumentacion is not None:
+                    instrumentacion.agregar()
+                if emitir:
+                    yield (EVENTO_GENERAR, _nombre(vecino, nombres), nuevo_costo, _nombre(nodo_actual, nombres))
+            
+            if vecino in distancias_otro and nuevo_costo + distancias_otro[vecino] < mejor_costo:
+                mejor_costo = nuevo_costo + distancias_otro[vecino]
+                encuentro = (lado, nodo_actual, vecino, peso)
     
-    return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos}
+    if encuentro is None:
+        return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos}
+    
+    lado, nodo_actual, vecino, peso = encuentro
+    if lado == 0:
+        nodo_a, nodo_b = nodo_actual, vecino
+    else:
+        nodo_a, nodo_b = vecino, nodo_actual
+    camino = _unir_caminos(padres[0], padres[1], nodo_a, nodo_b, nombres)
+    # La distancia del lado opuesto pudo mejorar después del encuentro; se recalcula
+    costo = distancias[0][nodo_a] + peso + distancias[1][nodo_b]
+    if emitir:
+        yield (EVENTO_OBJETIVO, _nombre(nodo_fin, nombres), costo)
+    return {'exito': True, 'camino': camino, 'costo': costo, 'nodos_expandidos': nodos_expandidos}
 
-def busqueda_profundidad_limitada(grafo, nodo_ini, nodo_fin, limite):
-    """Búsqueda en profundidad con límite - Corregida"""
+@instrumentable
+def busqueda_costo_uniforme_bidireccional(grafo, nodo_ini, nodo_fin, instrumentacion=None):
+    """Búsqueda de costo uniforme bidireccional (Dijkstra) - Asume grafo no dirigido (leer_grafo)"""
+    return ejecutar_pasos(pasos_costo_uniforme_bidireccional(grafo, nodo_ini, nodo_fin, instrumentacion,
+                                                             emitir=False))
+
+def pasos_profundidad(grafo, nodo_ini, nodo_fin, max_profundidad=50, instrumentacion=None, emitir=True):
+    """Búsqueda en profundidad paso a paso (generador de eventos, ver busqueda_profundidad)"""
+    return (yield from pasos_profundidad_limitada(grafo, nodo_ini, nodo_fin, max_profundidad,
+                                                  instrumentacion, emitir))
+
+@instrumentable
+def busqueda_profundidad(grafo, nodo_ini, nodo_fin, max_profundidad=50, instrumentacion=None):
+    """Búsqueda en profundidad (DFS) - Con límite de seguridad"""
+    return ejecutar_pasos(pasos_profundidad(grafo, nodo_ini, nodo_fin, max_profundidad, instrumentacion,
+                                            emitir=False))
+
+def pasos_profundidad_limitada(grafo, nodo_ini, nodo_fin, limite, instrumentacion=None, emitir=True):
+    """Búsqueda en profundidad con límite paso a paso (generador de eventos)"""
     if nodo_ini == nodo_fin:
         return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0}
     
-    visitados = set()
-    pila = [(nodo_ini, [nodo_ini], 0, 0)]
+    vecinos, nodo_ini, nodo_fin, nombres = _preparar(grafo, nodo_ini, nodo_fin, instrumentacion)
+    # padres también hace de conjunto de visitados
+    padres = {}
+    # pila: (nodo, padre, costo, profundidad)
+    pila = [(nodo_ini, None, 0, 0)]
     nodos_expandidos = 0
+    if instrumentacion is not None:
+        instrumentacion.agregar()
     
     while pila:
-        nodo_actual, camino, costo_acumulado, profundidad = pila.pop()
+        nodo_actual, padre, costo_acumulado, profundidad = pila.pop()
         
-        if profundidad > limite:
+        if profundidad > limite or nodo_actual in padres:
+            if instrumentacion is not None:
+                instrumentacion.descartar()
             continue
         
-        if nodo_actual in visitados:
-            continue
-        visitados.add(nodo_actual)
+        padres[nodo_actual] = padre
         nodos_expandidos += 1
+        if instrumentacion is not None:
+            instrumentacion.expandir(nodo_actual, costo_acumulado, len(pila) + 1, len(padres))
+        if emitir:
+            yield (EVENTO_EXPANDIR, _nombre(nodo_actual, nombres), costo_acumulado)
         
         if nodo_actual == nodo_fin:
+            if emitir:
+                yield (EVENTO_OBJETIVO, _nombre(nodo_fin, nombres), costo_acumulado)
+            camino = _reconstruir_camino(padres, nodo_fin, nombres)
             return {'exito': True, 'camino': camino, 'costo': costo_acumulado, 'nodos_expandidos': nodos_expandidos}
         
-        if nodo_actual in grafo:
-            for vecino, peso in grafo[nodo_actual].items():
-                if vecino not in visitados:
-                    nuevo_camino = camino + [vecino]
-                    nuevo_costo = costo_acumulado + peso
-                    pila.append((vecino, nuevo_camino, nuevo_costo, profundidad + 1))
+        for vecino, peso in vecinos(nodo_actual):
+            if vecino not in padres:
+                pila.append((vecino, nodo_actual, costo_acumulado + peso, profundidad + 1))
+                if instrumentacion is not None:
+                    instrumentacion.agregar()
+                if emitir:
+                    yield (EVENTO_GENERAR, _nombre(vecino, nombres), costo_acumulado + peso,
+                           _nombre(nodo_actual, nombres))
     
     return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos}
 
-def busqueda_profundidad_iterativa(grafo, nodo_ini, nodo_fin, max_profundidad=10):
-    """Búsqueda en profundidad iterativa - CORREGIDA"""
+@instrumentable
+def busqueda_profundidad_limitada(grafo, nodo_ini, nodo_fin, limite, instrumentacion=None):
+    """Búsqueda en profundidad con límite - Corregida"""
+    return ejecutar_pasos(pasos_profundidad_limitada(grafo, nodo_ini, nodo_fin, limite, instrumentacion,
+                                                     emitir=False))
+
+def _dfs_con_umbral(vecinos, nodo_ini, nodo_fin, umbral, evaluar, instrumentacion=None, emitir=False,
+                    nombres=None):
+    """
+    DFS acotado con verificación de ciclos sólo sobre la rama actual (generador)
+    La memoria es O(profundidad): la rama, su conjunto y un iterador por nivel
+    
+    Args:
+        evaluar: función (profundidad, g, nodo) -> valor comparado con umbral
+    
+    Returns:
+        tuple: (camino, costo, siguiente_umbral, nodos_expandidos); camino es
+        None si no se encontró el objetivo, y siguiente_umbral es el menor valor
+        que superó el umbral (infinito si nada se podó)
+    """
+    rama = [nodo_ini]
+    en_rama = {nodo_ini}
+    costos = [0]
+    iteradores = [iter(vecinos(nodo_ini))]
+    siguiente_umbral = float('inf')
+    nodos_expandidos = 1
+    if instrumentacion is not None:
+        instrumentacion.agregar()
+        instrumentacion.expandir(nodo_ini, 0, 1, 1)
+    if emitir:
+        yield (EVENTO_EXPANDIR, _nombre(nodo_ini, nombres), 0)
+    
+    while iteradores:
+        for vecino, peso in iteradores[-1]:
+            if vecino in en_rama:
+                continue
+            
+            g = costos[-1] + peso
+            valor = evaluar(len(rama), g, vecino)
+            if valor > umbral:
+                if valor < siguiente_umbral:
+                    siguiente_umbral = valor
+                continue
+            
+            if vecino == nodo_fin:
+                if emitir:
+                    yield (EVENTO_GENERAR, _nombre(vecino, nombres), g, _nombre(rama[-1], nombres))
+                    yield (EVENTO_OBJETIVO, _nombre(vecino, nombres), g)
+                rama.append(vecino)
+                return rama, g, siguiente_umbral, nodos_expandidos
+            
+            # Descender: el siguiente ciclo del while continúa desde este hijo
+            rama.append(vecino)
+            en_rama.add(vecino)
+            costos.append(g)
+            iteradores.append(iter(vecinos(vecino)))
+            nodos_expandidos += 1
+            if instrumentacion is not None:
+                instrumentacion.agregar()
+                instrumentacion.expandir(vecino, g, len(rama), len(en_rama))
+            if emitir:
+                yield (EVENTO_GENERAR, _nombre(vecino, nombres), g, _nombre(rama[-2], nombres))
+                yield (EVENTO_EXPANDIR, _nombre(vecino, nombres), g)
+            break
+        else:
+            # Sin más hijos: retroceder
+            iteradores.pop()
+            en_rama.discard(rama.pop())
+            costos.pop()
+    
+    return None, 0, siguiente_umbral, nodos_expandidos
+
+def _profundizacion_iterativa(vecinos, nodo_ini, nodo_fin, nombres, umbral, evaluar, max_iteraciones,
+                              instrumentacion=None, emitir=False):
+    """
+    Repite el DFS acotado subiendo el umbral al siguiente valor podado (generador)
+    Cada iteración queda registrada en 'iteraciones' con sus nodos expandidos
+    y su tiempo, para medir cuánto cuesta re-expandir los niveles anteriores
+    
+    Si se agotan las max_iteraciones quedando nodos podados, el resultado
+    lleva 'motivo' = MOTIVO_ITERACIONES: no haber encontrado camino no
+    significa que no exista
+    """
+    iteraciones = []
     nodos_expandidos_total = 0
     
-    for limite in range(max_profundidad + 1):
-        resultado = busqueda_profundidad_limitada(grafo, nodo_ini, nodo_fin, limite)
-        nodos_expandidos_total += resultado['nodos_expandidos']
+    for _ in range(max_iteraciones):
+        tiempo_inicio = time.perf_counter()
+        camino, costo, siguiente_umbral, nodos_expandidos = yield from _dfs_con_umbral(
+            vecinos, nodo_ini, nodo_fin, umbral, evaluar, instrumentacion, emitir, nombres)
+        iteraciones.append({'umbral': umbral, 'nodos_expandidos': nodos_expandidos,
+                            'tiempo': time.perf_counter() - tiempo_inicio})
+        nodos_expandidos_total += nodos_expandidos
         
-        if resultado['exito']:
-            resultado['nodos_expandidos'] = nodos_expandidos_total
-            return resultado
+        if camino is not None:
+            return {'exito': True, 'camino': _a_nombres(camino, nombres), 'costo': costo,
+                    'nodos_expandidos': nodos_expandidos_total, 'iteraciones': iteraciones}
+        
+        # Nada quedó podado: subir el umbral no alcanzaría más nodos
+        if siguiente_umbral == float('inf'):
+            break
+        umbral = siguiente_umbral
+    else:
+        return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos_total,
+                'iteraciones': iteraciones, 'motivo': MOTIVO_ITERACIONES}
     
-    return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos_total}
+    return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos_total,
+            'iteraciones': iteraciones}
 
-def busqueda_codiciosa(grafo, nodo_ini, nodo_fin, heuristica):
-    """Búsqueda codiciosa (Greedy) - Optimizada con heapq"""
+def pasos_profundidad_iterativa(grafo, nodo_ini, nodo_fin, max_profundidad=10, instrumentacion=None, emitir=True):
+    """Búsqueda en profundidad iterativa paso a paso (generador de eventos)"""
     if nodo_ini == nodo_fin:
         return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0}
     
-    visitados = set()
-    # heap: (h, contador, nodo, camino, costo)
+    vecinos, nodo_ini, nodo_fin, nombres = _preparar(grafo, nodo_ini, nodo_fin, instrumentacion)
+    return (yield from _profundizacion_iterativa(vecinos, nodo_ini, nodo_fin, nombres, 1,
+                                                 lambda profundidad, g, nodo: profundidad, max_profundidad,
+                                                 instrumentacion, emitir))
+
+@instrumentable
+def busqueda_profundidad_iterativa(grafo, nodo_ini, nodo_fin, max_profundidad=10, instrumentacion=None):
+    """Búsqueda en profundidad iterativa - Ciclos verificados sólo en la rama actual"""
+    return ejecutar_pasos(pasos_profundidad_iterativa(grafo, nodo_ini, nodo_fin, max_profundidad, instrumentacion,
+                                                      emitir=False))
+
+def pasos_codiciosa(grafo, nodo_ini, nodo_fin, heuristica, instrumentacion=None, emitir=True):
+    """Búsqueda codiciosa paso a paso (generador de eventos, ver busqueda_codiciosa)"""
+    if nodo_ini == nodo_fin:
+        return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0}
+    
+    vecinos, nodo_ini, nodo_fin, nombres = _preparar(grafo, nodo_ini, nodo_fin, instrumentacion)
+    h = _preparar_heuristica(heuristica, nombres, nodo_fin)
+    padres = {}
+    # heap: (h, contador, nodo, padre, costo)
     contador = 0
-    heap = [(heuristica[nodo_ini], contador, nodo_ini, [nodo_ini], 0)]
+    heap = [(h(nodo_ini), contador, nodo_ini, None, 0)]
     nodos_expandidos = 0
+    if instrumentacion is not None:
+        instrumentacion.agregar()
     
     while heap:
-        _, _, nodo_actual, camino, costo_acumulado = heapq.heappop(heap)
+        _, _, nodo_actual, padre, costo_acumulado = heapq.heappop(heap)
         
-        if nodo_actual in visitados:
+        if nodo_actual in padres:
+            if instrumentacion is not None:
+                instrumentacion.descartar()
             continue
         
-        visitados.add(nodo_actual)
+        padres[nodo_actual] = padre
         nodos_expandidos += 1
+        if instrumentacion is not None:
+            instrumentacion.expandir(nodo_actual, costo_acumulado, len(heap) + 1, len(padres))
+        if emitir:
+            yield (EVENTO_EXPANDIR, _nombre(nodo_actual, nombres), costo_acumulado)
         
         if nodo_actual == nodo_fin:
+            if emitir:
+                yield (EVENTO_OBJETIVO, _nombre(nodo_fin, nombres), costo_acumulado)
+            camino = _reconstruir_camino(padres, nodo_fin, nombres)
             return {'exito': True, 'camino': camino, 'costo': costo_acumulado, 'nodos_expandidos': nodos_expandidos}
         
-        if nodo_actual in grafo:
-            for vecino, peso in grafo[nodo_actual].items():
-                if vecino not in visitados:
-                    nuevo_camino = camino + [vecino]
-                    nuevo_costo = costo_acumulado + peso
-                    contador += 1
-                    heapq.heappush(heap, (heuristica[vecino], contador, vecino, nuevo_camino, nuevo_costo))
+        for vecino, peso in vecinos(nodo_actual):
+            if vecino not in padres:
+                contador += 1
+                heapq.heappush(heap, (h(vecino), contador, vecino, nodo_actual, costo_acumulado + peso))
+                if instrumentacion is not None:
+                    instrumentacion.agregar()
+                if emitir:
+                    yield (EVENTO_GENERAR, _nombre(vecino, nombres), costo_acumulado + peso,
+                           _nombre(nodo_actual, nombres))
     
     return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos}
 
-def busqueda_a_estrella(grafo, nodo_ini, nodo_fin, heuristica):
+@instrumentable
+def busqueda_codiciosa(grafo, nodo_ini, nodo_fin, heuristica, instrumentacion=None):
+    """Búsqueda codiciosa (Greedy) - Optimizada con heapq"""
+    return ejecutar_pasos(pasos_codiciosa(grafo, nodo_ini, nodo_fin, heuristica, instrumentacion, emitir=False))
+
+def pasos_a_estrella(grafo, nodo_ini, nodo_fin, heuristica, instrumentacion=None, emitir=True):
+    """Búsqueda A* paso a paso (generador de eventos, ver busqueda_a_estrella)"""
+    return (yield from pasos_a_estrella_ponderado(grafo, nodo_ini, nodo_fin, heuristica, 1, instrumentacion, emitir))
+
+@instrumentable
+def busqueda_a_estrella(grafo, nodo_ini, nodo_fin, heuristica, instrumentacion=None):
     """Búsqueda A* - OPTIMIZADA con heapq"""
+    return ejecutar_pasos(pasos_a_estrella(grafo, nodo_ini, nodo_fin, heuristica, instrumentacion, emitir=False))
+
+def pasos_a_estrella_ponderado(grafo, nodo_ini, nodo_fin, heuristica, W=1.3, instrumentacion=None, emitir=True):
+    """Búsqueda A* ponderado paso a paso (generador de eventos, ver busqueda_a_estrella_ponderado)"""
     if nodo_ini == nodo_fin:
         return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0}
     
-    visitados = set()
-    # heap: (f, contador, nodo, camino, g)
-    contador = 0
-    h_ini = heuristica.get(nodo_ini, 0)
-    heap = [(h_ini, contador, nodo_ini, [nodo_ini], 0)]
+    vecinos, nodo_ini, nodo_fin, nombres = _preparar(grafo, nodo_ini, nodo_fin, instrumentacion)
+    h = _preparar_heuristica(heuristica, nombres, nodo_fin)
+    frontera = FronteraPrioridad()
+    agregar = frontera.agregar
+    cerrados = frontera.cerrados
+    mejor_g = frontera.mejor_g
+    agregar(nodo_ini, 0, W * h(nodo_ini), None)
     nodos_expandidos = 0
+    if instrumentacion is not None:
+        instrumentacion.observar_frontera(frontera)
     
-    while heap:
-        f_actual, _, nodo_actual, camino, g_actual = heapq.heappop(heap)
-        
-        if nodo_actual in visitados:
-            continue
-        
-        visitados.add(nodo_actual)
+    while frontera:
+        nodo_actual, g_actual = frontera.extraer()
         nodos_expandidos += 1
+        if instrumentacion is not None:
+            instrumentacion.expandir(nodo_actual, g_actual, len(frontera) + 1, len(cerrados))
+        if emitir:
+            yield (EVENTO_EXPANDIR, _nombre(nodo_actual, nombres), g_actual)
         
         if nodo_actual == nodo_fin:
-            return {'exito': True, 'camino': camino, 'costo': g_actual, 'nodos_expandidos': nodos_expandidos}
-        
-        if nodo_actual in grafo:
-            for vecino, peso in grafo[nodo_actual].items():
-                if vecino not in visitados:
-                    nuevo_g = g_actual + peso
-                    h_vecino = heuristica.get(vecino, 0)
-                    nuevo_f = nuevo_g + h_vecino
-                    nuevo_camino = camino + [vecino]
-                    contador += 1
-                    heapq.heappush(heap, (nuevo_f, contador, vecino, nuevo_camino, nuevo_g))
+            if emitir:
+                yield (EVENTO_OBJETIVO, _nombre(nodo_fin, nombres), g_actual)
+            camino = _reconstruir_camino(frontera.padres, nodo_fin, nombres)
+            return {'exito': True, 'camino': camino, 'costo': g_actual, 'nodos_expandidos': nodos_expandidos,
+                    'frontera': frontera.estadisticas()}
+        
+        for vecino, peso in vecinos(nodo_actual):
+            nuevo_g = g_actual + peso
+            # Sólo se calcula h para caminos que mejoran el g conocido del vecino
+            if vecino not in cerrados and nuevo_g < mejor_g.get(vecino, float('inf')):
+                agregar(vecino, nuevo_g, nuevo_g + W * h(vecino), nodo_actual)
+                if emitir:
+                    yield (EVENTO_GENERAR, _nombre(vecino, nombres), nuevo_g, _nombre(nodo_actual, nombres))
     
-    return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos}
+    return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos,
+            'frontera': frontera.estadisticas()}
+
+@instrumentable
+def busqueda_a_estrella_ponderado(grafo, nodo_ini, nodo_fin, heuristica, W=1.3, instrumentacion=None):
+    """Búsqueda A* ponderado - Frontera con mejor g por nodo"""
+    return ejecutar_pasos(pasos_a_estrella_ponderado(grafo, nodo_ini, nodo_fin, heuristica, W, instrumentacion,
+                                                     emitir=False))
 
-def busqueda_a_estrella_ponderado(grafo, nodo_ini, nodo_fin, heuristica, W=1.3):
-    """Búsqueda A* ponderado - Optimizada"""
+def pasos_ara_estrella(grafo, nodo_ini, nodo_fin, heuristica, W_inicial=3.0, decremento=0.5,
+                       tiempo_max=None, al_mejorar=None, instrumentacion=None, emitir=True):
+    """Búsqueda ARA* paso a paso (generador de eventos, ver busqueda_ara_estrella)"""
+    if W_inicial < 1:
+        raise ValueError("W_inicial debe ser >= 1")
+    if decremento <= 0:
+        raise ValueError("decremento debe ser mayor que 0")
     if nodo_ini == nodo_fin:
-        return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0}
+        return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0,
+                'cota_suboptimalidad': 1.0, 'soluciones': []}
+    
+    vecinos, nodo_ini, nodo_fin, nombres = _preparar(grafo, nodo_ini, nodo_fin, instrumentacion)
+    h = _preparar_heuristica(heuristica, nombres, nodo_fin)
+    tiempo_inicio = time.perf_counter()
+    limite = None if tiempo_max is None else tiempo_inicio + tiempo_max
+    infinito = float('inf')
     
-    visitados = set()
+    g = {nodo_ini: 0}
+    padres = {nodo_ini: None}
+    W = W_inicial
+    # ABIERTA: heap (g + W·h, contador, nodo, g) con entradas obsoletas descartadas al extraer
+    abiertos = {nodo_ini}
+    heap = [(W * h(nodo_ini), 0, nodo_ini, 0)]
     contador = 0
-    h_ini = heuristica.get(nodo_ini, 0)
-    heap = [(W * h_ini, contador, nodo_ini, [nodo_ini], 0)]
+    cerrados = set()
+    inconsistentes = set()
     nodos_expandidos = 0
+    soluciones = []
+    agotado = False
+    if instrumentacion is not None:
+        instrumentacion.agregar()
     
-    while heap:
-        _, _, nodo_actual, camino, g_actual = heapq.heappop(heap)
+    def tope_abierto():
+        """f mínima válida de ABIERTA (descarta entradas obsoletas del tope)"""
+        while heap and (heap[0][2] not in abiertos or heap[0][3] != g[heap[0][2]]):
+            heapq.heappop(heap)
+            if instrumentacion is not None:
+                instrumentacion.descartar()
+        return heap[0][0] if heap else infinito
+    
+    while True:
+        # Mejorar el camino con el W actual
+        while tope_abierto() < g.get(nodo_fin, infinito):
+            if limite is not None and nodos_expandidos % 64 == 0 and time.perf_counter() > limite:
+                agotado = True
+                break
+            
+            _, _, nodo_actual, g_actual = heapq.heappop(heap)
+            abiertos.discard(nodo_actual)
+            cerrados.add(nodo_actual)
+            nodos_expandidos += 1
+            if instrumentacion is not None:
+                instrumentacion.expandir(nodo_actual, g_actual, len(heap) + 1, len(cerrados))
+            if emitir:
+                yield (EVENTO_EXPANDIR, _nombre(nodo_actual, nombres), g_actual)
+            
+            for vecino, peso in vecinos(nodo_actual):
+                nuevo_g = g_actual + peso
+                if nuevo_g < g.get(vecino, infinito):
+                    g[vecino] = nuevo_g
+                    padres[vecino] = nodo_actual
+                    if vecino in cerrados:
+                        inconsistentes.add(vecino)
+                    else:
+                        abiertos.add(vecino)
+                        contador += 1
+                        heapq.heappush(heap, (nuevo_g + W * h(vecino), contador, vecino, nuevo_g))
+                        if instrumentacion is not None:
+                            instrumentacion.agregar()
+                        if emitir:
+                            yield (EVENTO_GENERAR, _nombre(vecino, nombres), nuevo_g, _nombre(nodo_actual, nombres))
         
-        if nodo_actual in visitados:
-            continue
+        costo = g.get(nodo_fin, infinito)
+        if costo < infinito and (not soluciones or costo < soluciones[-1]['costo']):
+            # Cota: costo / mín(g + h) sobre ABIERTA e INCONSISTENTES, nunca mayor que W
+            minimo = min((g[s] + h(s) for s in abiertos | inconsistentes), default=costo)
+            cota = min(W, costo / minimo) if minimo > 0 else W
+            solucion = {'camino': _reconstruir_camino(padres, nodo_fin, nombres), 'costo': costo, 'W': W,
+                        'cota_suboptimalidad': max(1.0, cota), 'nodos_expandidos': nodos_expandidos,
+                        'tiempo': time.perf_counter() - tiempo_inicio}
+            soluciones.append(solucion)
+            if instrumentacion is not None:
+                instrumentacion.registrar_solucion(solucion['camino'], costo)
+            if emitir:
+                yield (EVENTO_OBJETIVO, _nombre(nodo_fin, nombres), costo)
+            if al_mejorar is not None:
+                al_mejorar(solucion)
         
-        visitados.add(nodo_actual)
-        nodos_expandidos += 1
+        if agotado or W <= 1.0 or (not abiertos and not inconsistentes):
+            break
         
-        if nodo_actual == nodo_fin:
-            return {'exito': True, 'camino': camino, 'costo': g_actual, 'nodos_expandidos': nodos_expandidos}
-        
-        if nodo_actual in grafo:
-            for vecino, peso in grafo[nodo_actual].items():
-                if vecino not in visitados:
-                    nuevo_g = g_actual + peso
-                    h_vecino = heuristica.get(vecino, 0)
-                    nuevo_f = nuevo_g + W * h_vecino
-                    nuevo_camino = camino + [vecino]
-                    contador += 1
-                    heapq.heappush(heap, (nuevo_f, contador, vecino, nuevo_camino, nuevo_g))
+        # Siguiente iteración: W menor, los inconsistentes vuelven a ABIERTA y se reordena
+        W = max(1.0, W - decremento)
+        abiertos |= inconsistentes
+        inconsistentes = set()
+        cerrados = set()
+        heap = []
+        for nodo in abiertos:
+            contador += 1
+            heap.append((g[nodo] + W * h(nodo), contador, nodo, g[nodo]))
+        heapq.heapify(heap)
+        if instrumentacion is not None:
+            instrumentacion.agregar(len(heap))
     
-    return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos}
+    # Cortada por tiempo_max: el resultado depende del reloj, no es definitivo
+    motivo = {'motivo': MOTIVO_TIEMPO} if agotado else {}
+    if not soluciones:
+        return dict(motivo, exito=False, camino=[], costo=0, nodos_expandidos=nodos_expandidos, soluciones=[])
+    
+    mejor = soluciones[-1]
+    # Terminar la iteración con W = 1 prueba el óptimo (con heurística admisible)
+    cota = 1.0 if not agotado and W <= 1.0 else mejor['cota_suboptimalidad']
+    return dict(motivo, exito=True, camino=mejor['camino'], costo=mejor['costo'], nodos_expandidos=nodos_expandidos,
+                cota_suboptimalidad=cota, soluciones=soluciones)
 
-def busqueda_beam(grafo, nodo_ini, nodo_fin, heuristica, ancho_haz=2):
-    """Búsqueda Beam - Mejorada"""
+@instrumentable
+def busqueda_ara_estrella(grafo, nodo_ini, nodo_fin, heuristica, W_inicial=3.0, decremento=0.5,
+                          tiempo_max=None, al_mejorar=None, instrumentacion=None):
+    """
+    Búsqueda ARA* (Anytime Repairing A*) - A* ponderado que mejora su solución
+    
+    Arranca con W_inicial y, tras cada solución, baja W en 'decremento' sin
+    descartar la búsqueda: los g, padres y la lista ABIERTA se conservan y los
+    nodos cerrados que mejoraron su g (INCONSISTENTES) vuelven a abrirse. Cada
+    solución viene con su cota de suboptimalidad: costo <= cota * óptimo si la
+    heurística es admisible.
+    
+    Args:
+        W_inicial: peso de la primera iteración (>= 1)
+        decremento: cuánto baja W en cada iteración (> 0)
+        tiempo_max: segundos disponibles (None = hasta llegar a W = 1); si
+            se agotan, el resultado lleva 'motivo' = 'tiempo'
+        al_mejorar: función llamada con cada solución nueva
+            {'camino', 'costo', 'W', 'cota_suboptimalidad', 'nodos_expandidos', 'tiempo'}
+    
+    Returns:
+        dict: mejor solución con 'soluciones' (todas las entregadas en orden)
+        y 'cota_suboptimalidad' de la última
+    
+    Raises:
+        ValueError: si W_inicial < 1 o decremento <= 0
+    """
+    return ejecutar_pasos(pasos_ara_estrella(grafo, nodo_ini, nodo_fin, heuristica, W_inicial, decremento,
+                                             tiempo_max, al_mejorar, instrumentacion, emitir=False))
+
+def pasos_ida_estrella(grafo, nodo_ini, nodo_fin, heuristica, max_iteraciones=100, instrumentacion=None,
+                       emitir=True):
+    """Búsqueda IDA* paso a paso (generador de eventos, ver busqueda_ida_estrella)"""
+    if nodo_ini == nodo_fin:
+        return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0}
+    
+    vecinos, nodo_ini, nodo_fin, nombres = _preparar(grafo, nodo_ini, nodo_fin, instrumentacion)
+    h = _preparar_heuristica(heuristica, nombres, nodo_fin)
+    return (yield from _profundizacion_iterativa(vecinos, nodo_ini, nodo_fin, nombres, h(nodo_ini),
+                                                 lambda profundidad, g, nodo: g + h(nodo), max_iteraciones,
+                                                 instrumentacion, emitir))
+
+@instrumentable
+def busqueda_ida_estrella(grafo, nodo_ini, nodo_fin, heuristica, max_iteraciones=100, instrumentacion=None):
+    """
+    Búsqueda IDA* - Profundización iterativa sobre f = g + h
+    Cada iteración sube el umbral sólo hasta el menor f podado, así que con
+    pesos reales (los de leer_grafo son float) casi cada iteración agrega un
+    único nodo y las max_iteraciones se agotan antes de llegar: IDA* sirve con
+    pesos enteros o de pocos valores distintos. Si se agotan, el resultado
+    lleva 'motivo' = 'max_iteraciones' en lugar de una falla exhaustiva
+    """
+    return ejecutar_pasos(pasos_ida_estrella(grafo, nodo_ini, nodo_fin, heuristica, max_iteraciones,
+                                             instrumentacion, emitir=False))
+
+def pasos_beam(grafo, nodo_ini, nodo_fin, heuristica, ancho_haz=2, ancho_adaptativo=False, ancho_max=None,
+               instrumentacion=None, emitir=True):
+    """Búsqueda Beam paso a paso (generador de eventos, ver busqueda_beam)"""
     if nodo_ini == nodo_fin:
         return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0}
     
-    nivel_actual = [(heuristica.get(nodo_ini, 0), nodo_ini, [nodo_ini], 0)]
-    visitados = set()
+    vecinos, nodo_ini, nodo_fin, nombres = _preparar(grafo, nodo_ini, nodo_fin, instrumentacion)
+    h = _preparar_heuristica(heuristica, nombres, nodo_fin)
+    if ancho_max is None:
+        ancho_max = ancho_haz * 64
+    # nivel: [h, contador, nodo, padre, costo] ordenado por (h, contador)
+    nivel_actual = [[h(nodo_ini), 0, nodo_ini, None, 0]]
+    padres = {}
     nodos_expandidos = 0
-    max_iteraciones = 100
+    contador = 0
+    ancho = ancho_haz
+    ancho_maximo_usado = ancho
+    mejor_h = float('inf')
+    if instrumentacion is not None:
+        instrumentacion.agregar()
     
-    for iteracion in range(max_iteraciones):
-        if not nivel_actual:
-            break
+    while nivel_actual:
+        # heap de peores-primero: clave (-h, -contador) deja en el tope el candidato a descartar
+        peores = []
+        en_nivel = {}
         
-        nivel_actual.sort(key=lambda x: x[0])
-        nivel_actual = nivel_actual[:ancho_haz]
-        
-        siguiente_nivel = []
-        
-        for h_actual, nodo_actual, camino, costo in nivel_actual:
-            if nodo_actual in visitados:
+        for h_actual, _, nodo_actual, padre, costo in nivel_actual:
+            if nodo_actual in padres:
+                if instrumentacion is not None:
+                    instrumentacion.descartar()
                 continue
             
-            visitados.add(nodo_actual)
+            padres[nodo_actual] = padre
             nodos_expandidos += 1
+            if instrumentacion is not None:
+                instrumentacion.expandir(nodo_actual, costo, len(nivel_actual) + len(peores), len(padres))
+            if emitir:
+                yield (EVENTO_EXPANDIR, _nombre(nodo_actual, nombres), costo)
             
             if nodo_actual == nodo_fin:
-                return {'exito': True, 'camino': camino, 'costo': costo, 'nodos_expandidos': nodos_expandidos}
+                if emitir:
+                    yield (EVENTO_OBJETIVO, _nombre(nodo_fin, nombres), costo)
+                camino = _reconstruir_camino(padres, nodo_fin, nombres)
+                resultado = {'exito': True, 'camino': camino, 'costo': costo, 'nodos_expandidos': nodos_expandidos}
+                if ancho_adaptativo:
+                    resultado['ancho_maximo_usado'] = ancho_maximo_usado
+                return resultado
             
-            if nodo_actual in grafo:
-                for vecino, peso in grafo[nodo_actual].items():
-                    if vecino not in visitados:
-                        h_vecino = heuristica.get(vecino, 0)
-                        siguiente_nivel.append((
-                            h_vecino,
-                            vecino,
-                            camino + [vecino],
-                            costo + peso
-                        ))
-        
-        nivel_actual = siguiente_nivel
+            for vecino, peso in vecinos(nodo_actual):
+                if vecino in padres:
+                    continue
+                
+                nuevo_costo = costo + peso
+                entrada = en_nivel.get(vecino)
+                if entrada is not None:
+                    # Duplicado en el nivel: misma h, se queda el camino más barato
+                    if nuevo_costo < entrada[4]:
+                        entrada[3] = nodo_actual
+                        entrada[4] = nuevo_costo
+                    continue
+                
+                h_vecino = h(vecino)
+                if len(peores) >= ancho and h_vecino >= -peores[0][0]:
+                    continue
+                
+                contador += 1
+                entrada = [-h_vecino, -contador, vecino, nodo_actual, nuevo_costo]
+                en_nivel[vecino] = entrada
+                if instrumentacion is not None:
+                    instrumentacion.agregar()
+                if emitir:
+                    yield (EVENTO_GENERAR, _nombre(vecino, nombres), nuevo_costo, _nombre(nodo_actual, nombres))
+                if len(peores) < ancho:
+                    heapq.heappush(peores, entrada)
+                else:
+                    descartado = heapq.heappushpop(peores, entrada)
+                    del en_nivel[descartado[2]]
+                    if instrumentacion is not None:
+                        instrumentacion.descartar()
+        
+        nivel_actual = sorted([-e[0], -e[1], e[2], e[3], e[4]] for e in peores)
+        
+        if ancho_adaptativo and nivel_actual:
+            # Estancada: el mejor candidato nuevo no mejora la mejor h vista
+            if nivel_actual[0][0] < mejor_h:
+                mejor_h = nivel_actual[0][0]
+                ancho = ancho_haz
+            else:
+                ancho = min(ancho * 2, ancho_max)
+                ancho_maximo_usado = max(ancho_maximo_usado, ancho)
     
-    return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos}
+    resultado = {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos}
+    if ancho_adaptativo:
+        resultado['ancho_maximo_usado'] = ancho_maximo_usado
+    return resultado
+
+@instrumentable
+def busqueda_beam(grafo, nodo_ini, nodo_fin, heuristica, ancho_haz=2, ancho_adaptativo=False, ancho_max=None,
+                  instrumentacion=None):
+    """
+    Búsqueda Beam - Heap acotado a los k mejores candidatos por nivel
+    
+    Cada nivel conserva sólo ancho_haz candidatos (sin duplicados) en un heap
+    de peores-primero, así que nunca se ordena ni se guarda el nivel completo.
+    La búsqueda termina cuando un nivel queda vacío. Con ancho_adaptativo, el
+    ancho se duplica (hasta ancho_max) mientras la mejor h no mejore y vuelve a
+    ancho_haz en cuanto mejora.
+    """
+    return ejecutar_pasos(pasos_beam(grafo, nodo_ini, nodo_fin, heuristica, ancho_haz, ancho_adaptativo, ancho_max,
+                                     instrumentacion, emitir=False))
+
+def _descenso_codicioso(vecinos, nodo_ini, nodo_fin, h, instrumentacion=None):
+    """
+    Descenso codicioso sin retroceso para obtener una cota superior inicial
+    En cada paso toma el vecino no visitado de menor peso + h; con
+    instrumentación, cada paso respeta el presupuesto como una expansión
+    
+    Returns:
+        tuple: (camino, costo) o (None, inf) si se atasca
+    """
+    camino = [nodo_ini]
+    en_camino = {nodo_ini}
+    costo = 0
+    nodo_actual = nodo_ini
+    
+    while nodo_actual != nodo_fin:
+        if instrumentacion is not None:
+            instrumentacion.verificar_presupuesto(0, len(en_camino))
+        mejor = None
+        for vecino, peso in vecinos(nodo_actual):
+            if vecino not in en_camino:
+                clave = (peso + h(vecino), peso)
+                if mejor is None or clave < mejor[0]:
+                    mejor = (clave, vecino, peso)
+        if mejor is None:
+            return None, float('inf')
+        
+        _, nodo_actual, peso = mejor
+        camino.append(nodo_actual)
+        en_camino.add(nodo_actual)
+        costo += peso
+    
+    return camino, costo
 
-def busqueda_branch_and_bound(grafo, nodo_ini, nodo_fin):
-    """Búsqueda Branch and Bound - Optimizada con heapq"""
+def _camino_en_arbol(arbol_nodos, arbol_padres, indice):
+    """Camino desde la raíz hasta la rama 'indice' del árbol de Branch and Bound"""
+    camino = []
+    while indice is not None:
+        camino.append(arbol_nodos[indice])
+        indice = arbol_padres[indice]
+    camino.reverse()
+    return camino
+
+def pasos_branch_and_bound(grafo, nodo_ini, nodo_fin, heuristica=None, instrumentacion=None, emitir=True):
+    """Branch and Bound paso a paso (generador de eventos, ver busqueda_branch_and_bound)"""
     if nodo_ini == nodo_fin:
         return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0}
     
-    # heap: (costo, contador, camino)
+    vecinos, nodo_ini, nodo_fin, nombres = _preparar(grafo, nodo_ini, nodo_fin, instrumentacion)
+    if heuristica is None:
+        h = lambda nodo: 0
+    else:
+        h = _preparar_heuristica(heuristica, nombres, nodo_fin)
+    
+    mejor_camino, mejor_costo = _descenso_codicioso(vecinos, nodo_ini, nodo_fin, h, instrumentacion)
+    if instrumentacion is not None and mejor_camino is not None:
+        instrumentacion.registrar_solucion(_a_nombres(mejor_camino, nombres), mejor_costo)
+    if emitir and mejor_camino is not None:
+        yield (EVENTO_OBJETIVO, _nombre(nodo_fin, nombres), mejor_costo)
+    # Árbol de búsqueda compartido: cada rama parcial es un índice con puntero a su padre
+    arbol_nodos = [nodo_ini]
+    arbol_padres = [None]
+    # heap: (g + h, contador, g, indice en el árbol)
     contador = 0
-    heap = [(0, contador, [nodo_ini])]
+    heap = [(h(nodo_ini), contador, 0, 0)]
     mejor_solucion = None
-    mejor_costo = float('inf')
-    visitados_con_costo = {}
+    mejor_g = {nodo_ini: 0}
     nodos_expandidos = 0
+    if instrumentacion is not None:
+        instrumentacion.agregar()
     
     while heap:
-        costo_actual, _, camino = heapq.heappop(heap)
-        nodo_actual = camino[-1]
-        
-        if costo_actual >= mejor_costo:
-            continue
+        cota, _, costo_actual, indice = heapq.heappop(heap)
+        # Extracción en orden de cota: nada de lo que queda puede mejorar la solución
+        if cota >= mejor_costo:
+            break
         
-        if nodo_actual in visitados_con_costo and visitados_con_costo[nodo_actual] <= costo_actual:
+        nodo_actual = arbol_nodos[indice]
+        if costo_actual > mejor_g[nodo_actual]:
+            if instrumentacion is not None:
+                instrumentacion.descartar()
             continue
         
-        visitados_con_costo[nodo_actual] = costo_actual
         nodos_expandidos += 1
+        if instrumentacion is not None:
+            instrumentacion.expandir(nodo_actual, costo_actual, len(heap) + 1, len(mejor_g))
+        if emitir:
+            yield (EVENTO_EXPANDIR, _nombre(nodo_actual, nombres), costo_actual)
         
         if nodo_actual == nodo_fin:
-            if costo_actual < mejor_costo:
-                mejor_costo = costo_actual
-                mejor_solucion = camino
+            mejor_costo = costo_actual
+            mejor_solucion = indice
+            if instrumentacion is not None:
+                instrumentacion.registrar_solucion(
+                    _a_nombres(_camino_en_arbol(arbol_nodos, arbol_padres, indice), nombres), mejor_costo)
+            if emitir:
+                yield (EVENTO_OBJETIVO, _nombre(nodo_fin, nombres), mejor_costo)
             continue
         
-        if nodo_actual in grafo:
-            for vecino, peso in grafo[nodo_actual].items():
-                if vecino not in camino:  # Evitar ciclos
-                    nuevo_costo = costo_actual + peso
-                    if nuevo_costo < mejor_costo:
-                        contador += 1
-                        heapq.heappush(heap, (nuevo_costo, contador, camino + [vecino]))
+        for vecino, peso in vecinos(nodo_actual):
+            nuevo_costo = costo_actual + peso
+            if nuevo_costo >= mejor_g.get(vecino, float('inf')):
+                continue
+            nueva_cota = nuevo_costo + h(vecino)
+            if nueva_cota < mejor_costo:
+                mejor_g[vecino] = nuevo_costo
+                arbol_nodos.append(vecino)
+                arbol_padres.append(indice)
+                contador += 1
+                heapq.heappush(heap, (nueva_cota, contador, nuevo_costo, len(arbol_nodos) - 1))
+                if instrumentacion is not None:
+                    instrumentacion.agregar()
+                if emitir:
+                    yield (EVENTO_GENERAR, _nombre(vecino, nombres), nuevo_costo, _nombre(nodo_actual, nombres))
+    
+    if mejor_solucion is not None:
+        camino = _camino_en_arbol(arbol_nodos, arbol_padres, mejor_solucion)
+        return {'exito': True, 'camino': _a_nombres(camino, nombres), 'costo': mejor_costo, 'nodos_expandidos': nodos_expandidos}
     
-    if mejor_solucion:
-        return {'exito': True, 'camino': mejor_solucion, 'costo': mejor_costo, 'nodos_expandidos': nodos_expandidos}
+    if mejor_camino is not None:
+        # Ninguna rama mejoró la del descenso codicioso
+        return {'exito': True, 'camino': _a_nombres(mejor_camino, nombres), 'costo': mejor_costo, 'nodos_expandidos': nodos_expandidos}
     
     return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos}
 
-def busqueda_hill_climbing(grafo, nodo_ini, nodo_fin, heuristica, max_iteraciones=20):
-    """Búsqueda Hill Climbing - Mejorada"""
-    if nodo_ini == nodo_fin:
-        return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0}
+@instrumentable
+def busqueda_branch_and_bound(grafo, nodo_ini, nodo_fin, heuristica=None, instrumentacion=None):
+    """
+    Búsqueda Branch and Bound - Cota inferior g + h y cota superior inicial
     
+    La cota superior arranca con un descenso codicioso y cada rama se poda en
+    cuanto g + h alcanza la mejor solución. Las ramas se extraen por cota, y
+    el mejor g conocido por nodo descarta en O(1) tanto ramas dominadas como
+    ciclos: volver a un nodo de la propia rama nunca mejora su g.
+    
+    Args:
+        heuristica: opcional; debe ser admisible (p. ej. landmarks) para
+            conservar el costo óptimo. Sin ella h = 0
+    """
+    return ejecutar_pasos(pasos_branch_and_bound(grafo, nodo_ini, nodo_fin, heuristica, instrumentacion,
+                                                 emitir=False))
+
+def _ascenso_colinas(vecinos, nodo_ini, nodo_fin, h, max_iteraciones, detener=None, instrumentacion=None,
+                     emitir=False, nombres=None):
+    """
+    Núcleo de Hill Climbing sobre claves internas (generador, ver ejecutar_pasos)
+    
+    Returns:
+        tuple: (camino, costo, nodos_expandidos)
+    """
     camino = [nodo_ini]
+    en_camino = {nodo_ini}
     costo_acumulado = 0
     nodo_actual = nodo_ini
     nodos_expandidos = 0
     
     for iteracion in range(max_iteraciones):
-        if nodo_actual == nodo_fin:
-            return {'exito': True, 'camino': camino, 'costo': costo_acumulado, 'nodos_expandidos': nodos_expandidos}
+        if nodo_actual == nodo_fin or (detener is not None and detener()):
+            break
         
         nodos_expandidos += 1
-        
-        if nodo_actual not in grafo:
-            break
+        if instrumentacion is not None:
+            instrumentacion.expandir(nodo_actual, costo_acumulado, 1, len(en_camino))
+        if emitir:
+            yield (EVENTO_EXPANDIR, _nombre(nodo_actual, nombres), costo_acumulado)
         
         mejor_vecino = None
-        mejor_heuristica = heuristica.get(nodo_actual, float('inf'))
+        mejor_heuristica = h(nodo_actual)
         mejor_peso = 0
         
-        for vecino, peso in grafo[nodo_actual].items():
-            h_vecino = heuristica.get(vecino, float('inf'))
-            if vecino not in camino and h_vecino < mejor_heuristica:
+        for vecino, peso in vecinos(nodo_actual):
+            h_vecino = h(vecino)
+            if h_vecino < mejor_heuristica and vecino not in en_camino:
                 mejor_vecino = vecino
                 mejor_heuristica = h_vecino
                 mejor_peso = peso
@@ -375,21 +1149,50 @@ def busqueda_hill_climbing(grafo, nodo_ini, nodo_fin, heuristica, max_iteracione
             break
         
         camino.append(mejor_vecino)
+        en_camino.add(mejor_vecino)
         costo_acumulado += mejor_peso
+        if emitir:
+            yield (EVENTO_GENERAR, _nombre(mejor_vecino, nombres), costo_acumulado, _nombre(nodo_actual, nombres))
         nodo_actual = mejor_vecino
     
-    exito = nodo_actual == nodo_fin
-    return {'exito': exito, 'camino': camino, 'costo': costo_acumulado, 'nodos_expandidos': nodos_expandidos}
+    return camino, costo_acumulado, nodos_expandidos
+
+def pasos_hill_climbing(grafo, nodo_ini, nodo_fin, heuristica, max_iteraciones=20, instrumentacion=None,
+                        emitir=True):
+    """Hill Climbing paso a paso (generador de eventos, ver busqueda_hill_climbing)"""
+    if nodo_ini == nodo_fin:
+        return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0}
+    
+    vecinos, nodo_ini, nodo_fin, nombres = _preparar(grafo, nodo_ini, nodo_fin, instrumentacion)
+    h = _preparar_heuristica(heuristica, nombres, nodo_fin, float('inf'))
+    camino, costo, nodos_expandidos = yield from _ascenso_colinas(vecinos, nodo_ini, nodo_fin, h, max_iteraciones,
+                                                                  instrumentacion=instrumentacion, emitir=emitir,
+                                                                  nombres=nombres)
+    
+    exito = camino[-1] == nodo_fin
+    if exito and emitir:
+        yield (EVENTO_OBJETIVO, _nombre(nodo_fin, nombres), costo)
+    return {'exito': exito, 'camino': _a_nombres(camino, nombres), 'costo': costo, 'nodos_expandidos': nodos_expandidos}
+
+@instrumentable
+def busqueda_hill_climbing(grafo, nodo_ini, nodo_fin, heuristica, max_iteraciones=20, instrumentacion=None):
+    """Búsqueda Hill Climbing - Mejorada"""
+    return ejecutar_pasos(pasos_hill_climbing(grafo, nodo_ini, nodo_fin, heuristica, max_iteraciones,
+                                              instrumentacion, emitir=False))
 
-def busqueda_random_restart_hill_climbing(grafo, nodo_ini, nodo_fin, heuristica, max_reinicios=3, pasos_por_intento=10):
-    """Búsqueda Hill Climbing con reinicios aleatorios - Mejorada"""
+def pasos_random_restart_hill_climbing(grafo, nodo_ini, nodo_fin, heuristica, max_reinicios=3, pasos_por_intento=10,
+                                       semilla=None, instrumentacion=None, emitir=True):
+    """Hill Climbing con reinicios paso a paso (generador de eventos, ver busqueda_random_restart_hill_climbing)"""
+    rng = random.Random(semilla)
+    nodos = list(grafo.keys())
     mejor_resultado = None
     nodos_expandidos_total = 0
     
     for reinicio in range(max_reinicios):
-        inicio_actual = nodo_ini if reinicio == 0 else random.choice(list(grafo.keys()))
+        inicio_actual = nodo_ini if reinicio == 0 else rng.choice(nodos)
         
-        resultado = busqueda_hill_climbing(grafo, inicio_actual, nodo_fin, heuristica, pasos_por_intento)
+        resultado = yield from pasos_hill_climbing(grafo, inicio_actual, nodo_fin, heuristica, pasos_por_intento,
+                                                   instrumentacion, emitir)
         nodos_expandidos_total += resultado['nodos_expandidos']
         
         if resultado['exito']:
@@ -406,40 +1209,62 @@ def busqueda_random_restart_hill_climbing(grafo, nodo_ini, nodo_fin, heuristica,
     
     return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos_total}
 
-def busqueda_simulated_annealing(grafo, nodo_ini, nodo_fin, heuristica, temperatura_inicial=100, tasa_enfriamiento=0.95, max_iteraciones=100):
-    """Búsqueda Simulated Annealing - Mejorada"""
-    if nodo_ini == nodo_fin:
-        return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0}
+@instrumentable
+def busqueda_random_restart_hill_climbing(grafo, nodo_ini, nodo_fin, heuristica, max_reinicios=3, pasos_por_intento=10, semilla=None,
+                                          instrumentacion=None):
+    """
+    Búsqueda Hill Climbing con reinicios aleatorios - Mejorada
+    Los reinicios se eligen con un generador propio (semilla) y se ejecutan uno
+    tras otro; algorithms.multi_start los reparte entre procesos
+    """
+    return ejecutar_pasos(pasos_random_restart_hill_climbing(grafo, nodo_ini, nodo_fin, heuristica, max_reinicios,
+                                                             pasos_por_intento, semilla, instrumentacion,
+                                                             emitir=False))
+
+def _recocido_simulado(vecinos, nodo_ini, nodo_fin, h, rng, temperatura_inicial, tasa_enfriamiento, max_iteraciones,
+                       detener=None, instrumentacion=None, emitir=False, nombres=None):
+    """
+    Núcleo de Simulated Annealing sobre claves internas con un generador
+    aleatorio propio (generador de pasos, ver ejecutar_pasos)
     
+    Returns:
+        tuple: (camino, costo, nodos_expandidos)
+    """
     camino = [nodo_ini]
+    en_camino = {nodo_ini}
     costo_acumulado = 0
     nodo_actual = nodo_ini
     temperatura = temperatura_inicial
     nodos_expandidos = 0
     
     for iteracion in range(max_iteraciones):
-        if nodo_actual == nodo_fin:
-            return {'exito': True, 'camino': camino, 'costo': costo_acumulado, 'nodos_expandidos': nodos_expandidos}
+        if nodo_actual == nodo_fin or (detener is not None and detener()):
+            break
         
         nodos_expandidos += 1
+        if instrumentacion is not None:
+            instrumentacion.expandir(nodo_actual, costo_acumulado, 1, len(en_camino))
+        if emitir:
+            yield (EVENTO_EXPANDIR, _nombre(nodo_actual, nombres), costo_acumulado)
         
-        if nodo_actual not in grafo:
-            break
-        
-        vecinos = [(v, p) for v, p in grafo[nodo_actual].items() if v not in camino]
+        candidatos = [(v, p) for v, p in vecinos(nodo_actual) if v not in en_camino]
         
-        if not vecinos:
+        if not candidatos:
             break
         
-        vecino_elegido, peso = random.choice(vecinos)
-        h_actual = heuristica.get(nodo_actual, 0)
-        h_vecino = heuristica.get(vecino_elegido, 0)
+        vecino_elegido, peso = rng.choice(candidatos)
+        h_actual = h(nodo_actual)
+        h_vecino = h(vecino_elegido)
         
         delta_e = h_vecino - h_actual
         
-        if delta_e < 0 or (temperatura > 0 and random.random() < math.exp(-delta_e / temperatura)):
+        if delta_e < 0 or (temperatura > 0 and rng.random() < math.exp(-delta_e / temperatura)):
             camino.append(vecino_elegido)
+            en_camino.add(vecino_elegido)
             costo_acumulado += peso
+            if emitir:
+                yield (EVENTO_GENERAR, _nombre(vecino_elegido, nombres), costo_acumulado,
+                       _nombre(nodo_actual, nombres))
             nodo_actual = vecino_elegido
         
         temperatura *= tasa_enfriamiento
@@ -447,5 +1272,83 @@ def busqueda_simulated_annealing(grafo, nodo_ini, nodo_fin, heuristica, temperat
         if temperatura < 0.01:
             break
     
-    exito = nodo_actual == nodo_fin
-    return {'exito': exito, 'camino': camino, 'costo': costo_acumulado, 'nodos_expandidos': nodos_expandidos}
\ No newline at end of file
+    return camino, costo_acumulado, nodos_expandidos
+
+def pasos_simulated_annealing(grafo, nodo_ini, nodo_fin, heuristica, temperatura_inicial=100, tasa_enfriamiento=0.95,
+                              max_iteraciones=100, semilla=None, instrumentacion=None, emitir=True):
+    """Simulated Annealing paso a paso (generador de eventos, ver busqueda_simulated_annealing)"""
+    if nodo_ini == nodo_fin:
+        return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0}
+    
+    vecinos, nodo_ini, nodo_fin, nombres = _preparar(grafo, nodo_ini, nodo_fin, instrumentacion)
+    h = _preparar_heuristica(heuristica, nombres, nodo_fin)
+    camino, costo, nodos_expandidos = yield from _recocido_simulado(
+        vecinos, nodo_ini, nodo_fin, h, random.Random(semilla), temperatura_inicial, tasa_enfriamiento,
+        max_iteraciones, instrumentacion=instrumentacion, emitir=emitir, nombres=nombres)
+    
+    exito = camino[-1] == nodo_fin
+    if exito and emitir:
+        yield (EVENTO_OBJETIVO, _nombre(nodo_fin, nombres), costo)
+    return {'exito': exito, 'camino': _a_nombres(camino, nombres), 'costo': costo, 'nodos_expandidos': nodos_expandidos}
+
+@instrumentable
+def busqueda_simulated_annealing(grafo, nodo_ini, nodo_fin, heuristica, temperatura_inicial=100, tasa_enfriamiento=0.95, max_iteraciones=100, semilla=None,
+                                 instrumentacion=None):
+    """Búsqueda Simulated Annealing - Mejorada (semilla fija la cadena aleatoria)"""
+    return ejecutar_pasos(pasos_simulated_annealing(grafo, nodo_ini, nodo_fin, heuristica, temperatura_inicial,
+                                                    tasa_enfriamiento, max_iteraciones, semilla, instrumentacion,
+                                                    emitir=False))
+
+# Registro por nombre para ejecutar los algoritmos de forma genérica (lotes, benchmarks)
+ALGORITMOS = {
+    'amplitud': busqueda_amplitud,
+    'amplitud_bidireccional': busqueda_amplitud_bidireccional,
+    'costo_uniforme': busqueda_costo_uniforme,
+    'costo_uniforme_bidireccional': busqueda_costo_uniforme_bidireccional,
+    'profundidad': busqueda_profundidad,
+    'profundidad_limitada': busqueda_profundidad_limitada,
+    'profundidad_iterativa': busqueda_profundidad_iterativa,
+    'codiciosa': busqueda_codiciosa,
+    'a_estrella': busqueda_a_estrella,
+    'a_estrella_ponderado': busqueda_a_estrella_ponderado,
+    'ara_estrella': busqueda_ara_estrella,
+    'ida_estrella': busqueda_ida_estrella,
+    'beam': busqueda_beam,
+    'branch_and_bound': busqueda_branch_and_bound,
+    'hill_climbing': busqueda_hill_climbing,
+    'random_restart_hill_climbing': busqueda_random_restart_hill_climbing,
+    'simulated_annealing': busqueda_simulated_annealing
+}
+
+# Variantes paso a paso (generadores de eventos) con los mismos nombres y argumentos
+PASOS = {
+    'amplitud': pasos_amplitud,
+    'amplitud_bidireccional': pasos_amplitud_bidireccional,
+    'costo_uniforme': pasos_costo_uniforme,
+    'costo_uniforme_bidireccional': pasos_costo_uniforme_bidireccional,
+    'profundidad': pasos_profundidad,
+    'profundidad_limitada': pasos_profundidad_limitada,
+    'profundidad_iterativa': pasos_profundidad_iterativa,
+    'codiciosa': pasos_codiciosa,
+    'a_estrella': pasos_a_estrella,
+    'a_estrella_ponderado': pasos_a_estrella_ponderado,
+    'ara_estrella': pasos_ara_estrella,
+    'ida_estrella': pasos_ida_estrella,
+    'beam': pasos_beam,
+    'branch_and_bound': pasos_branch_and_bound,
+    'hill_climbing': pasos_hill_climbing,
+    'random_restart_hill_climbing': pasos_random_restart_hill_climbing,
+    'simulated_annealing': pasos_simulated_annealing
+}
+
+# Algoritmos que reciben heurística como cuarto argumento
+ALGORITMOS_INFORMADOS = {
+    'codiciosa', 'a_estrella', 'a_estrella_ponderado', 'ara_estrella', 'ida_estrella', 'beam',
+    'hill_climbing', 'random_restart_hill_climbing', 'simulated_annealing'
+}
+
+# Algoritmos que garantizan el costo óptimo (pesos no negativos)
+ALGORITMOS_OPTIMOS = {'costo_uniforme', 'costo_uniforme_bidireccional', 'branch_and_bound'}
+
+# Algoritmos óptimos sólo si la heurística es admisible (p. ej. landmarks)
+ALGORITMOS_OPTIMOS_SI_ADMISIBLE = {'a_estrella', 'ida_estrella'}
@@ -0,0 +1,235 @@
+"""
+Motor vectorizado opcional sobre matrices dispersas (numpy + scipy)
+Para trabajo sobre el grafo entero (alcanzabilidad, saltos desde un origen,
+distancias desde muchos orígenes): la BFS avanza por niveles completos con
+productos dispersos frontera·matriz y los caminos mínimos se calculan en bloque
+con scipy.sparse.csgraph, sin bucles de Python por nodo
+
+Si numpy o scipy no están instalados el módulo se importa igual, DISPONIBLE
+queda en False y cada función lanza ImportError al usarse
+"""
+
+try:
+    import numpy as np
+    from scipy import sparse
+    from scipy.sparse import csgraph
+    DISPONIBLE = True
+except ImportError:
+    np = sparse = csgraph = None
+    DISPONIBLE = False
+
+from utils.graph_utils import compilar_grafo
+
+# Centinela de scipy para "sin predecesor"
+_SIN_PADRE = -9999
+
+def _requerir():
+    """Falla con un mensaje claro si el motor no está disponible"""
+    if not DISPONIBLE:
+        raise ImportError("El motor disperso requiere numpy y scipy (pip install numpy scipy)")
+
+class GrafoDisperso:
+    """
+    Matrices CSR de scipy construidas sobre un GrafoCompilado
+    
+    El formato CSR de GrafoCompilado ya es el de scipy (offsets = indptr,
+    destinos = indices), así que construirlo no recorre las aristas en Python
+    Conviene crearlo una vez y reutilizarlo en varias consultas
+    
+    pesos[u, v] es el peso de la arista u->v; los ceros explícitos se
+    conservan y csgraph los trata como aristas de peso 0
+    """
+    def __init__(self, grafo):
+        _requerir()
+        compilado = compilar_grafo(grafo)
+        self.nombres = compilado.nombres
+        self.ids = compilado.ids
+        n = len(compilado)
+        
+        offsets = np.asarray(compilado.offsets, dtype=np.int64)
+        destinos = np.asarray(compilado.destinos, dtype=np.int64)
+        pesos = np.asarray(compilado.pesos, dtype=np.float64)
+        self.pesos = sparse.csr_matrix((pesos, destinos, offsets), shape=(n, n))
+    
+    def __len__(self):
+        return len(self.nombres)
+    
+    def id_de(self, nombre):
+        """Obtiene el ID entero de un nodo a partir de su nombre"""
+        try:
+            return self.ids[nombre]
+        except KeyError:
+            raise KeyError(f"El nodo '{nombre}' no existe en el grafo")
+
+def _como_disperso(grafo):
+    """Acepta el dict de leer_grafo, un GrafoCompilado o un GrafoDisperso"""
+    return grafo if isinstance(grafo, GrafoDisperso) else GrafoDisperso(grafo)
+
+def _ids(disperso, nodos):
+    """IDs de un nodo o de una colección de nodos (por nombre)"""
+    if isinstance(nodos, str):
+        nodos = [nodos]
+    return np.array([disperso.id_de(nodo) for nodo in nodos], dtype=np.int64)
+
+def _bfs_por_niveles(disperso, origenes, fin=None, max_niveles=None):
+    """
+    BFS por niveles sobre IDs; cada nivel es el producto disperso frontera·A,
+    que se obtiene concatenando las filas CSR de los nodos de la frontera
+    
+    Returns:
+        tuple: (niveles, padres, nodos_expandidos) con -1 en los nodos no alcanzados
+    """
+    indptr = disperso.pesos.indptr
+    indices = disperso.pesos.indices
+    niveles = np.full(len(disperso), -1, dtype=np.int64)
+    padres = np.full(len(disperso), -1, dtype=np.int64)
+    frontera = np.unique(origenes)
+    niveles[frontera] = 0
+    nodos_expandidos = 0
+    nivel = 0
+    
+    while frontera.size and (fin is None or niveles[fin] < 0) and (max_niveles is None or nivel < max_niveles):
+        nodos_expandidos += int(frontera.size)
+        inicios = indptr[frontera]
+        cantidades = indptr[frontera + 1] - inicios
+        total = int(cantidades.sum())
+        if total == 0:
+            break
+        # Posición de cada arista de la frontera en indices: inicio de su fila + desplazamiento
+        posiciones = np.repeat(inicios - np.cumsum(cantidades) + cantidades, cantidades) + np.arange(total)
+        vecinos = indices[posiciones]
+        origen = np.repeat(frontera, cantidades)
+        libres = niveles[vecinos] < 0
+        # unique ordena por ID y return_index da la primera aparición: el padre de menor ID
+        frontera, primeros = np.unique(vecinos[libres], return_index=True)
+        nivel += 1
+        niveles[frontera] = nivel
+        padres[frontera] = origen[libres][primeros]
+    return niveles, padres, nodos_expandidos
+
+def niveles_amplitud(grafo, origenes, nodo_fin=None, max_niveles=None):
+    """
+    BFS por niveles desde uno o varios orígenes
+    
+    Args:
+        grafo: dict de leer_grafo, GrafoCompilado o GrafoDisperso
+        origenes: nombre de un nodo o colección de nombres (BFS multiorigen)
+        nodo_fin: si se indica, se detiene al alcanzar su nivel
+        max_niveles: profundidad máxima opcional
+    
+    Returns:
+        tuple: (niveles, nodos_expandidos); niveles es un arreglo de numpy con
+        los saltos al origen más cercano por ID (-1 si no se alcanzó)
+    """
+    disperso = _como_disperso(grafo)
+    fin = disperso.id_de(nodo_fin) if nodo_fin is not None else None
+    niveles, _, nodos_expandidos = _bfs_por_niveles(disperso, _ids(disperso, origenes), fin, max_niveles)
+    return niveles, nodos_expandidos
+
+def alcanzables(grafo, origenes):
+    """Nombres de los nodos alcanzables desde uno o varios orígenes (incluidos ellos)"""
+    disperso = _como_disperso(grafo)
+    niveles, _ = niveles_amplitud(disperso, origenes)
+    return [disperso.nombres[u] for u in np.flatnonzero(niveles >= 0)]
+
+def busqueda_amplitud_dispersa(grafo, nodo_ini, nodo_fin):
+    """
+    Búsqueda en amplitud (BFS) - Vectorizada por niveles
+    Mismo resultado que busqueda_amplitud salvo el desempate entre caminos
+    con igual número de saltos (aquí gana el predecesor de menor ID)
+    """
+    if nodo_ini == nodo_fin:
+        return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0}
+    
+    disperso = _como_disperso(grafo)
+    ini, fin = disperso.id_de(nodo_ini), disperso.id_de(nodo_fin)
+    niveles, padres, nodos_expandidos = _bfs_por_niveles(disperso, np.array([ini]), fin)
+    if niveles[fin] < 0:
+        return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos}
+    
+    camino = [fin]
+    costo = 0
+    while camino[-1] != ini:
+        padre = int(padres[camino[-1]])
+        costo += disperso.pesos[padre, camino[-1]]
+        camino.append(padre)
+    camino.reverse()
+    
+    return {'exito': True, 'camino': [disperso.nombres[u] for u in camino], 'costo': float(costo),
+            'nodos_expandidos': nodos_expandidos}
+
+def busqueda_costo_uniforme_dispersa(grafo, nodo_ini, nodo_fin):
+    """
+    Búsqueda de costo uniforme - Dijkstra de scipy (C)
+    csgraph no se detiene en el objetivo: resuelve el árbol completo, así que
+    nodos_expandidos cuenta todos los nodos alcanzables
+    """
+    if nodo_ini == nodo_fin:
+        return {'exito': True, 'camino': [nodo_ini], 'costo': 0, 'nodos_expandidos': 0}
+    
+    disperso = _como_disperso(grafo)
+    ini, fin = disperso.id_de(nodo_ini), disperso.id_de(nodo_fin)
+    distancias, padres = csgraph.dijkstra(disperso.pesos, directed=True, indices=ini,
+                                          return_predecessors=True)
+    nodos_expandidos = int(np.count_nonzero(np.isfinite(distancias)))
+    if not np.isfinite(distancias[fin]):
+        return {'exito': False, 'camino': [], 'costo': 0, 'nodos_expandidos': nodos_expandidos}
+    
+    camino = []
+    nodo = fin
+    while nodo != _SIN_PADRE:
+        camino.append(disperso.nombres[nodo])
+        nodo = padres[nodo]
+    camino.reverse()
+    
+    return {'exito': True, 'camino': camino, 'costo': float(distancias[fin]),
+            'nodos_expandidos': nodos_expandidos}
+
+def distancias_desde(grafo, nodo_ini, ponderado=True):
+    """
+    Distancias mínimas desde un origen a todos los nodos alcanzables
+    
+    Returns:
+        dict: {nombre: distancia} (en saltos si ponderado=False)
+    """
+    disperso = _como_disperso(grafo)
+    distancias = csgraph.dijkstra(disperso.pesos, directed=True, indices=disperso.id_de(nodo_ini),
+                                  unweighted=not ponderado)
+    alcanzados = np.flatnonzero(np.isfinite(distancias))
+    return {disperso.nombres[u]: float(distancias[u]) for u in alcanzados}
+
+def matriz_distancias(grafo, origenes=None, destinos=None, ponderado=True):
+    """
+    Distancias mínimas en bloque desde muchos orígenes
+    
+    Args:
+        grafo: dict de leer_grafo, GrafoCompilado o GrafoDisperso
+        origenes: nombres de las filas (por defecto, todos los nodos: la
+            matriz ocupa n² floats, así que en grafos grandes conviene acotarlos)
+        destinos: nombres de las columnas (por defecto, todos)
+        ponderado: False cuenta saltos en lugar de pesos
+    
+    Returns:
+        tuple: (matriz, nombres_filas, nombres_columnas); matriz es un arreglo
+        de numpy con inf donde no hay camino
+    """
+    if isinstance(origenes, str):
+        origenes = [origenes]
+    if isinstance(destinos, str):
+        destinos = [destinos]
+    disperso = _como_disperso(grafo)
+    filas = _ids(disperso, origenes) if origenes is not None else None
+    matriz = csgraph.dijkstra(disperso.pesos, directed=True, indices=filas, unweighted=not ponderado)
+    if matriz.ndim == 1:
+        matriz = matriz[np.newaxis, :]
+    
+    nombres_filas = list(origenes) if origenes is not None else list(disperso.nombres)
+    if destinos is None:
+        return matriz, nombres_filas, list(disperso.nombres)
+    return matriz[:, _ids(disperso, destinos)], nombres_filas, list(destinos)
+
+# Variantes vectorizadas con el mismo formato de resultado que ALGORITMOS
+ALGORITMOS_DISPERSOS = {
+    'amplitud': busqueda_amplitud_dispersa,
+    'costo_uniforme': busqueda_costo_uniforme_dispersa
+}
@@ -0,0 +1,133 @@
+"""
+Generadores de grafos sintéticos para los benchmarks
+Todos son deterministas dada la semilla y devuelven el mismo formato que
+leer_grafo: {nodo: {vecino: peso}} no dirigido, con nodos '0'..'n-1' y
+pesos float
+"""
+
+import math
+import random
+
+def _grafo_vacio(n):
+    """Diccionario con n nodos sin aristas (los aislados también aparecen)"""
+    return {str(i): {} for i in range(n)}
+
+def _conectar(grafo, a, b, peso):
+    """Agrega la arista no dirigida a-b"""
+    grafo[str(a)][str(b)] = peso
+    grafo[str(b)][str(a)] = peso
+
+def generar_rejilla(n, semilla=0, peso_max=10):
+    """
+    Rejilla cuadrada 4-conexa de aproximadamente n nodos
+    
+    Args:
+        n: número de nodos deseado (se usa lado = round(sqrt(n)))
+        peso_max: los pesos son enteros uniformes en [1, peso_max]
+    """
+    rng = random.Random(semilla)
+    lado = max(1, round(math.sqrt(n)))
+    grafo = _grafo_vacio(lado * lado)
+    
+    for fila in range(lado):
+        for columna in range(lado):
+            nodo = fila * lado + columna
+            if columna + 1 < lado:
+                _conectar(grafo, nodo, nodo + 1, float(rng.randint(1, peso_max)))
+            if fila + 1 < lado:
+                _conectar(grafo, nodo, nodo + lado, float(rng.randint(1, peso_max)))
+    return grafo
+
+def generar_geometrico(n, semilla=0, grado_medio=6):
+    """
+    Grafo geométrico aleatorio: n puntos en el cuadrado unitario unidos si
+    están a menos de r, con r elegido para el grado medio pedido
+    El peso es la distancia euclídea escalada por 100
+    
+    Los puntos se reparten en celdas de lado r, así que sólo se comparan
+    pares de celdas vecinas (O(n · grado) en lugar de O(n²))
+    """
+    rng = random.Random(semilla)
+    radio = math.sqrt(grado_medio / (math.pi * max(n, 1)))
+    puntos = [(rng.random(), rng.random()) for _ in range(n)]
+    grafo = _grafo_vacio(n)
+    
+    celdas = {}
+    for i, (x, y) in enumerate(puntos):
+        celdas.setdefault((int(x / radio), int(y / radio)), []).append(i)
+    
+    for (cx, cy), miembros in celdas.items():
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                otros = celdas.get((cx + dx, cy + dy))
+                if otros is None:
+                    continue
+                for i in miembros:
+                    xi, yi = puntos[i]
+                    for j in otros:
+                        # Cada par se visita desde las dos celdas: sólo se une una vez
+                        if j <= i:
+                            continue
+                        distancia = math.hypot(xi - puntos[j][0], yi - puntos[j][1])
+                        if distancia < radio:
+                            _conectar(grafo, i, j, round(distancia * 100, 3))
+    return grafo
+
+def generar_erdos_renyi(n, semilla=0, grado_medio=4, peso_max=10):
+    """
+    Grafo aleatorio de Erdős–Rényi G(n, m) con m = n · grado_medio / 2 aristas
+    Se sortean pares sin reemplazo, así que el costo es O(m) y no O(n²)
+    """
+    rng = random.Random(semilla)
+    grafo = _grafo_vacio(n)
+    m = min(int(n * grado_medio / 2), n * (n - 1) // 2)
+    aristas = set()
+    
+    while len(aristas) < m:
+        a, b = rng.randrange(n), rng.randrange(n)
+        if a == b:
+            continue
+        arista = (a, b) if a < b else (b, a)
+        if arista not in aristas:
+            aristas.add(arista)
+            _conectar(grafo, a, b, float(rng.randint(1, peso_max)))
+    return grafo
+
+def generar_libre_escala(n, semilla=0, m=2, peso_max=10):
+    """
+    Grafo libre de escala (Barabási–Albert): cada nodo nuevo se une a m nodos
+    elegidos con probabilidad proporcional a su grado
+    """
+    rng = random.Random(semilla)
+    grafo = _grafo_vacio(n)
+    # Cada nodo aparece una vez por arista incidente: elegir al azar de esta
+    # lista es elegir proporcional al grado
+    repetidos = []
+    iniciales = min(m, n)
+    
+    for nodo in range(1, iniciales):
+        _conectar(grafo, nodo - 1, nodo, float(rng.randint(1, peso_max)))
+        repetidos.extend((nodo - 1, nodo))
+    
+    for nodo in range(iniciales, n):
+        destinos = set()
+        while len(destinos) < m:
+            destinos.add(rng.choice(repetidos) if repetidos else rng.randrange(nodo))
+        for destino in destinos:
+            _conectar(grafo, nodo, destino, float(rng.randint(1, peso_max)))
+            repetidos.extend((nodo, destino))
+    return grafo
+
+# Familias disponibles por nombre: función (n, semilla) -> grafo
+FAMILIAS = {
+    'rejilla': generar_rejilla,
+    'geometrico': generar_geometrico,
+    'erdos_renyi': generar_erdos_renyi,
+    'libre_escala': generar_libre_escala
+}
+
+def generar_familia(familia, n, semilla=0):
+    """Genera un grafo de la familia indicada con aproximadamente n nodos"""
+    if familia not in FAMILIAS:
+        raise ValueError(f"Familia desconocida: {familia}")
+    return FAMILIAS[familia](n, semilla)
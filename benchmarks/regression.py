@@ -0,0 +1,363 @@
+"""
+Control de regresiones de rendimiento contra una línea base guardada
+Ejecuta una batería fija de grafos y consultas con todos los algoritmos y
+compara tiempos y expansiones con la línea base: una ralentización cuyo
+intervalo de confianza queda entero por encima de la tolerancia (y se repite
+al volver a medirla), o un aumento de expansiones, hace que el proceso
+termine con código 1
+
+Uso desde consola:
+    python -m benchmarks.regression --actualizar     # regenera la línea base
+    python -m benchmarks.regression                  # compara; código 1 si hay regresión
+    python -m benchmarks.regression --actual bench.json   # compara un resultado ya medido
+
+La línea base (benchmarks/linea_base.json) no está en el repositorio porque
+depende de la máquina: la primera vez hay que crearla con --actualizar sobre
+la versión de referencia; si falta, el control termina con código 3
+
+Los tiempos sólo son comparables en la misma máquina: la línea base se
+regenera en cada máquina que hace de control. Entre dos ejecuciones toda la
+máquina suele ir algo más rápida o más lenta (en máquinas virtuales
+compartidas, a veces más que la tolerancia); con --normalizar cada medición se
+compara relativa a la deriva global. No es el modo por defecto porque una
+ralentización del código común a todas las búsquedas (_preparar, la frontera,
+@instrumentable) movería la deriva y no a las mediciones; por eso, al
+normalizar, una deriva cuyo intervalo queda entero por encima de la
+tolerancia también es regresión
+"""
+
+import sys
+import json
+import random
+import argparse
+import statistics
+import multiprocessing
+
+from benchmarks.runner import TODOS_LOS_ALGORITMOS, ejecutar_benchmark, metadatos, guardar_json
+
+# Batería fija: (familia, nodos); pequeña para que el control tarde poco
+BATERIA = [
+    ('rejilla', 400),
+    ('geometrico', 1000),
+    ('erdos_renyi', 1000),
+    ('libre_escala', 1000)
+]
+CONSULTAS = 2
+SEMILLA = 0
+
+LINEA_BASE_POR_DEFECTO = 'benchmarks/linea_base.json'
+
+# Ralentización relativa admitida por defecto (0.20 = 20 %)
+TOLERANCIA_POR_DEFECTO = 0.20
+
+# Código de salida cuando no hay línea base con la que comparar
+CODIGO_SIN_LINEA_BASE = 3
+
+# Campos del entorno que, si cambian, hacen poco comparables los tiempos
+CAMPOS_ENTORNO = ('python', 'implementacion', 'plataforma', 'procesador')
+
+def _medir_en_proceso(argumentos):
+    """Mide la batería completa dentro de un proceso trabajador"""
+    algoritmos, repeticiones, calentamiento, tiempo_max, duracion_minima = argumentos
+    filas = []
+    for familia, tamano in BATERIA:
+        filas.extend(ejecutar_benchmark([familia], [tamano], algoritmos, repeticiones, calentamiento,
+                                        CONSULTAS, SEMILLA, tiempo_max=tiempo_max, memoria=False,
+                                        duracion_minima=duracion_minima))
+    return filas
+
+def _unir_procesos(mediciones):
+    """
+    Junta las repeticiones de cada medición de varios procesos y recalcula sus
+    estadísticas; 'tiempos_procesos' conserva las de cada proceso por separado
+    """
+    filas = {}
+    for filas_proceso in mediciones:
+        for fila in filas_proceso:
+            clave = _clave(fila)
+            if clave in filas:
+                filas[clave]['tiempos'].extend(fila['tiempos'])
+                filas[clave]['tiempos_procesos'].append(list(fila['tiempos']))
+            else:
+                filas[clave] = dict(fila, tiempos=list(fila['tiempos']), tiempos_procesos=[list(fila['tiempos'])])
+    
+    for fila in filas.values():
+        tiempos = fila['tiempos']
+        fila['repeticiones'] = len(tiempos)
+        fila['tiempo_min'] = min(tiempos)
+        fila['tiempo_mediana'] = statistics.median(tiempos)
+        fila['tiempo_media'] = statistics.mean(tiempos)
+        fila['tiempo_desviacion'] = statistics.stdev(tiempos) if len(tiempos) > 1 else 0.0
+    return list(filas.values())
+
+def medir_bateria(algoritmos=None, repeticiones=5, calentamiento=2, tiempo_max=None, duracion_minima=0.005,
+                  procesos=3):
+    """
+    Mide la batería fija en `procesos` intérpretes nuevos, uno tras otro
+    
+    Cada intérprete tiene su propia semilla de hash y su propia disposición de
+    memoria, que cambian los tiempos de forma estable dentro de un proceso;
+    juntar las repeticiones de varios hace que el intervalo refleje ese ruido
+    
+    Returns:
+        dict: {'metadatos', 'resultados'} con el mismo formato que guarda runner
+    """
+    argumentos = (algoritmos, repeticiones, calentamiento, tiempo_max, duracion_minima)
+    contexto = multiprocessing.get_context('spawn')
+    with contexto.Pool(1, maxtasksperchild=1) as pool:
+        mediciones = pool.map(_medir_en_proceso, [argumentos] * procesos, chunksize=1)
+    
+    datos = metadatos(bateria=BATERIA, consultas=CONSULTAS, semilla=SEMILLA, repeticiones=repeticiones,
+                      calentamiento=calentamiento, tiempo_max=tiempo_max, duracion_minima=duracion_minima,
+                      procesos=procesos)
+    return {'metadatos': datos, 'resultados': _unir_procesos(mediciones)}
+
+def _clave(fila):
+    """Identifica una medición entre ejecuciones"""
+    return (fila['familia'], fila['nodos'], fila['consulta'], fila['algoritmo'])
+
+def _tiempos(fila):
+    """Repeticiones agrupadas por proceso (una sola muestra si la fila no las separa)"""
+    return fila.get('tiempos_procesos') or [fila['tiempos']]
+
+def _remuestrear(grupos, rng):
+    """
+    Bootstrap en dos niveles: se eligen procesos con reemplazo y dentro de
+    cada uno repeticiones con reemplazo, así el intervalo incluye la
+    variación entre procesos y no sólo la de las repeticiones de uno
+    """
+    muestra = []
+    for grupo in rng.choices(grupos, k=len(grupos)):
+        muestra.extend(rng.choices(grupo, k=len(grupo)))
+    return muestra
+
+def intervalo_razon_medianas(base, actual, confianza=0.95, remuestreos=2000, semilla=0):
+    """
+    Intervalo bootstrap de mediana(actual) / mediana(base)
+    
+    Args:
+        base, actual: repeticiones de cada lado, en una lista o agrupadas por
+            proceso (lista de listas, ver _remuestrear)
+    
+    Returns:
+        tuple: (razón de medianas, límite inferior, límite superior)
+    """
+    if base and not isinstance(base[0], list):
+        base = [base]
+    if actual and not isinstance(actual[0], list):
+        actual = [actual]
+    rng = random.Random(semilla)
+    razones = []
+    for _ in range(remuestreos):
+        mediana_base = statistics.median(_remuestrear(base, rng))
+        mediana_actual = statistics.median(_remuestrear(actual, rng))
+        if mediana_base > 0:
+            razones.append(mediana_actual / mediana_base)
+    mediana_base = statistics.median([tiempo for grupo in base for tiempo in grupo])
+    mediana_actual = statistics.median([tiempo for grupo in actual for tiempo in grupo])
+    razon = mediana_actual / mediana_base if mediana_base > 0 else 1.0
+    if not razones:
+        return razon, razon, razon
+    
+    razones.sort()
+    cola = (1 - confianza) / 2
+    inferior = razones[int(cola * (len(razones) - 1))]
+    superior = razones[int(round((1 - cola) * (len(razones) - 1)))]
+    return razon, inferior, superior
+
+def comparar(base, actual, tolerancia=TOLERANCIA_POR_DEFECTO, tolerancia_expansiones=0.0, confianza=0.95,
+             normalizar=False):
+    """
+    Compara dos ejecuciones de la batería
+    
+    Args:
+        base, actual: dicts {'metadatos', 'resultados'}
+        tolerancia: ralentización relativa admitida (0.20 = 20 %); sólo es
+            regresión si el límite inferior del intervalo la supera
+        tolerancia_expansiones: aumento relativo de expansiones admitido
+            (las búsquedas son deterministas, así que por defecto ninguno)
+        confianza: nivel del intervalo bootstrap
+        normalizar: divide las razones por la deriva global (mediana de
+            todas las razones): entre ejecuciones toda la máquina varía un
+            10-25 %, que sin normalizar puede aparecer como falsa regresión.
+            Como oculta cambios que afectan a todos los algoritmos por igual,
+            la deriva misma es regresión ('regresion_global') si su
+            intervalo queda entero por encima de la tolerancia
+    
+    Returns:
+        dict: 'regresiones', 'mejoras' y 'avisos' (listas de dicts por
+        medición), 'faltantes' (claves de la base sin medición actual) y
+        'deriva' (mediana de las razones de tiempo), 'intervalo_deriva' y
+        'regresion_global' (sólo al normalizar)
+    """
+    filas_base = {_clave(fila): fila for fila in base['resultados']}
+    filas_actual = {_clave(fila): fila for fila in actual['resultados']}
+    informe = {'regresiones': [], 'mejoras': [], 'avisos': [], 'faltantes': [], 'deriva': 1.0,
+               'intervalo_deriva': (1.0, 1.0), 'regresion_global': False}
+    
+    intervalos = {}
+    for clave, fila_base in filas_base.items():
+        if clave in filas_actual:
+            intervalos[clave] = intervalo_razon_medianas(_tiempos(fila_base), _tiempos(filas_actual[clave]),
+                                                         confianza)
+        else:
+            informe['faltantes'].append(clave)
+    if intervalos:
+        informe['deriva'] = statistics.median(razon for razon, _, _ in intervalos.values())
+        # La mediana es monótona: la de los límites acota la de las razones
+        informe['intervalo_deriva'] = (statistics.median(inferior for _, inferior, _ in intervalos.values()),
+                                       statistics.median(superior for _, _, superior in intervalos.values()))
+    factor = informe['deriva'] if normalizar else 1.0
+    informe['regresion_global'] = normalizar and informe['intervalo_deriva'][0] > 1 + tolerancia
+    
+    for clave, (razon, inferior, superior) in intervalos.items():
+        fila_base = filas_base[clave]
+        fila_actual = filas_actual[clave]
+        razon, inferior, superior = razon / factor, inferior / factor, superior / factor
+        entrada = {'clave': clave, 'razon': razon, 'intervalo': (inferior, superior),
+                   'expansiones_base': fila_base['nodos_expandidos'],
+                   'expansiones_actual': fila_actual['nodos_expandidos']}
+        
+        # Una ejecución cortada por tiempo no tiene expansiones comparables
+        completas = fila_base['motivo'] == 'completa' and fila_actual['motivo'] == 'completa'
+        limite_expansiones = fila_base['nodos_expandidos'] * (1 + tolerancia_expansiones)
+        
+        motivos = []
+        if inferior > 1 + tolerancia:
+            motivos.append('tiempo')
+        if completas and fila_actual['nodos_expandidos'] > limite_expansiones:
+            motivos.append('expansiones')
+        if fila_base['motivo'] == 'completa' and fila_actual['motivo'] != 'completa':
+            motivos.append(f"motivo {fila_actual['motivo']}")
+        
+        if motivos:
+            entrada['motivos'] = motivos
+            informe['regresiones'].append(entrada)
+        elif superior < 1 - tolerancia or fila_actual['nodos_expandidos'] < fila_base['nodos_expandidos']:
+            informe['mejoras'].append(entrada)
+        
+        if completas and fila_actual['costo'] != fila_base['costo']:
+            informe['avisos'].append({'clave': clave, 'mensaje': f"costo {fila_base['costo']} -> {fila_actual['costo']}"})
+    
+    entorno_base = base.get('metadatos', {})
+    entorno_actual = actual.get('metadatos', {})
+    for campo in CAMPOS_ENTORNO:
+        if entorno_base.get(campo) != entorno_actual.get(campo):
+            informe['avisos'].append({'clave': None, 'mensaje': f"{campo} distinto: {entorno_base.get(campo)} "
+                                                               f"-> {entorno_actual.get(campo)}"})
+    return informe
+
+def _describir(entrada):
+    """Línea legible de una medición comparada"""
+    familia, nodos, consulta, algoritmo = entrada['clave']
+    inferior, superior = entrada['intervalo']
+    texto = (f"{familia:>12} n={nodos:<6} q={consulta} {algoritmo:<30} "
+             f"x{entrada['razon']:.3f} [{inferior:.3f}, {superior:.3f}]  "
+             f"exp {entrada['expansiones_base']} -> {entrada['expansiones_actual']}")
+    if entrada.get('motivos'):
+        texto += "  (" + ", ".join(entrada['motivos']) + ")"
+    return texto
+
+def _cargar(ruta):
+    """Lee un JSON de resultados (línea base o medición guardada)"""
+    with open(ruta, 'r', encoding='utf-8') as archivo:
+        return json.load(archivo)
+
+def main(argv=None):
+    """CLI: compara con la línea base (código 1 si hay regresión) o la regenera"""
+    parser = argparse.ArgumentParser(description="Control de regresiones de rendimiento")
+    parser.add_argument('--linea-base', default=LINEA_BASE_POR_DEFECTO)
+    parser.add_argument('--actualizar', action='store_true',
+                        help="mide la batería y sobrescribe la línea base")
+    parser.add_argument('--actual', default=None,
+                        help="JSON de resultados ya medidos (si no, se mide la batería)")
+    parser.add_argument('--guardar', default=None, help="guarda también la medición actual en este JSON")
+    parser.add_argument('--algoritmos', nargs='+', default=None, choices=TODOS_LOS_ALGORITMOS)
+    parser.add_argument('--repeticiones', type=int, default=5, help="repeticiones por proceso")
+    parser.add_argument('--procesos', type=int, default=3, help="intérpretes que miden la batería")
+    parser.add_argument('--calentamiento', type=int, default=2)
+    parser.add_argument('--tiempo-max', type=float, default=None)
+    parser.add_argument('--duracion-minima', type=float, default=0.005,
+                        help="segundos mínimos por muestra (encadena llamadas cortas)")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA_POR_DEFECTO,
+                        help="ralentización relativa admitida (0.20 = 20 %%)")
+    parser.add_argument('--tolerancia-expansiones', type=float, default=0.0)
+    parser.add_argument('--confianza', type=float, default=0.95)
+    parser.add_argument('--normalizar', action='store_true',
+                        help="compara cada medición relativa a la deriva global (la deriva sigue "
+                             "contando como regresión si supera la tolerancia)")
+    parser.add_argument('--confirmaciones', type=int, default=1,
+                        help="veces que se vuelven a medir las regresiones sólo de tiempo antes de darlas por buenas")
+    args = parser.parse_args(argv)
+    
+    # Sin línea base no hay nada que comparar: se avisa antes de medir
+    if not args.actualizar:
+        try:
+            base = _cargar(args.linea_base)
+        except FileNotFoundError:
+            print(f"No existe la línea base {args.linea_base}: ejecuta primero "
+                  f"'python -m benchmarks.regression --actualizar' para crearla", file=sys.stderr)
+            return CODIGO_SIN_LINEA_BASE
+    
+    if args.actual is not None:
+        actual = _cargar(args.actual)
+    else:
+        actual = medir_bateria(args.algoritmos, args.repeticiones, args.calentamiento, args.tiempo_max,
+                               args.duracion_minima, args.procesos)
+    
+    if args.actualizar:
+        guardar_json(args.linea_base, actual['resultados'], actual['metadatos'])
+        print(f"Línea base actualizada: {args.linea_base} ({len(actual['resultados'])} mediciones)")
+        return 0
+    if args.guardar:
+        guardar_json(args.guardar, actual['resultados'], actual['metadatos'])
+    
+    if args.algoritmos:
+        base['resultados'] = [fila for fila in base['resultados'] if fila['algoritmo'] in args.algoritmos]
+    informe = comparar(base, actual, args.tolerancia, args.tolerancia_expansiones, args.confianza,
+                       args.normalizar)
+    
+    # Una ralentización sólo de tiempo puede ser ruido de esa ejecución: se
+    # vuelve a medir la batería en procesos nuevos y sólo cuenta si se repite
+    # (medir sólo los algoritmos sospechosos no sirve: aislados van más rápido)
+    informe['no_confirmadas'] = []
+    for _ in range(args.confirmaciones if args.actual is None else 0):
+        sospechosas = {entrada['clave'] for entrada in informe['regresiones'] if entrada['motivos'] == ['tiempo']}
+        if not sospechosas and not informe['regresion_global']:
+            break
+        repeticion = medir_bateria(args.algoritmos, args.repeticiones, args.calentamiento, args.tiempo_max,
+                                   args.duracion_minima, args.procesos)
+        informe_repeticion = comparar(base, repeticion, args.tolerancia, args.tolerancia_expansiones,
+                                      args.confianza, args.normalizar)
+        informe['regresion_global'] = informe['regresion_global'] and informe_repeticion['regresion_global']
+        confirmadas = {entrada['clave'] for entrada in informe_repeticion['regresiones']
+                       if 'tiempo' in entrada['motivos']}
+        descartadas = sospechosas - confirmadas
+        informe['no_confirmadas'].extend(entrada for entrada in informe['regresiones']
+                                         if entrada['clave'] in descartadas)
+        informe['regresiones'] = [entrada for entrada in informe['regresiones']
+                                  if entrada['clave'] not in descartadas]
+    
+    for aviso in informe['avisos']:
+        print(f"AVISO    {aviso['mensaje']}" if aviso['clave'] is None else
+              f"AVISO    {' '.join(map(str, aviso['clave']))}: {aviso['mensaje']}")
+    for clave in informe['faltantes']:
+        print(f"FALTA    {' '.join(map(str, clave))}")
+    for entrada in informe['mejoras']:
+        print(f"MEJORA   {_describir(entrada)}")
+    for entrada in informe['no_confirmadas']:
+        print(f"RUIDO    {_describir(entrada)}")
+    for entrada in informe['regresiones']:
+        print(f"REGRESIÓN {_describir(entrada)}")
+    
+    inferior, superior = informe['intervalo_deriva']
+    print(f"Deriva global x{informe['deriva']:.3f} [{inferior:.3f}, {superior:.3f}]" +
+          (" (normalizada)" if args.normalizar else ""))
+    if informe['regresion_global']:
+        print(f"REGRESIÓN deriva global por encima de la tolerancia ({args.tolerancia:.0%})")
+    print(f"{len(informe['regresiones'])} regresiones, {len(informe['mejoras'])} mejoras, "
+          f"{len(base['resultados'])} mediciones comparadas")
+    return 1 if informe['regresiones'] or informe['regresion_global'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,399 @@
+"""
+Benchmark de los algoritmos de búsqueda sobre familias de grafos sintéticos
+Cada algoritmo se mide con perf_counter (calentamiento + repeticiones) y en
+una ejecución aparte con tracemalloc para el pico de memoria, así el costo de
+trazar las asignaciones no contamina los tiempos
+
+Uso desde consola:
+    python -m benchmarks.runner --familias rejilla erdos_renyi --tamanos 100 10000 \\
+        --repeticiones 5 --salida resultados/bench
+    (escribe resultados/bench.json y resultados/bench.csv)
+    
+    python -m benchmarks.runner --familias rejilla --tamanos 10000 250000 \\
+        --algoritmos costo_uniforme --comparar-heap --sin-memoria
+    (costo uniforme con la cola de cubetas frente al heap en rejillas grandes)
+
+Además de ALGORITMOS se miden las búsquedas de ALGORITMOS_EXTRA (jerarquía de
+contracción, costo uniforme con caché de árboles, k caminos más cortos y, si
+numpy y scipy están instalados, el motor disperso). Cada una prepara su
+estructura una vez por grafo, fuera de los tiempos de consulta, y el costo de
+prepararla queda en la columna 'tiempo_preparacion'
+"""
+
+import os
+import gc
+import csv
+import copy
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import statistics
+import tracemalloc
+from collections import deque
+
+from algorithms.search_algorithms import ALGORITMOS, ALGORITMOS_INFORMADOS
+from algorithms.landmarks import generar_heuristica_landmarks
+from algorithms.budget import Presupuesto
+from algorithms.contraction_hierarchy import construir_jerarquia, busqueda_contraction_hierarchy
+from algorithms.path_tree_cache import CacheArbolesCaminos, busqueda_costo_uniforme_cacheada
+from algorithms.k_shortest import k_caminos_mas_cortos
+from algorithms import sparse_engine
+from benchmarks.graph_generators import FAMILIAS, generar_familia
+from utils.graph_utils import compilar_grafo, generar_heuristica
+
+# Argumentos que algunos algoritmos necesitan para ser comparables y repetibles
+PARAMETROS_POR_DEFECTO = {
+    'profundidad_limitada': {'limite': 50},
+    'random_restart_hill_climbing': {'semilla': 0},
+    'simulated_annealing': {'semilla': 0},
+    'k_caminos': {'k': 3}
+}
+
+# Algoritmos que cambian el heap por la cola de cubetas con pesos enteros pequeños
+ALGORITMOS_CUBETAS = {'costo_uniforme'}
+
+def _preparar_contraction_hierarchy(compilado):
+    """Construye la jerarquía; las consultas sólo la recorren"""
+    jerarquia = construir_jerarquia(compilado)
+    return lambda nodo_ini, nodo_fin: busqueda_contraction_hierarchy(jerarquia, nodo_ini, nodo_fin)
+
+def _preparar_costo_uniforme_cacheada(compilado):
+    """Caché propia del grafo: el calentamiento construye el árbol y las repeticiones miden aciertos"""
+    cache = CacheArbolesCaminos()
+    return lambda nodo_ini, nodo_fin: busqueda_costo_uniforme_cacheada(compilado, nodo_ini, nodo_fin, cache)
+
+def _preparar_k_caminos(compilado):
+    """Caché de árboles nueva en cada ejecución: cada una paga los árboles que usa"""
+    return lambda nodo_ini, nodo_fin, **params: k_caminos_mas_cortos(compilado, nodo_ini, nodo_fin,
+                                                                      cache=CacheArbolesCaminos(), **params)
+
+def _preparar_dispersa(funcion):
+    """Convierte el grafo a matrices de scipy una vez; la consulta no las reconstruye"""
+    def preparar(compilado):
+        disperso = sparse_engine.GrafoDisperso(compilado)
+        return lambda nodo_ini, nodo_fin: funcion(disperso, nodo_ini, nodo_fin)
+    return preparar
+
+# Búsquedas fuera de ALGORITMOS: nombre -> preparar(compilado), que devuelve
+# la consulta (nodo_ini, nodo_fin, **params)
+ALGORITMOS_EXTRA = {
+    'contraction_hierarchy': _preparar_contraction_hierarchy,
+    'costo_uniforme_cacheada': _preparar_costo_uniforme_cacheada,
+    'k_caminos': _preparar_k_caminos
+}
+if sparse_engine.DISPONIBLE:
+    ALGORITMOS_EXTRA.update({
+        f'{nombre}_dispersa': _preparar_dispersa(funcion)
+        for nombre, funcion in sparse_engine.ALGORITMOS_DISPERSOS.items()
+    })
+
+# Extras que aceptan presupuesto (las demás ignoran tiempo_max)
+EXTRA_CON_PRESUPUESTO = {'k_caminos'}
+
+# Nombres válidos para --algoritmos, en el orden de medición
+TODOS_LOS_ALGORITMOS = list(ALGORITMOS) + list(ALGORITMOS_EXTRA)
+
+# Columnas del CSV, en orden
+COLUMNAS = [
+    'familia', 'nodos', 'aristas', 'semilla', 'consulta', 'nodo_ini', 'nodo_fin', 'algoritmo', 'cubetas',
+    'repeticiones', 'tiempo_min', 'tiempo_mediana', 'tiempo_media', 'tiempo_desviacion',
+    'nodos_expandidos', 'costo', 'exito', 'motivo', 'memoria_pico', 'tiempo_preparacion'
+]
+
+def elegir_consultas(grafo, cantidad, semilla=0):
+    """
+    Elige pares (nodo_ini, nodo_fin) conectados entre sí
+    El destino se sortea dentro de la componente del origen (los grafos
+    aleatorios pueden no ser conexos)
+    
+    Returns:
+        list: hasta `cantidad` pares de nombres de nodo
+    """
+    rng = random.Random(semilla)
+    nodos = list(grafo)
+    consultas = []
+    intentos = 0
+    
+    while len(consultas) < cantidad and intentos < 20 * cantidad:
+        intentos += 1
+        nodo_ini = rng.choice(nodos)
+        visitados = {nodo_ini}
+        cola = deque([nodo_ini])
+        while cola:
+            for vecino in grafo[cola.popleft()]:
+                if vecino not in visitados:
+                    visitados.add(vecino)
+                    cola.append(vecino)
+        if len(visitados) < 2:
+            continue
+        visitados.discard(nodo_ini)
+        # sorted: el orden de un set de str cambia entre procesos (hash aleatorio)
+        consultas.append((nodo_ini, rng.choice(sorted(visitados))))
+    return consultas
+
+def medir_tiempos(funcion, repeticiones=5, calentamiento=1, duracion_minima=0.0):
+    """
+    Mide una función sin argumentos como timeit: el recolector de basura se
+    desactiva durante las repeticiones medidas
+    
+    Args:
+        duracion_minima: segundos mínimos por muestra; si una llamada dura
+            menos, cada muestra encadena varias llamadas y se divide (los
+            tiempos de microsegundos son casi todo ruido)
+    
+    Returns:
+        tuple: (lista de segundos por llamada en cada repetición, resultado de la última)
+    """
+    resultado = None
+    for _ in range(calentamiento):
+        resultado = funcion()
+    
+    llamadas = 1
+    if duracion_minima > 0:
+        tiempo_inicio = time.perf_counter()
+        resultado = funcion()
+        duracion = time.perf_counter() - tiempo_inicio
+        if duracion < duracion_minima:
+            llamadas = min(int(duracion_minima / max(duracion, 1e-7)) + 1, 10000)
+    
+    tiempos = []
+    gc.collect()
+    gc_activo = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeticiones):
+            tiempo_inicio = time.perf_counter()
+            for _ in range(llamadas):
+                resultado = funcion()
+            tiempos.append((time.perf_counter() - tiempo_inicio) / llamadas)
+    finally:
+        if gc_activo:
+            gc.enable()
+    return tiempos, resultado
+
+def medir_memoria(funcion):
+    """Pico de memoria (bytes) asignada durante una llamada, según tracemalloc"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcion()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return pico
+
+def _preparar_llamada(grafo, algoritmo, nodo_ini, nodo_fin, heuristica, tiempo_max):
+    """Función sin argumentos que ejecuta una consulta con presupuesto nuevo en cada llamada"""
+    params = PARAMETROS_POR_DEFECTO.get(algoritmo, {})
+    if algoritmo in ALGORITMOS_EXTRA:
+        # grafo es la consulta que devolvió preparar_extra
+        funcion = grafo
+        args = (nodo_ini, nodo_fin)
+        if algoritmo not in EXTRA_CON_PRESUPUESTO:
+            tiempo_max = None
+    else:
+        funcion = ALGORITMOS[algoritmo]
+        args = (grafo, nodo_ini, nodo_fin, heuristica) if algoritmo in ALGORITMOS_INFORMADOS else (grafo, nodo_ini, nodo_fin)
+    
+    if tiempo_max is None:
+        return lambda: funcion(*args, **params)
+    # El presupuesto guarda el reloj de su búsqueda: uno por ejecución
+    return lambda: funcion(*args, presupuesto=Presupuesto(tiempo_max=tiempo_max), **params)
+
+def _obtener_heuristica(tipo, grafo, nodo_fin, cache):
+    """Heurística de los algoritmos informados: 'landmarks', 'aleatoria' o 'cero'"""
+    if tipo == 'landmarks':
+        # Sirve para cualquier objetivo: una vez por grafo
+        if 'landmarks' not in cache:
+            cache['landmarks'] = generar_heuristica_landmarks(grafo)
+        return cache['landmarks']
+    if tipo == 'aleatoria':
+        return generar_heuristica(grafo, nodo_fin)
+    if tipo == 'cero':
+        return {}
+    raise ValueError(f"Heurística desconocida: {tipo}")
+
+def preparar_extra(algoritmo, compilado, cache):
+    """
+    Consulta de una búsqueda de ALGORITMOS_EXTRA, preparada una vez por grafo
+    
+    Returns:
+        tuple: (consulta, segundos de preparación; 0.0 si ya estaba en cache)
+    """
+    if algoritmo in cache:
+        return cache[algoritmo], 0.0
+    tiempo_inicio = time.perf_counter()
+    cache[algoritmo] = ALGORITMOS_EXTRA[algoritmo](compilado)
+    return cache[algoritmo], time.perf_counter() - tiempo_inicio
+
+def medir_consulta(grafo, algoritmo, nodo_ini, nodo_fin, heuristica=None, repeticiones=5, calentamiento=1,
+                   tiempo_max=None, memoria=True, duracion_minima=0.0):
+    """
+    Mide un algoritmo sobre una consulta
+    
+    Args:
+        grafo: diccionario con el grafo o GrafoCompilado; para ALGORITMOS_EXTRA,
+            la consulta de preparar_extra
+        heuristica: la de los algoritmos informados (los demás la ignoran)
+        tiempo_max: segundos máximos por ejecución (Presupuesto); una
+            ejecución cortada queda con motivo 'tiempo'
+        memoria: si False no se hace la ejecución con tracemalloc
+        duracion_minima: segundos mínimos por muestra (ver medir_tiempos)
+    
+    Returns:
+        dict: tiempos (min, mediana, media, desviación), expansiones, costo,
+        éxito, motivo y pico de memoria de la consulta
+    """
+    llamada = _preparar_llamada(grafo, algoritmo, nodo_ini, nodo_fin, heuristica, tiempo_max)
+    tiempos, resultado = medir_tiempos(llamada, repeticiones, calentamiento, duracion_minima)
+    
+    return {
+        'algoritmo': algoritmo,
+        'repeticiones': len(tiempos),
+        'tiempos': tiempos,
+        'tiempo_min': min(tiempos),
+        'tiempo_mediana': statistics.median(tiempos),
+        'tiempo_media': statistics.mean(tiempos),
+        'tiempo_desviacion': statistics.stdev(tiempos) if len(tiempos) > 1 else 0.0,
+        'nodos_expandidos': resultado.get('nodos_expandidos', 0),
+        'costo': resultado.get('costo', 0),
+        'exito': resultado.get('exito', False),
+        'motivo': resultado.get('motivo', 'completa'),
+        'memoria_pico': medir_memoria(llamada) if memoria else None
+    }
+
+def ejecutar_benchmark(familias, tamanos, algoritmos=None, repeticiones=5, calentamiento=1, consultas=3,
+                       semilla=0, heuristica='landmarks', tiempo_max=None, memoria=True, al_progreso=None,
+                       duracion_minima=0.0, comparar_heap=False):
+    """
+    Ejecuta todos los algoritmos sobre cada familia y tamaño
+    
+    Args:
+        familias: nombres de FAMILIAS
+        tamanos: números de nodos (aproximados en la rejilla)
+        algoritmos: nombres de TODOS_LOS_ALGORITMOS (por defecto, todos)
+        consultas: pares origen-destino por grafo
+        semilla: fija los grafos y las consultas
+        heuristica: 'landmarks', 'aleatoria' o 'cero'
+        al_progreso: función opcional (fila) llamada tras cada medición
+        duracion_minima: segundos mínimos por muestra (ver medir_tiempos)
+        comparar_heap: en los grafos con pesos enteros pequeños, mide además
+            los ALGORITMOS_CUBETAS con el heap (fila con 'cubetas' en False)
+    
+    Returns:
+        list: una fila (dict con las claves de COLUMNAS) por familia, tamaño,
+        consulta y algoritmo
+    """
+    algoritmos = list(algoritmos or TODOS_LOS_ALGORITMOS)
+    for algoritmo in algoritmos:
+        if algoritmo not in ALGORITMOS and algoritmo not in ALGORITMOS_EXTRA:
+            raise ValueError(f"Algoritmo desconocido: {algoritmo}")
+    
+    filas = []
+    for familia in familias:
+        for tamano in tamanos:
+            grafo = generar_familia(familia, tamano, semilla)
+            compilado = compilar_grafo(grafo)
+            aristas = sum(len(vecinos) for vecinos in grafo.values()) // 2
+            pares = elegir_consultas(grafo, consultas, semilla)
+            del grafo
+            heuristicas = {}
+            preparadas = {}
+            con_cubetas = compilado.peso_entero_max is not None
+            variantes = [(compilado, con_cubetas)]
+            if comparar_heap and con_cubetas:
+                # Mismos arreglos, sin la marca de pesos enteros: costo uniforme vuelve al heap
+                sin_cubetas = copy.copy(compilado)
+                sin_cubetas.peso_entero_max = None
+                variantes.append((sin_cubetas, False))
+            
+            for indice, (nodo_ini, nodo_fin) in enumerate(pares):
+                h = _obtener_heuristica(heuristica, compilado, nodo_fin, heuristicas)
+                for algoritmo in algoritmos:
+                    for variante, cubetas in variantes:
+                        if variante is not compilado and algoritmo not in ALGORITMOS_CUBETAS:
+                            continue
+                        preparacion = None
+                        if algoritmo in ALGORITMOS_EXTRA:
+                            variante, preparacion = preparar_extra(algoritmo, compilado, preparadas)
+                        medicion = medir_consulta(variante, algoritmo, nodo_ini, nodo_fin, h, repeticiones,
+                                                  calentamiento, tiempo_max, memoria, duracion_minima)
+                        fila = {'familia': familia, 'nodos': len(compilado), 'aristas': aristas,
+                                'semilla': semilla, 'consulta': indice, 'nodo_ini': nodo_ini,
+                                'nodo_fin': nodo_fin, 'cubetas': cubetas and algoritmo in ALGORITMOS_CUBETAS,
+                                'tiempo_preparacion': preparacion}
+                        fila.update(medicion)
+                        filas.append(fila)
+                        if al_progreso is not None:
+                            al_progreso(fila)
+    return filas
+
+def metadatos(**parametros):
+    """Entorno de la ejecución, para comparar resultados entre versiones y máquinas"""
+    return {
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'implementacion': platform.python_implementation(),
+        'plataforma': platform.platform(),
+        'procesador': platform.processor() or platform.machine(),
+        'parametros': parametros
+    }
+
+def guardar_json(ruta, filas, datos=None):
+    """Escribe {'metadatos', 'resultados'} con los tiempos de cada repetición"""
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump({'metadatos': datos or {}, 'resultados': filas}, archivo, ensure_ascii=False, indent=2)
+
+def guardar_csv(ruta, filas):
+    """Escribe una fila por medición con las columnas de COLUMNAS"""
+    with open(ruta, 'w', encoding='utf-8', newline='') as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=COLUMNAS, extrasaction='ignore')
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+def main(argv=None):
+    """CLI: mide los algoritmos y escribe <salida>.json y <salida>.csv"""
+    parser = argparse.ArgumentParser(description="Benchmark de los algoritmos sobre grafos sintéticos")
+    parser.add_argument('--familias', nargs='+', default=list(FAMILIAS), choices=list(FAMILIAS))
+    parser.add_argument('--tamanos', nargs='+', type=int, default=[100, 1000, 10000],
+                        help="nodos por grafo (de 1e2 a 1e6)")
+    parser.add_argument('--algoritmos', nargs='+', default=None, choices=TODOS_LOS_ALGORITMOS,
+                        help="por defecto, todos")
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--calentamiento', type=int, default=1)
+    parser.add_argument('--consultas', type=int, default=3, help="pares origen-destino por grafo")
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--heuristica', default='landmarks', choices=['landmarks', 'aleatoria', 'cero'])
+    parser.add_argument('--tiempo-max', type=float, default=None,
+                        help="segundos máximos por ejecución (las cortadas quedan con motivo 'tiempo')")
+    parser.add_argument('--duracion-minima', type=float, default=0.0,
+                        help="segundos mínimos por muestra (encadena llamadas cortas)")
+    parser.add_argument('--sin-memoria', action='store_true', help="omite la ejecución con tracemalloc")
+    parser.add_argument('--comparar-heap', action='store_true',
+                        help="con pesos enteros pequeños, mide también costo uniforme con el heap")
+    parser.add_argument('--salida', default='benchmark', help="ruta sin extensión de los resultados")
+    args = parser.parse_args(argv)
+    
+    def mostrar_progreso(fila):
+        algoritmo = fila['algoritmo'] + (' [cubetas]' if fila['cubetas'] else '')
+        sys.stderr.write(f"{fila['familia']:>12} n={fila['nodos']:<8} q={fila['consulta']} "
+                         f"{algoritmo:<30} {fila['tiempo_mediana'] * 1000:10.3f} ms "
+                         f"{fila['nodos_expandidos']:>9} exp  {fila['motivo']}\n")
+    
+    filas = ejecutar_benchmark(args.familias, args.tamanos, args.algoritmos, args.repeticiones,
+                               args.calentamiento, args.consultas, args.semilla, args.heuristica,
+                               args.tiempo_max, not args.sin_memoria, mostrar_progreso,
+                               args.duracion_minima, args.comparar_heap)
+    
+    directorio = os.path.dirname(args.salida)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    datos = metadatos(**{k: v for k, v in vars(args).items() if k != 'salida'})
+    guardar_json(args.salida + '.json', filas, datos)
+    guardar_csv(args.salida + '.csv', filas)
+
+if __name__ == "__main__":
+    main()
@@ -10,8 +10,16 @@ import networkx as nx
 
 from config.styles import COLORS, FONTS
 from gui.widgets import RoundedButton, StyledEntry, StyledCombobox, CardFrame, StatusLabel
-from utils.graph_utils import leer_grafo, generar_heuristica, validar_grafo, obtener_estadisticas_grafo
+from utils.graph_utils import leer_grafo, compilar_grafo, generar_heuristica, validar_grafo, obtener_estadisticas_grafo
 from algorithms.search_algorithms import *
+from algorithms.path_tree_cache import busqueda_costo_uniforme_cacheada
+from algorithms.landmarks import generar_heuristica_landmarks
+from algorithms.contraction_hierarchy import cargar_o_construir_jerarquia, busqueda_contraction_hierarchy
+from algorithms.portfolio import carrera_portafolio
+from algorithms.k_shortest import k_caminos_mas_cortos
+from algorithms.instrumentation import Instrumentacion
+from algorithms.budget import Presupuesto, MOTIVO_COMPLETA
+from algorithms.result_cache import CacheResultados
 from gui.visualization import VisualizadorGrafo
 
 class InterfazBusquedasIA:
@@ -26,8 +34,14 @@ class InterfazBusquedasIA:
         
         # Variables principales
         self.grafo = None
+        self.grafo_compilado = None  # Grafo CSR con IDs enteros para los algoritmos
         self.heuristica = None
+        self.heuristica_landmarks = None  # ALT: se precalcula una vez por grafo
+        self.jerarquia = None  # CH: se construye (o carga de disco) al primer uso
+        self.ruta_grafo = None
         self.G = None  # Grafo de NetworkX para visualización
+        # Resultados por (huella del grafo, algoritmo, nodos, heurística, parámetros)
+        self.cache_resultados = CacheResultados()
         
         # Configurar la interfaz
         self._configurar_estilos()
@@ -145,15 +159,22 @@ class InterfazBusquedasIA:
         self.combo_algoritmo.grid(row=0, column=1, pady=8, sticky='ew', padx=(10, 0))
         self.combo_algoritmo['values'] = [
             'Amplitud (BFS)',
+            'Amplitud Bidireccional',
             'Costo Uniforme (Dijkstra)',
+            'Costo Uniforme Bidireccional',
+            'Costo Uniforme (Árbol en caché)',
             'Profundidad (DFS)',
             'Profundidad Iterativa',
             'Profundidad con Límite',
             'Codicioso (Greedy)',
             'A*',
             'A* Ponderado',
+            'ARA* (Anytime)',
+            'IDA*',
             'Beam Search',
             'Branch and Bound',
+            'Contraction Hierarchies (CH)',
+            'K Caminos más Cortos (Yen)',
             'Hill Climbing',
             'Random Restart Hill Climbing',
             'Simulated Annealing'
@@ -171,9 +192,25 @@ class InterfazBusquedasIA:
         self.combo_nodo_objetivo = StyledCombobox(content, width=35, state='readonly')
         self.combo_nodo_objetivo.grid(row=2, column=1, pady=8, sticky='ew', padx=(10, 0))
         
+        # Heurística para las búsquedas informadas
+        self._crear_campo_config(content, "Heurística:", 3)
+        self.combo_heuristica = StyledCombobox(content, width=35, state='readonly')
+        self.combo_heuristica.grid(row=3, column=1, pady=8, sticky='ew', padx=(10, 0))
+        self.combo_heuristica['values'] = [
+            'Aleatoria',
+            'Landmarks (ALT)'
+        ]
+        self.combo_heuristica.current(0)
+        
+        # Límite de tiempo de cada búsqueda
+        self._crear_campo_config(content, "Tiempo máx (s):", 4)
+        self.entry_tiempo_max = StyledEntry(content, width=35)
+        self.entry_tiempo_max.insert(0, "10")
+        self.entry_tiempo_max.grid(row=4, column=1, pady=8, sticky='ew', padx=(10, 0))
+        
         # Frame para parámetros adicionales
         self.frame_parametros = tk.Frame(content, bg=COLORS['bg_medium'])
-        self.frame_parametros.grid(row=3, column=0, columnspan=2, pady=10, sticky='ew')
+        self.frame_parametros.grid(row=5, column=0, columnspan=2, pady=10, sticky='ew')
         
         content.columnconfigure(1, weight=1)
     
@@ -288,9 +325,15 @@ class InterfazBusquedasIA:
         elif algoritmo == 'A* Ponderado':
             self._crear_parametro_numero("Peso W:", "1.3", 'entry_peso')
             
+        elif algoritmo == 'ARA* (Anytime)':
+            self._crear_parametro_numero("W inicial:", "3.0", 'entry_peso_inicial')
+            
         elif algoritmo == 'Beam Search':
             self._crear_parametro_numero("Ancho haz:", "2", 'entry_ancho')
             
+        elif algoritmo == 'K Caminos más Cortos (Yen)':
+            self._crear_parametro_numero("K:", "3", 'entry_k')
+            
         elif algoritmo == 'Random Restart Hill Climbing':
             self._crear_parametro_numero("Reinicios:", "3", 'entry_reinicios')
             
@@ -336,6 +379,12 @@ class InterfazBusquedasIA:
                 messagebox.showerror("Error", f"Grafo inválido:\n{mensaje}")
                 return
             
+            # Compilar a CSR para las búsquedas
+            self.grafo_compilado = compilar_grafo(self.grafo)
+            self.heuristica_landmarks = None
+            self.jerarquia = None
+            self.ruta_grafo = archivo
+            
             # Obtener estadísticas
             stats = obtener_estadisticas_grafo(self.grafo)
             
@@ -426,7 +475,8 @@ class InterfazBusquedasIA:
         try:
             # Ejecutar algoritmo
             tiempo_inicio = time.time()
-            resultado = self._ejecutar_algoritmo(algoritmo, nodo_ini, nodo_fin)
+            presupuesto = Presupuesto(tiempo_max=self._validar_parametro_float('entry_tiempo_max', 'Tiempo máx'))
+            resultado = self._ejecutar_algoritmo(algoritmo, nodo_ini, nodo_fin, presupuesto)
             tiempo_fin = time.time()
             tiempo_ejecucion = tiempo_fin - tiempo_inicio
             
@@ -435,7 +485,8 @@ class InterfazBusquedasIA:
             
             # Actualizar visualización
             if resultado['exito']:
-                self.visualizador.dibujar_grafo(self.G, resultado['camino'])
+                alternativos = [c['camino'] for c in resultado.get('caminos', [])[1:]]
+                self.visualizador.dibujar_grafo(self.G, resultado['camino'], alternativos)
             
         except ValueError as e:
             messagebox.showerror("Error", f"Parámetro inválido:\n{str(e)}")
@@ -444,62 +495,126 @@ class InterfazBusquedasIA:
             messagebox.showerror("Error", f"Error al ejecutar:\n{str(e)}")
             self.text_resultados.insert(tk.END, f"\n Error: {str(e)}\n", 'fallo')
     
-    def _ejecutar_algoritmo(self, algoritmo, nodo_ini, nodo_fin):
-        """Ejecuta el algoritmo seleccionado y retorna el resultado"""
+    def _ejecutar_algoritmo(self, algoritmo, nodo_ini, nodo_fin, presupuesto=None):
+        """
+        Ejecuta el algoritmo seleccionado (a través de la caché de resultados)
+        El presupuesto no aplica a las consultas precalculadas (árbol en caché y CH)
+        """
         if algoritmo == 'Amplitud (BFS)':
-            return busqueda_amplitud(self.grafo, nodo_ini, nodo_fin)
+            return self._buscar('amplitud', nodo_ini, nodo_fin, presupuesto=presupuesto)
+        
+        elif algoritmo == 'Amplitud Bidireccional':
+            return self._buscar('amplitud_bidireccional', nodo_ini, nodo_fin, presupuesto=presupuesto)
         
         elif algoritmo == 'Costo Uniforme (Dijkstra)':
-            return busqueda_costo_uniforme(self.grafo, nodo_ini, nodo_fin)
+            return self._buscar('costo_uniforme', nodo_ini, nodo_fin, presupuesto=presupuesto)
+        
+        elif algoritmo == 'Costo Uniforme Bidireccional':
+            return self._buscar('costo_uniforme_bidireccional', nodo_ini, nodo_fin, presupuesto=presupuesto)
+        
+        elif algoritmo == 'Costo Uniforme (Árbol en caché)':
+            return busqueda_costo_uniforme_cacheada(self.grafo_compilado, nodo_ini, nodo_fin)
         
         elif algoritmo == 'Profundidad (DFS)':
-            return busqueda_profundidad(self.grafo, nodo_ini, nodo_fin)
+            return self._buscar('profundidad', nodo_ini, nodo_fin, presupuesto=presupuesto)
         
         elif algoritmo == 'Profundidad Iterativa':
-            return busqueda_profundidad_iterativa(self.grafo, nodo_ini, nodo_fin)
+            return self._buscar('profundidad_iterativa', nodo_ini, nodo_fin, presupuesto=presupuesto)
         
         elif algoritmo == 'Profundidad con Límite':
             limite = self._validar_parametro_int('entry_limite', 'Límite')
-            return busqueda_profundidad_limitada(self.grafo, nodo_ini, nodo_fin, limite)
+            return self._buscar('profundidad_limitada', nodo_ini, nodo_fin, limite=limite, presupuesto=presupuesto)
         
         elif algoritmo == 'Codicioso (Greedy)':
-            self.heuristica = generar_heuristica(self.grafo, nodo_fin)
-            return busqueda_codiciosa(self.grafo, nodo_ini, nodo_fin, self.heuristica)
+            self.heuristica = self._obtener_heuristica(nodo_fin)
+            return self._buscar('codiciosa', nodo_ini, nodo_fin, self.heuristica, presupuesto=presupuesto)
         
         elif algoritmo == 'A*':
-            self.heuristica = generar_heuristica(self.grafo, nodo_fin)
-            return busqueda_a_estrella(self.grafo, nodo_ini, nodo_fin, self.heuristica)
+            self.heuristica = self._obtener_heuristica(nodo_fin)
+            return self._buscar('a_estrella', nodo_ini, nodo_fin, self.heuristica, presupuesto=presupuesto)
         
         elif algoritmo == 'A* Ponderado':
             peso_w = self._validar_parametro_float('entry_peso', 'Peso W')
-            self.heuristica = generar_heuristica(self.grafo, nodo_fin)
-            return busqueda_a_estrella_ponderado(self.grafo, nodo_ini, nodo_fin, 
-                                                self.heuristica, peso_w)
+            self.heuristica = self._obtener_heuristica(nodo_fin)
+            return self._buscar('a_estrella_ponderado', nodo_ini, nodo_fin, self.heuristica, W=peso_w,
+                                presupuesto=presupuesto)
+        
+        elif algoritmo == 'ARA* (Anytime)':
+            peso_inicial = self._validar_parametro_float('entry_peso_inicial', 'W inicial')
+            self.heuristica = self._obtener_heuristica(nodo_fin)
+            # Anytime: no pasa por la caché (depende del reloj y debe mostrar cada mejora)
+            return busqueda_ara_estrella(self.grafo_compilado, nodo_ini, nodo_fin, self.heuristica,
+                                         W_inicial=peso_inicial, tiempo_max=5.0, al_mejorar=self._mostrar_mejora,
+                                         presupuesto=presupuesto)
+        
+        elif algoritmo == 'IDA*':
+            self.heuristica = self._obtener_heuristica(nodo_fin)
+            return self._buscar('ida_estrella', nodo_ini, nodo_fin, self.heuristica, presupuesto=presupuesto)
         
         elif algoritmo == 'Beam Search':
             ancho_haz = self._validar_parametro_int('entry_ancho', 'Ancho haz')
-            self.heuristica = generar_heuristica(self.grafo, nodo_fin)
-            return busqueda_beam(self.grafo, nodo_ini, nodo_fin, 
-                               self.heuristica, ancho_haz)
+            self.heuristica = self._obtener_heuristica(nodo_fin)
+            return self._buscar('beam', nodo_ini, nodo_fin, self.heuristica, ancho_haz=ancho_haz,
+                                presupuesto=presupuesto)
         
         elif algoritmo == 'Branch and Bound':
-            return busqueda_branch_and_bound(self.grafo, nodo_ini, nodo_fin)
+            return self._buscar('branch_and_bound', nodo_ini, nodo_fin, self._obtener_cota_inferior(),
+                                presupuesto=presupuesto)
+        
+        elif algoritmo == 'Contraction Hierarchies (CH)':
+            # El preprocesamiento se guarda junto al archivo del grafo
+            if self.jerarquia is None:
+                self.jerarquia = cargar_o_construir_jerarquia(self.grafo_compilado, self.ruta_grafo)
+            return busqueda_contraction_hierarchy(self.jerarquia, nodo_ini, nodo_fin)
+        
+        elif algoritmo == 'K Caminos más Cortos (Yen)':
+            # El árbol hacia el objetivo se reutiliza entre consultas (CACHE_ARBOLES)
+            k = self._validar_parametro_int('entry_k', 'K')
+            return k_caminos_mas_cortos(self.grafo_compilado, nodo_ini, nodo_fin, k=k, presupuesto=presupuesto)
         
         elif algoritmo == 'Hill Climbing':
-            self.heuristica = generar_heuristica(self.grafo, nodo_fin)
-            return busqueda_hill_climbing(self.grafo, nodo_ini, nodo_fin, self.heuristica)
+            self.heuristica = self._obtener_heuristica(nodo_fin)
+            return self._buscar('hill_climbing', nodo_ini, nodo_fin, self.heuristica, presupuesto=presupuesto)
         
         elif algoritmo == 'Random Restart Hill Climbing':
             max_reinicios = self._validar_parametro_int('entry_reinicios', 'Reinicios')
-            self.heuristica = generar_heuristica(self.grafo, nodo_fin)
-            return busqueda_random_restart_hill_climbing(self.grafo, nodo_ini, nodo_fin, 
-                                                        self.heuristica, max_reinicios)
+            self.heuristica = self._obtener_heuristica(nodo_fin)
+            return self._buscar('random_restart_hill_climbing', nodo_ini, nodo_fin, self.heuristica,
+                                max_reinicios=max_reinicios, presupuesto=presupuesto)
         
         elif algoritmo == 'Simulated Annealing':
             temperatura = self._validar_parametro_float('entry_temperatura', 'Temperatura')
-            self.heuristica = generar_heuristica(self.grafo, nodo_fin)
-            return busqueda_simulated_annealing(self.grafo, nodo_ini, nodo_fin, 
-                                              self.heuristica, temperatura)
+            self.heuristica = self._obtener_heuristica(nodo_fin)
+            return self._buscar('simulated_annealing', nodo_ini, nodo_fin, self.heuristica,
+                                temperatura_inicial=temperatura, presupuesto=presupuesto)
+    
+    def _buscar(self, algoritmo, nodo_ini, nodo_fin, heuristica=None, **params):
+        """Ejecuta ALGORITMOS[algoritmo] sobre el grafo cargado pasando por la caché de resultados"""
+        id_heuristica = None
+        if heuristica is not None:
+            # Los landmarks son uno por grafo y generar_heuristica es determinista por objetivo
+            id_heuristica = 'landmarks' if heuristica is self.heuristica_landmarks else ('aleatoria', nodo_fin)
+        return self.cache_resultados.ejecutar(self.grafo_compilado, algoritmo, nodo_ini, nodo_fin,
+                                              heuristica, id_heuristica, **params)
+    
+    def _obtener_heuristica(self, nodo_fin):
+        """Retorna la heurística elegida en la configuración"""
+        if self.combo_heuristica.get() == 'Landmarks (ALT)':
+            # Los landmarks sirven para cualquier objetivo: se calculan una vez por grafo
+            if self.heuristica_landmarks is None:
+                self.heuristica_landmarks = generar_heuristica_landmarks(self.grafo_compilado)
+            return self.heuristica_landmarks
+        
+        return generar_heuristica(self.grafo, nodo_fin)
+    
+    def _obtener_cota_inferior(self):
+        """
+        Heurística para las cotas de Branch and Bound: sólo la de landmarks es
+        admisible; con la aleatoria se usa h = 0 para no perder el óptimo
+        """
+        if self.combo_heuristica.get() == 'Landmarks (ALT)':
+            return self._obtener_heuristica(None)
+        return None
     
     def _validar_parametro_int(self, attr_name, nombre_param):
         """Valida y obtiene un parámetro entero"""
@@ -530,6 +645,14 @@ class InterfazBusquedasIA:
         self.text_resultados.insert(tk.END, f" Inicio: {nodo_ini}\n", 'info')
         self.text_resultados.insert(tk.END, f" Objetivo: {nodo_fin}\n\n", 'info')
     
+    def _mostrar_mejora(self, solucion):
+        """Muestra cada solución nueva de una búsqueda anytime mientras sigue mejorando"""
+        self.text_resultados.insert(tk.END,
+            f" W={solucion['W']:.2f} → costo {solucion['costo']:.2f} "
+            f"(≤ {solucion['cota_suboptimalidad']:.3f} × óptimo)\n", 'info')
+        self.visualizador.dibujar_grafo(self.G, solucion['camino'])
+        self.root.update()
+    
     def _mostrar_resultado(self, resultado, nodo_ini, nodo_fin, tiempo_ejecucion):
         """Muestra el resultado de la búsqueda"""
         self.text_resultados.insert(tk.END, "─" * 60 + "\n")
@@ -545,6 +668,23 @@ class InterfazBusquedasIA:
             self.text_resultados.insert(tk.END, f" Costo total: {resultado['costo']:.2f}\n", 'info')
             self.text_resultados.insert(tk.END, f" Nodos expandidos: {resultado['nodos_expandidos']}\n", 'info')
             self.text_resultados.insert(tk.END, f" Longitud del camino: {len(resultado['camino'])} nodos\n", 'info')
+            for i, alternativo in enumerate(resultado.get('caminos', [])[1:], start=2):
+                self.text_resultados.insert(tk.END, f"\n  Camino {i} (costo {alternativo['costo']:.2f}):\n", 'destacado')
+                self.text_resultados.insert(tk.END, " → ".join(alternativo['camino']) + "\n", 'camino')
+            self.text_resultados.insert(tk.END, f"  Tiempo de ejecución: {tiempo_ejecucion:.6f}s\n", 'info')
+            if resultado.get('desde_cache'):
+                self.text_resultados.insert(tk.END,
+                    f" Desde caché (la búsqueda original tardó {resultado['tiempo_calculo']:.6f}s)\n", 'info')
+            if resultado.get('motivo', MOTIVO_COMPLETA) != MOTIVO_COMPLETA:
+                self.text_resultados.insert(tk.END,
+                    f" Búsqueda interrumpida ({resultado['motivo']}): mejor camino hallado hasta el corte\n", 'fallo')
+        elif resultado.get('motivo', MOTIVO_COMPLETA) != MOTIVO_COMPLETA:
+            self.text_resultados.insert(tk.END, " BÚSQUEDA INTERRUMPIDA\n", 'fallo')
+            self.text_resultados.insert(tk.END, "─" * 60 + "\n\n")
+            self.text_resultados.insert(tk.END,
+                f"Se agotó el presupuesto ({resultado['motivo']}) antes de llegar a '{nodo_fin}'\n\n", 'info')
+            self.text_resultados.insert(tk.END,
+                f" Nodos expandidos: {resultado['nodos_expandidos']}\n", 'info')
             self.text_resultados.insert(tk.END, f"  Tiempo de ejecución: {tiempo_ejecucion:.6f}s\n", 'info')
         else:
             self.text_resultados.insert(tk.END, " NO SE ENCONTRÓ CAMINO\n", 'fallo')
@@ -582,7 +722,7 @@ class InterfazBusquedasIA:
         """Muestra el diálogo de selección de tipo de comparativa"""
         ventana = tk.Toplevel(self.root)
         ventana.title("Tipo de Comparación")
-        ventana.geometry("450x300")
+        ventana.geometry("450x380")
         ventana.configure(bg=COLORS['bg_dark'])
         ventana.transient(self.root)
         ventana.grab_set()
@@ -590,8 +730,8 @@ class InterfazBusquedasIA:
         # Centrar ventana
         ventana.update_idletasks()
         x = (ventana.winfo_screenwidth() // 2) - 225
-        y = (ventana.winfo_screenheight() // 2) - 150
-        ventana.geometry(f"450x300+{x}+{y}")
+        y = (ventana.winfo_screenheight() // 2) - 190
+        ventana.geometry(f"450x380+{x}+{y}")
         
         # Título
         tk.Label(ventana, text="Selecciona el tipo de búsquedas",
@@ -608,6 +748,10 @@ class InterfazBusquedasIA:
             ventana.destroy()
             self._ejecutar_comparacion(nodo_ini, nodo_fin, 'informadas')
         
+        def correr_portafolio():
+            ventana.destroy()
+            self._ejecutar_carrera(nodo_ini, nodo_fin)
+        
         RoundedButton(ventana,
                      text="🔍 Búsquedas NO Informadas",
                      command=comparar_no_informadas,
@@ -619,6 +763,12 @@ class InterfazBusquedasIA:
                      command=comparar_informadas,
                      bg_color=COLORS['accent_purple'],
                      width=350, height=55).pack(pady=10)
+        
+        RoundedButton(ventana,
+                     text="🏁 Carrera (primer óptimo)",
+                     command=correr_portafolio,
+                     bg_color=COLORS['accent_orange'],
+                     width=350, height=55).pack(pady=10)
     
     def _ejecutar_comparacion(self, nodo_ini, nodo_fin, tipo):
         """Ejecuta la comparación de algoritmos"""
@@ -631,10 +781,14 @@ class InterfazBusquedasIA:
         self.root.update()
         
         # Preparar algoritmos según el tipo
-        if tipo == 'no_informadas':
-            algoritmos = self._obtener_algoritmos_no_informados(nodo_ini, nodo_fin)
-        else:
-            algoritmos = self._obtener_algoritmos_informados(nodo_ini, nodo_fin)
+        try:
+            if tipo == 'no_informadas':
+                algoritmos = self._obtener_algoritmos_no_informados(nodo_ini, nodo_fin)
+            else:
+                algoritmos = self._obtener_algoritmos_informados(nodo_ini, nodo_fin)
+        except ValueError as e:
+            messagebox.showerror("Error", f"Parámetro inválido:\n{str(e)}")
+            return
         
         # Ejecutar todos los algoritmos
         resultados = []
@@ -643,10 +797,9 @@ class InterfazBusquedasIA:
             self.root.update()
             
             try:
-                tiempo_inicio = time.time()
-                resultado = funcion()
-                tiempo_fin = time.time()
-                tiempo = tiempo_fin - tiempo_inicio
+                resultado = funcion(Instrumentacion())
+                # Un acierto de la caché conserva el tiempo de la búsqueda original
+                tiempo = resultado['tiempo_calculo']
                 
                 resultados.append({
                     'nombre': nombre,
@@ -666,44 +819,137 @@ class InterfazBusquedasIA:
         # Mostrar resultados de la comparación
         self._mostrar_resultados_comparativa(resultados)
     
+    def _obtener_portafolio(self):
+        """Algoritmos de la carrera: (nombre visible, nombre registrado, parámetros)"""
+        return [
+            ('Costo Uniforme', 'costo_uniforme', {}),
+            ('Costo Uniforme Bidireccional', 'costo_uniforme_bidireccional', {}),
+            ('Branch & Bound', 'branch_and_bound', {}),
+            ('A*', 'a_estrella', {}),
+            ('IDA*', 'ida_estrella', {}),
+            ('Amplitud Bidireccional', 'amplitud_bidireccional', {}),
+            ('Codicioso (Greedy)', 'codiciosa', {}),
+            ('Beam Search', 'beam', {'ancho_haz': 2})
+        ]
+    
+    def _ejecutar_carrera(self, nodo_ini, nodo_fin):
+        """
+        Corre el portafolio en paralelo y muestra el primer resultado con óptimo
+        garantizado; A* e IDA* sólo cuentan con la heurística de landmarks
+        """
+        self.text_resultados.delete(1.0, tk.END)
+        self.text_resultados.insert(tk.END, "═" * 60 + "\n")
+        self.text_resultados.insert(tk.END, "MODO CARRERA\n", 'titulo')
+        self.text_resultados.insert(tk.END, "═" * 60 + "\n\n")
+        self.text_resultados.insert(tk.END, f"Carrera de algoritmos: {nodo_ini} → {nodo_fin}\n\n", 'info')
+        self.root.update()
+        
+        portafolio = self._obtener_portafolio()
+        etiquetas = {clave: nombre for nombre, clave, _ in portafolio}
+        admisible = self.combo_heuristica.get() == 'Landmarks (ALT)'
+        
+        try:
+            carrera = carrera_portafolio(self.grafo_compilado, nodo_ini, nodo_fin,
+                                         [(clave, params) for _, clave, params in portafolio],
+                                         self._obtener_heuristica(nodo_fin), 'optimo',
+                                         heuristica_admisible=admisible)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al ejecutar:\n{str(e)}")
+            self.text_resultados.insert(tk.END, f"\n Error: {str(e)}\n", 'fallo')
+            return
+        
+        for salida in carrera['terminados']:
+            nombre = etiquetas[salida['algoritmo']]
+            if salida['cumple']:
+                self.text_resultados.insert(tk.END, f"🏆 {nombre} ({salida['tiempo']:.6f}s)\n", 'exito')
+            elif salida['resultado'] is None:
+                self.text_resultados.insert(tk.END, f"✗ {nombre}: {salida.get('error', 'Error')}\n", 'fallo')
+            else:
+                self.text_resultados.insert(tk.END, f"· {nombre}: terminó sin óptimo garantizado\n", 'info')
+        
+        if carrera['cancelados']:
+            cancelados = ", ".join(etiquetas[clave] for clave in carrera['cancelados'])
+            self.text_resultados.insert(tk.END, f"\nCancelados: {cancelados}\n", 'info')
+        self.text_resultados.insert(tk.END, f"Latencia de la carrera: {carrera['latencia']:.6f}s\n\n", 'info')
+        
+        if carrera['ganador'] is None:
+            self.text_resultados.insert(tk.END, "❌ Ningún algoritmo cumplió el criterio\n", 'fallo')
+            return
+        
+        self._mostrar_resultado(carrera['resultado'], nodo_ini, nodo_fin, carrera['latencia'])
+        if carrera['resultado']['exito']:
+            self.visualizador.dibujar_grafo(self.G, carrera['resultado']['camino'])
+    
     def _obtener_algoritmos_no_informados(self, nodo_ini, nodo_fin):
-        """Retorna lista de algoritmos no informados"""
+        """Retorna lista de algoritmos no informados (cada uno recibe su Instrumentacion)"""
+        cota_inferior = self._obtener_cota_inferior()
+        
         return [
             ('Amplitud (BFS)', 
-             lambda: busqueda_amplitud(self.grafo, nodo_ini, nodo_fin)),
+             lambda instr: self._buscar('amplitud', nodo_ini, nodo_fin, instrumentacion=instr)),
+            ('Amplitud Bidireccional', 
+             lambda instr: self._buscar('amplitud_bidireccional', nodo_ini, nodo_fin, instrumentacion=instr)),
             ('Costo Uniforme', 
-             lambda: busqueda_costo_uniforme(self.grafo, nodo_ini, nodo_fin)),
+             lambda instr: self._buscar('costo_uniforme', nodo_ini, nodo_fin, instrumentacion=instr)),
+            ('Costo Uniforme Bidireccional', 
+             lambda instr: self._buscar('costo_uniforme_bidireccional', nodo_ini, nodo_fin, instrumentacion=instr)),
             ('Profundidad (DFS)', 
-             lambda: busqueda_profundidad(self.grafo, nodo_ini, nodo_fin)),
+             lambda instr: self._buscar('profundidad', nodo_ini, nodo_fin, instrumentacion=instr)),
             ('Profundidad Iterativa', 
-             lambda: busqueda_profundidad_iterativa(self.grafo, nodo_ini, nodo_fin, 5)),
+             lambda instr: self._buscar('profundidad_iterativa', nodo_ini, nodo_fin, max_profundidad=5,
+                                        instrumentacion=instr)),
             ('Branch & Bound', 
-             lambda: busqueda_branch_and_bound(self.grafo, nodo_ini, nodo_fin))
+             lambda instr: self._buscar('branch_and_bound', nodo_ini, nodo_fin, cota_inferior,
+                                        instrumentacion=instr))
         ]
     
     def _obtener_algoritmos_informados(self, nodo_ini, nodo_fin):
-        """Retorna lista de algoritmos informados"""
-        heuristica = generar_heuristica(self.grafo, nodo_fin)
+        """Retorna lista de algoritmos informados (cada uno recibe su Instrumentacion)"""
+        heuristica = self._obtener_heuristica(nodo_fin)
+        # IDA* sólo verifica ciclos en la rama: sin presupuesto puede congelar la interfaz
+        tiempo_max = self._validar_parametro_float('entry_tiempo_max', 'Tiempo máx')
         
         return [
             ('Codicioso (Greedy)', 
-             lambda: busqueda_codiciosa(self.grafo, nodo_ini, nodo_fin, heuristica)),
+             lambda instr: self._buscar('codiciosa', nodo_ini, nodo_fin, heuristica, instrumentacion=instr)),
             ('A*', 
-             lambda: busqueda_a_estrella(self.grafo, nodo_ini, nodo_fin, heuristica)),
+             lambda instr: self._buscar('a_estrella', nodo_ini, nodo_fin, heuristica, instrumentacion=instr)),
             ('A* Ponderado', 
-             lambda: busqueda_a_estrella_ponderado(self.grafo, nodo_ini, nodo_fin, heuristica, 1.3)),
+             lambda instr: self._buscar('a_estrella_ponderado', nodo_ini, nodo_fin, heuristica, W=1.3,
+                                        instrumentacion=instr)),
+            ('IDA*', 
+             lambda instr: self._buscar('ida_estrella', nodo_ini, nodo_fin, heuristica, instrumentacion=instr,
+                                        presupuesto=Presupuesto(tiempo_max=tiempo_max))),
             ('Beam Search', 
-             lambda: busqueda_beam(self.grafo, nodo_ini, nodo_fin, heuristica, 2)),
+             lambda instr: self._buscar('beam', nodo_ini, nodo_fin, heuristica, ancho_haz=2, instrumentacion=instr)),
             ('Hill Climbing', 
-             lambda: busqueda_hill_climbing(self.grafo, nodo_ini, nodo_fin, heuristica))
+             lambda instr: self._buscar('hill_climbing', nodo_ini, nodo_fin, heuristica, instrumentacion=instr))
         ]
     
+    def _mostrar_instrumentacion(self, contadores):
+        """Muestra los contadores de frontera y cerrados de una ejecución instrumentada"""
+        if not contadores:
+            return
+        self.text_resultados.insert(tk.END,
+            f"   Generados: {contadores['generados']} | Reexpansiones: {contadores['reexpansiones']}\n"
+            f"   Pushes: {contadores['pushes']} | Pops: {contadores['pops']} "
+            f"(obsoletos: {contadores['pops_obsoletos']})\n"
+            f"   Pico frontera: {contadores['max_frontera']} | Pico cerrados: {contadores['max_cerrados']}\n",
+            'info')
+    
     def _mostrar_resultados_comparativa(self, resultados):
         """Muestra los resultados de la comparativa"""
         self.text_resultados.insert(tk.END, "\n" + "═" * 60 + "\n")
         self.text_resultados.insert(tk.END, "RESULTADOS DE LA COMPARACIÓN\n", 'titulo')
         self.text_resultados.insert(tk.END, "═" * 60 + "\n\n")
         
+        desde_cache = sum(1 for r in resultados if r['resultado'] and r['resultado'].get('desde_cache'))
+        if desde_cache:
+            estadisticas = self.cache_resultados.estadisticas()
+            self.text_resultados.insert(tk.END,
+                f"♻ {desde_cache} resultado(s) desde caché (tiempos de la ejecución original) | "
+                f"aciertos: {estadisticas['aciertos']}, fallos: {estadisticas['fallos']}\n\n", 'info')
+        
         # Filtrar solo los exitosos
         exitosos = [r for r in resultados if r['exito']]
         
@@ -739,10 +985,14 @@ class InterfazBusquedasIA:
                     self.text_resultados.insert(tk.END, 
                         f"   Tiempo: {r['tiempo']:.6f}s | "
                         f"Costo: {r['resultado']['costo']:.2f} | "
-                        f"Nodos: {r['resultado']['nodos_expandidos']}\n\n", 'info')
+                        f"Nodos: {r['resultado']['nodos_expandidos']}\n", 'info')
+                    self._mostrar_instrumentacion(r['resultado'].get('instrumentacion'))
+                    self.text_resultados.insert(tk.END, "\n")
                 else:
                     self.text_resultados.insert(tk.END, f"✗ {r['nombre']}: ", 'fallo')
                     error_msg = r.get('error', 'Sin solución')
+                    if r['resultado'] and r['resultado'].get('motivo', MOTIVO_COMPLETA) != MOTIVO_COMPLETA:
+                        error_msg = f"Interrumpida ({r['resultado']['motivo']})"
                     self.text_resultados.insert(tk.END, f"{error_msg}\n\n", 'info')
             
             # Visualizar el mejor camino
@@ -17,13 +17,15 @@ class VisualizadorGrafo:
         self.canvas = None
         self.fig = None
     
-    def dibujar_grafo(self, G, camino_resaltado=None):
+    def dibujar_grafo(self, G, camino_resaltado=None, caminos_alternativos=None):
         """
         Dibuja el grafo en el canvas
         
         Args:
             G: grafo de NetworkX
             camino_resaltado: lista de nodos que forman el camino a resaltar
+            caminos_alternativos: lista de caminos alternativos (p. ej. los k
+                caminos más cortos) que se dibujan punteados debajo del principal
         """
         # Limpiar canvas anterior si existe
         if self.canvas:
@@ -46,6 +48,19 @@ class VisualizadorGrafo:
                               alpha=0.5,
                               ax=ax)
         
+        # Caminos alternativos punteados, alternando colores, debajo del principal
+        colores_alternativos = [self.colores['accent_purple'], self.colores['accent_green']]
+        for i, alternativo in enumerate(caminos_alternativos or []):
+            alternativo_edges = [(alternativo[j], alternativo[j+1])
+                                 for j in range(len(alternativo)-1)]
+            nx.draw_networkx_edges(G, pos,
+                                  edgelist=alternativo_edges,
+                                  edge_color=colores_alternativos[i % len(colores_alternativos)],
+                                  width=3,
+                                  alpha=0.7,
+                                  style='dashed',
+                                  ax=ax)
+        
         # Resaltar camino si existe
         if camino_resaltado and len(camino_resaltado) > 1:
             # Crear aristas del camino
@@ -128,6 +143,9 @@ class VisualizadorGrafo:
                 Patch(facecolor=self.colores['accent_red'], label='Objetivo'),
                 Patch(facecolor=self.colores['accent_blue'], label='Otros nodos')
             ]
+            if caminos_alternativos:
+                legend_elements.insert(2, Patch(facecolor=self.colores['accent_purple'],
+                                                label=f'Alternativas ({len(caminos_alternativos)})'))
             ax.legend(handles=legend_elements,
                      loc='upper right',
                      facecolor=self.colores['bg_medium'],
@@ -5,6 +5,12 @@ Funciones para leer archivos y generar heurísticas
 
 import re
 import random
+import hashlib
+from array import array
+
+# Peso entero máximo para usar la cola de cubetas de Dial en costo uniforme:
+# con pesos mayores hay demasiadas cubetas vacías que recorrer
+PESO_MAX_CUBETAS = 1000
 
 def leer_grafo(archivo):
     """
@@ -67,6 +73,144 @@ def leer_grafo(archivo):
     
     return grafo
 
+class GrafoCompilado:
+    """
+    Grafo compilado en formato CSR (Compressed Sparse Row)
+    Los nodos se internan como IDs enteros 0..n-1 y las aristas se guardan en
+    arreglos contiguos: los vecinos de u son destinos[offsets[u]:offsets[u+1]]
+    con sus pesos en la misma franja de pesos
+    
+    peso_entero_max es el mayor peso si todos son enteros en
+    [0, PESO_MAX_CUBETAS] (None si no): se detecta al compilar y costo
+    uniforme lo usa para elegir la cola de cubetas en lugar del heap
+    """
+    def __init__(self, nombres, offsets, destinos, pesos):
+        self.nombres = nombres
+        self.ids = {nombre: i for i, nombre in enumerate(nombres)}
+        self.offsets = offsets
+        self.destinos = destinos
+        self.pesos = pesos
+        self.huella = None  # Se calcula una sola vez con huella_grafo
+        self.peso_entero_max = peso_entero_maximo(pesos)
+    
+    def vecinos(self, u):
+        """Itera los pares (vecino, peso) del nodo con ID u"""
+        inicio = self.offsets[u]
+        fin = self.offsets[u + 1]
+        return zip(self.destinos[inicio:fin], self.pesos[inicio:fin])
+    
+    def id_de(self, nombre):
+        """Obtiene el ID entero de un nodo a partir de su nombre"""
+        try:
+            return self.ids[nombre]
+        except KeyError:
+            raise KeyError(f"El nodo '{nombre}' no existe en el grafo")
+    
+    def nombre_de(self, u):
+        """Obtiene el nombre de un nodo a partir de su ID"""
+        return self.nombres[u]
+    
+    def num_aristas(self):
+        """Número de aristas dirigidas almacenadas (cada arista no dirigida cuenta dos veces)"""
+        return len(self.destinos)
+    
+    # Interfaz mínima de diccionario para poder usarlo donde se usa el de leer_grafo
+    def __len__(self):
+        return len(self.nombres)
+    
+    def __contains__(self, nombre):
+        return nombre in self.ids
+    
+    def __iter__(self):
+        return iter(self.nombres)
+    
+    def keys(self):
+        return self.nombres
+
+def peso_entero_maximo(pesos, limite=PESO_MAX_CUBETAS):
+    """
+    Retorna el mayor peso si todos son enteros no negativos hasta limite, o None
+    
+    Args:
+        pesos: secuencia de pesos (p. ej. GrafoCompilado.pesos)
+        limite: mayor peso admitido
+    """
+    if not pesos:
+        return 0
+    if min(pesos) < 0 or max(pesos) > limite or not all(map(float.is_integer, map(float, pesos))):
+        return None
+    return int(max(pesos))
+
+def compilar_grafo(grafo):
+    """
+    Compila el diccionario de leer_grafo a un GrafoCompilado (CSR)
+    Se conserva el orden de nodos y de vecinos del diccionario, así que los
+    algoritmos recorren el grafo en el mismo orden con ambas representaciones
+    
+    Args:
+        grafo: diccionario con el grafo ({nodo: {vecino: peso}}) o un GrafoCompilado
+    
+    Returns:
+        GrafoCompilado: grafo con IDs enteros y arreglos offsets/destinos/pesos
+    """
+    if isinstance(grafo, GrafoCompilado):
+        return grafo
+    
+    nombres = list(grafo.keys())
+    # Nodos que sólo aparecen como destino también necesitan ID
+    conocidos = set(nombres)
+    for vecinos in grafo.values():
+        for vecino in vecinos:
+            if vecino not in conocidos:
+                conocidos.add(vecino)
+                nombres.append(vecino)
+    
+    ids = {nombre: i for i, nombre in enumerate(nombres)}
+    offsets = array('l', [0])
+    destinos = array('l')
+    pesos = array('d')
+    
+    for nombre in nombres:
+        for vecino, peso in grafo.get(nombre, {}).items():
+            destinos.append(ids[vecino])
+            pesos.append(peso)
+        offsets.append(len(destinos))
+    
+    return GrafoCompilado(nombres, offsets, destinos, pesos)
+
+def huella_grafo(grafo):
+    """
+    Calcula una huella de contenido del grafo (SHA-1 de sus aristas ordenadas)
+    No depende del orden de inserción ni de la representación: el dict de
+    leer_grafo y su GrafoCompilado producen la misma huella (los pesos se
+    toman como float, igual que en el arreglo 'd' del compilado, así que 1 y
+    1.0 dan la misma)
+    
+    Args:
+        grafo: diccionario con el grafo o GrafoCompilado
+    
+    Returns:
+        str: huella hexadecimal
+    """
+    compilado = isinstance(grafo, GrafoCompilado)
+    if compilado and grafo.huella is not None:
+        return grafo.huella
+    
+    sha = hashlib.sha1()
+    for nodo in sorted(grafo.keys()):
+        if compilado:
+            u = grafo.ids[nodo]
+            aristas = [(grafo.nombres[v], peso) for v, peso in grafo.vecinos(u)]
+        else:
+            aristas = grafo[nodo].items()
+        for vecino, peso in sorted(aristas):
+            sha.update(f"{nodo}\x00{vecino}\x00{float(peso)!r}\n".encode('utf-8'))
+    
+    huella = sha.hexdigest()
+    if compilado:
+        grafo.huella = huella
+    return huella
+
 def generar_heuristica(grafo, objetivo, seed=17):
     """
     Genera una heurística aleatoria para cada nodo del grafo